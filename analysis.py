@@ -1,21 +1,124 @@
 import pandas as pd
 import numpy as np
 import openai
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, Iterable, Iterator, Tuple, Union
+from concurrent.futures import Executor, ThreadPoolExecutor
+import asyncio
+import functools
 import json
+import logging
+import threading
 import time
+from llm import TokenBucketRateLimiter, ResponseCache, LLMBackend, LLMResponse, OpenAIBackend
+from metrics import GPT_REQUEST_SECONDS, GPT_REQUESTS, GPT_TOKENS
+from scoring import compatibility_matrix, profiles_to_matrix, top_k_indices, TRAITS
+from behavior import summarize_behavior, BehaviorAccumulator, CATEGORY_EFFECTS
+from department_requirements import RequirementsIndex, has_subdepartment
+from ranking import RankedDepartments
+from tracing import trace, span
+
+# match_cohort 결과 컬럼
+COHORT_COLUMNS = ['candidate_id', 'mbti', 'rank', 'name', 'main_dept', 'sub_dept', 'score']
+
+# 진행 상황 콜백: (단계, 완료 수, 전체 수, 부서명) — 예외를 발생시키면 분석이 중단됨
+ProgressCallback = Callable[[str, int, int, Optional[str]], None]
+
+def parse_batch_reasons(text: str, count: int) -> Dict[int, str]:
+    """
+    여러 부서 배치 사유 JSON 응답 검증
+    
+    {"reasons": [{"id": 번호, "reason": "..."}]} 형식에서 1..count 번호와 비어 있지 않은 사유만 받아들입니다.
+    
+    Args:
+        text (str): 응답 본문
+        count (int): 요청한 부서 수
+        
+    Returns:
+        Dict[int, str]: 부서 번호(1부터) → 배치 사유 (형식이 잘못된 항목은 제외)
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    
+    entries = data.get('reasons') if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+    
+    reasons = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        number, reason = entry.get('id'), entry.get('reason')
+        if isinstance(number, str) and number.strip().isdigit():
+            number = int(number)
+        if isinstance(number, bool) or not isinstance(number, int) or not 1 <= number <= count:
+            continue
+        if not isinstance(reason, str) or not reason.strip() or number in reasons:
+            continue
+        reasons[number] = reason.strip()
+    return reasons
 
 class DepartmentMatcher:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrency: int = 8,
+                 requests_per_second: Optional[float] = 3.0, burst: int = 3, reason_top_k: int = 2,
+                 model: str = "gpt-3.5-turbo", temperature: float = 0.7,
+                 client: Optional[Any] = None, response_cache: Optional[ResponseCache] = None,
+                 client_options: Optional[Dict[str, Any]] = None, async_client: Optional[Any] = None,
+                 backend: Optional[LLMBackend] = None, reason_batch_size: int = 1, top_k: int = 5):
         """
         부서 매칭 분석기 초기화
         
         Args:
             api_key (str): OpenAI API 키
+            max_concurrency (int): 동시에 보낼 최대 GPT 요청 수 (1이면 순차 처리, 속도 제한을 채우는 데
+                필요한 수보다 많으면 백엔드의 expected_latency로 줄임)
+            requests_per_second (Optional[float]): 초당 GPT 요청 수 제한 (None이면 제한 없음,
+                백엔드의 max_requests_per_second가 더 작으면 그 값 사용)
+            burst (int): 속도 제한 내에서 한 번에 보낼 수 있는 최대 요청 수
+            reason_top_k (int): 분석 시 바로 배치 사유를 생성할 상위 부서 수
+            model (str): 배치 사유 생성에 사용할 GPT 모델
+            temperature (float): GPT 응답 temperature
+            client (Optional[Any]): 사용할 OpenAI 호환 클라이언트 (없으면 프로세스 공용 연결 풀 클라이언트,
+                테스트에서는 tests/fakes.py의 FakeOpenAIClient 등)
+            response_cache (Optional[ResponseCache]): GPT 응답 캐시 (없으면 이 분석기 전용 메모리 캐시)
+            client_options (Optional[Dict[str, Any]]): 공용 클라이언트의 연결 풀/타임아웃/재시도 설정
+                (create_openai_client 인자)
+            async_client (Optional[Any]): 비동기 메서드에서 사용할 OpenAI 호환 비동기 클라이언트
+                (없으면 처음 사용할 때 AsyncOpenAI 연결 풀 클라이언트 생성)
+            backend (Optional[LLMBackend]): 배치 사유 생성 백엔드 (없으면 위 설정으로 OpenAIBackend 생성,
+                지정하면 model, client, async_client, client_options는 무시)
+            reason_batch_size (int): 한 번의 요청으로 배치 사유를 생성할 부서 수 (1이면 부서마다 요청)
+            top_k (int): 분석 결과에서 바로 딕셔너리로 만들 상위 부서 수 (부분 정렬로 선택하고,
+                나머지 부서는 배열로 보관하다가 all_departments에서 접근할 때 생성)
         """
         self.api_key = api_key
         openai.api_key = api_key
         
+        # 배치 사유 생성 백엔드
+        if backend is None:
+            backend = OpenAIBackend(api_key, model, client=client, async_client=async_client,
+                                    client_options=client_options)
+        self.backend = backend
+        
+        # GPT 요청 동시성 및 속도 제한 설정 (백엔드의 초당 요청 한도와 예상 지연 시간 반영,
+        # 네트워크를 쓰지 않는 백엔드는 제한 없이 바로 호출)
+        rate, self.max_concurrency = backend.request_limits(requests_per_second, max_concurrency, burst)
+        self.rate_limiter = TokenBucketRateLimiter(rate, burst)
+        
+        # 화면에 표시되는 상위 부서만 GPT 사유를 미리 생성
+        self.reason_top_k = max(0, reason_top_k)
+        self.reason_batch_size = max(1, reason_batch_size)
+        self.top_k = max(0, top_k)
+        
+        # 부서 요구 성향 색인 (한 번만 생성하여 재사용)
+        self.requirements_index = RequirementsIndex()
+        
+        # GPT 요청 설정 및 응답 캐시
+        self.model = backend.model
+        self.temperature = temperature
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        
         # MBTI별 특성 정의
         self.mbti_traits = {
             "INTJ": {"분석력": 90, "독립성": 85, "계획성": 90, "창의성": 75, "소통력": 40, "협력성": 50, "실행력": 80, "안정성": 70},
@@ -36,12 +139,13 @@ class DepartmentMatcher:
             "ESFP": {"분석력": 45, "독립성": 60, "계획성": 30, "창의성": 80, "소통력": 95, "협력성": 85, "실행력": 75, "안정성": 50}
         }
 
-    def analyze_digital_behavior(self, personal_df: pd.DataFrame) -> Dict[str, float]:
+    def analyze_digital_behavior(self, personal_df: Union[pd.DataFrame, BehaviorAccumulator]) -> Dict[str, float]:
         """
         개인의 디지털 행동 패턴을 분석하여 성향 점수를 계산
         
         Args:
-            personal_df (pd.DataFrame): 개인 디지털 행동 분석 데이터 (여러 파일 통합 가능)
+            personal_df (Union[pd.DataFrame, BehaviorAccumulator]): 개인 디지털 행동 분석 데이터 (여러 파일 통합 가능)
+                또는 read_behavior_files로 청크 단위 집계한 누적기
             
         Returns:
             Dict[str, float]: 성향별 점수
@@ -52,131 +156,44 @@ class DepartmentMatcher:
                 "소통력": 50, "협력성": 50, "실행력": 50, "안정성": 50
             }
             
-            # 데이터프레임의 컬럼을 분석하여 점수 조정
-            if not personal_df.empty:
-                columns = personal_df.columns.tolist()
-                print(f"분석 중인 컬럼들: {columns}")  # 디버깅용
-                print(f"데이터 행 수: {len(personal_df)}")  # 디버깅용
-                
-                # 여러 파일이 통합된 경우를 고려한 가중치 계산
-                total_rows = len(personal_df)
+            # 관심사/사용시간을 카테고리별 가중치와 사용시간 합계로 요약 (벡터 연산)
+            summary = summarize_behavior(personal_df)
+            
+            if summary is not None:
+                category_scores = summary['category_scores']
+                trace("behavior_summary", rows=summary['row_count'], category_scores=category_scores)
                 
-                # 웹사이트 방문 패턴 분석 - 더 다양한 컬럼명 지원
-                interest_columns = ['관심사', 'category', '카테고리', 'interest', 'interests']
-                interest_col = None
-                for col in interest_columns:
-                    if col in columns:
-                        interest_col = col
-                        break
+                # 총 가중치 계산
+                total_weight = sum(category_scores.values()) or 1
                 
-                if interest_col:
-                    print(f"관심사 컬럼 발견: {interest_col}")  # 디버깅용
-                    categories = personal_df[interest_col].tolist()
-                    
-                    # 카테고리별 빈도 및 사용시간 가중치 계산
-                    category_scores = {}
-                    time_weights = {}
-                    
-                    # 사용시간도 함께 고려
-                    time_col = None
-                    time_columns = ['사용시간', 'usage_time', '시간', 'time']
-                    for col in time_columns:
-                        if col in columns:
-                            time_col = col
-                            break
+                # 카테고리별 점수 조정 (비율 기반)
+                for cat_type, score in category_scores.items():
+                    influence = min((score / total_weight) * 100, 40)  # 최대 40점까지 영향
                     
-                    for i, category in enumerate(categories):
-                        category_str = str(category).lower()
-                        
-                        # 사용시간 가져오기
-                        time_weight = 1.0
-                        if time_col and i < len(personal_df):
-                            try:
-                                time_value = float(personal_df.iloc[i][time_col])
-                                time_weight = min(time_value / 5.0, 3.0)  # 5시간 기준, 최대 3배 가중
-                            except:
-                                time_weight = 1.0
-                        
-                        # 카테고리별 분류 및 가중치 적용
-                        if any(keyword in category_str for keyword in ['tech', '기술', 'programming', '개발', 'work', '업무']):
-                            category_scores['tech'] = category_scores.get('tech', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['social', '소셜', 'community', '커뮤니티']):
-                            category_scores['social'] = category_scores.get('social', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['news', '뉴스', 'finance', '금융']):
-                            category_scores['news'] = category_scores.get('news', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['art', '예술', 'design', '디자인']):
-                            category_scores['art'] = category_scores.get('art', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['education', '학습', '교육', 'learning']):
-                            category_scores['education'] = category_scores.get('education', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['shopping', '쇼핑', 'commerce']):
-                            category_scores['shopping'] = category_scores.get('shopping', 0) + time_weight
-                        elif any(keyword in category_str for keyword in ['game', '게임', 'entertainment', '엔터']):
-                            category_scores['entertainment'] = category_scores.get('entertainment', 0) + time_weight
-                    
-                    print(f"카테고리 점수: {category_scores}")  # 디버깅용
-                    
-                    # 총 가중치 계산
-                    total_weight = sum(category_scores.values()) or 1
-                    
-                    # 카테고리별 점수 조정 (비율 기반)
-                    for cat_type, score in category_scores.items():
-                        influence = min((score / total_weight) * 100, 40)  # 최대 40점까지 영향
-                        
-                        if cat_type == 'tech':
-                            behavior_scores["분석력"] += influence * 0.6
-                            behavior_scores["창의성"] += influence * 0.4
-                            behavior_scores["독립성"] += influence * 0.3
-                        elif cat_type == 'social':
-                            behavior_scores["소통력"] += influence * 0.8
-                            behavior_scores["협력성"] += influence * 0.6
-                        elif cat_type == 'news':
-                            behavior_scores["분석력"] += influence * 0.4
-                            behavior_scores["안정성"] += influence * 0.6
-                            behavior_scores["계획성"] += influence * 0.3
-                        elif cat_type == 'art':
-                            behavior_scores["창의성"] += influence * 0.8
-                            behavior_scores["독립성"] += influence * 0.5
-                        elif cat_type == 'education':
-                            behavior_scores["분석력"] += influence * 0.5
-                            behavior_scores["계획성"] += influence * 0.6
-                            behavior_scores["안정성"] += influence * 0.3
-                        elif cat_type == 'shopping':
-                            behavior_scores["계획성"] += influence * 0.4
-                            behavior_scores["실행력"] += influence * 0.3
-                        elif cat_type == 'entertainment':
-                            behavior_scores["창의성"] += influence * 0.4
-                            behavior_scores["소통력"] += influence * 0.3
+                    for trait, factor in CATEGORY_EFFECTS[cat_type].items():
+                        behavior_scores[trait] += influence * factor
                 
                 # 전체적인 사용 패턴 분석
-                if time_col:
-                    usage_times = personal_df[time_col].tolist()
-                    valid_times = []
-                    for time_val in usage_times:
-                        try:
-                            valid_times.append(float(time_val))
-                        except:
-                            continue
+                if summary['time_count']:
+                    avg_usage = summary['time_sum'] / summary['time_count']
+                    total_usage = summary['time_sum']
                     
-                    if valid_times:
-                        avg_usage = np.mean(valid_times)
-                        total_usage = sum(valid_times)
-                        
-                        print(f"평균 사용시간: {avg_usage:.2f}시간, 총 사용시간: {total_usage:.2f}시간")  # 디버깅용
-                        
-                        # 사용 패턴에 따른 추가 점수
-                        if avg_usage > 6:  # 고사용자
-                            behavior_scores["실행력"] += 20
-                            behavior_scores["독립성"] += 15
-                        elif avg_usage > 3:  # 중간 사용자
-                            behavior_scores["계획성"] += 15
-                            behavior_scores["안정성"] += 10
-                        else:  # 저사용자
-                            behavior_scores["협력성"] += 15
-                            behavior_scores["소통력"] += 10
-                        
-                        # 총 사용시간이 많으면 실행력 추가 보너스
-                        if total_usage > 20:
-                            behavior_scores["실행력"] += 10
+                    trace("behavior_usage", avg_usage=avg_usage, total_usage=total_usage)
+                    
+                    # 사용 패턴에 따른 추가 점수
+                    if avg_usage > 6:  # 고사용자
+                        behavior_scores["실행력"] += 20
+                        behavior_scores["독립성"] += 15
+                    elif avg_usage > 3:  # 중간 사용자
+                        behavior_scores["계획성"] += 15
+                        behavior_scores["안정성"] += 10
+                    else:  # 저사용자
+                        behavior_scores["협력성"] += 15
+                        behavior_scores["소통력"] += 10
+                    
+                    # 총 사용시간이 많으면 실행력 추가 보너스
+                    if total_usage > 20:
+                        behavior_scores["실행력"] += 10
             
             # 점수를 0-100 범위로 제한
             for key in behavior_scores:
@@ -185,7 +202,7 @@ class DepartmentMatcher:
             return behavior_scores
             
         except Exception as e:
-            print(f"디지털 행동 분석 중 오류: {e}")
+            trace("behavior_error", logging.ERROR, error=repr(e))
             return {
                 "분석력": 50, "독립성": 50, "계획성": 50, "창의성": 50,
                 "소통력": 50, "협력성": 50, "실행력": 50, "안정성": 50
@@ -207,9 +224,6 @@ class DepartmentMatcher:
             total_weight = 0
             penalty_score = 0
             
-            print(f"사용자 프로필: {user_profile}")  # 디버깅용
-            print(f"부서 요구사항: {dept_requirements}")  # 디버깅용
-            
             for trait, user_score in user_profile.items():
                 if trait in dept_requirements:
                     dept_requirement = dept_requirements[trait]
@@ -250,12 +264,10 @@ class DepartmentMatcher:
             final_score = min(100, max(0, final_score))
             final_score = round(final_score, 1)  # 소수점 1자리로 반올림
             
-            print(f"최종 적합도: {final_score:.1f}%")  # 디버깅용
-            
             return final_score
             
         except Exception as e:
-            print(f"적합도 계산 중 오류: {e}")
+            trace("compatibility_error", logging.ERROR, error=repr(e))
             return 50.0
 
     def generate_department_analysis(self, user_profile: Dict[str, float], dept_name: str, 
@@ -273,7 +285,57 @@ class DepartmentMatcher:
             str: 배치 사유 분석
         """
         try:
-            prompt = f"""
+            messages = self._analysis_messages(user_profile, dept_name, compatibility_score, mbti)
+            
+            # 같은 요청은 캐시된 응답 사용
+            cache_key = self._analysis_cache_key(messages)
+            cached = self._cached_analysis(cache_key)
+            if cached is not None:
+                return cached
+            
+            started = time.perf_counter()
+            try:
+                response = self.backend.complete(
+                    messages, max_tokens=200, temperature=self.temperature,
+                    context=self._analysis_context(user_profile, dept_name, compatibility_score, mbti)
+                )
+            finally:
+                GPT_REQUEST_SECONDS.observe(time.perf_counter() - started)
+            
+            return self._store_analysis(cache_key, response)
+            
+        except Exception as e:
+            return self._fallback_analysis(dept_name, compatibility_score, e)
+
+    async def agenerate_department_analysis(self, user_profile: Dict[str, float], dept_name: str,
+                                            compatibility_score: float, mbti: str) -> str:
+        """generate_department_analysis의 비동기 버전 (백엔드의 비동기 요청을 사용하여 이벤트 루프를 막지 않음)"""
+        try:
+            messages = self._analysis_messages(user_profile, dept_name, compatibility_score, mbti)
+            
+            cache_key = self._analysis_cache_key(messages)
+            cached = self._cached_analysis(cache_key)
+            if cached is not None:
+                return cached
+            
+            started = time.perf_counter()
+            try:
+                response = await self.backend.acomplete(
+                    messages, max_tokens=200, temperature=self.temperature,
+                    context=self._analysis_context(user_profile, dept_name, compatibility_score, mbti)
+                )
+            finally:
+                GPT_REQUEST_SECONDS.observe(time.perf_counter() - started)
+            
+            return self._store_analysis(cache_key, response)
+            
+        except Exception as e:
+            return self._fallback_analysis(dept_name, compatibility_score, e)
+
+    def _analysis_messages(self, user_profile: Dict[str, float], dept_name: str,
+                           compatibility_score: float, mbti: str) -> List[Dict[str, str]]:
+        """배치 사유 요청 메시지 생성"""
+        prompt = f"""
             다음 정보를 바탕으로 개인이 {dept_name} 부서에 적합한 이유를 2-3문장으로 간결하게 설명해주세요.
             
             개인 성향:
@@ -289,228 +351,593 @@ class DepartmentMatcher:
             
             설명은 개인의 강점과 부서의 특성을 연결하여 작성해주세요.
             """
+        
+        return [
+            {"role": "system", "content": "당신은 인사 전문가입니다. 개인의 성향과 부서 특성을 분석하여 간결하고 전문적인 배치 사유를 제공합니다."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _analysis_context(user_profile: Dict[str, float], dept_name: str, compatibility_score: float,
+                          mbti: str) -> Dict[str, Any]:
+        """프롬프트를 만든 원본 값 (템플릿 백엔드용)"""
+        return {'user_profile': user_profile, 'dept_name': dept_name, 'score': compatibility_score, 'mbti': mbti}
+
+    def _analysis_cache_key(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """응답 캐시 키 (캐시하지 않는 백엔드면 None)"""
+        if not self.backend.cacheable:
+            return None
+        return ResponseCache.make_key(self.model, messages, max_tokens=200, temperature=self.temperature)
+
+    def _cached_analysis(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            GPT_REQUESTS.inc(outcome='cache_hit')
+        return cached
+
+    def _store_analysis(self, cache_key: Optional[str], response: LLMResponse) -> str:
+        """응답의 토큰 사용량을 기록하고 본문을 캐시에 저장"""
+        GPT_TOKENS.inc(response.prompt_tokens, kind='prompt')
+        GPT_TOKENS.inc(response.completion_tokens, kind='completion')
+        
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response.text)
+        GPT_REQUESTS.inc(outcome='ok')
+        return response.text
+
+    def _fallback_analysis(self, dept_name: str, compatibility_score: float, error: Exception) -> str:
+        """GPT 요청 실패 시 사용할 기본 배치 사유"""
+        GPT_REQUESTS.inc(outcome='error')
+        trace("gpt_error", logging.WARNING, department=dept_name, error=repr(error))
+        return f"{dept_name} 부서의 업무 특성과 개인의 성향이 {compatibility_score:.1f}% 일치하여 효과적인 업무 수행이 가능할 것으로 예상됩니다."
+
+    def generate_department_analyses(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]],
+                                     mbti: str, progress_callback: Optional[ProgressCallback] = None) -> List[str]:
+        """
+        여러 부서의 배치 사유를 동시에 생성
+        
+        reason_batch_size가 1보다 크면 그 수만큼의 부서를 한 번의 요청으로 묶고,
+        응답에서 빠졌거나 형식이 잘못된 부서만 부서별로 다시 요청합니다.
+        
+        Args:
+            user_profile (Dict[str, float]): 사용자 성향 프로필
+            departments (List[Dict[str, Any]]): 'name'과 'score'를 가진 부서 목록
+            mbti (str): MBTI 유형
+            progress_callback (Optional[ProgressCallback]): 부서별 사유 생성이 끝날 때마다 호출
+            
+        Returns:
+            List[str]: 입력 순서와 같은 순서의 배치 사유 목록
+        """
+        total = len(departments)
+        completed = [0]
+        lock = threading.Lock()
+        
+        def generate(batch: List[Dict[str, Any]]) -> List[str]:
+            # 요청 전에 확인하여 취소된 작업은 남은 요청을 보내지 않음
+            if progress_callback is not None:
+                with lock:
+                    progress_callback("gpt", completed[0], total, None)
+            
+            # 속도 제한 토큰을 얻은 뒤 요청
+            if len(batch) > 1:
+                reasons = self.generate_department_analyses_batch(user_profile, batch, mbti)
+            else:
+                reasons = [None]
+            for i, dept in enumerate(batch):
+                if reasons[i] is None:
+                    self.rate_limiter.acquire()
+                    reasons[i] = self.generate_department_analysis(user_profile, dept['name'], dept['score'], mbti)
+            
+            if progress_callback is not None:
+                with lock:
+                    for dept in batch:
+                        completed[0] += 1
+                        progress_callback("gpt", completed[0], total, dept['name'])
+            return reasons
+        
+        batches = self._reason_batches(departments)
+        with span("gpt", requests=len(batches)):
+            if self.max_concurrency <= 1 or len(batches) <= 1:
+                results = [generate(batch) for batch in batches]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                    results = list(executor.map(generate, batches))
+        return [reason for batch_reasons in results for reason in batch_reasons]
+
+    async def agenerate_department_analyses(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]],
+                                            mbti: str) -> List[str]:
+        """
+        generate_department_analyses의 비동기 버전 (max_concurrency개까지 동시에 요청, 속도 제한 적용)
+        
+        Returns:
+            List[str]: 입력 순서와 같은 순서의 배치 사유 목록
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def generate(batch: List[Dict[str, Any]]) -> List[str]:
+            async with semaphore:
+                if len(batch) > 1:
+                    reasons = await self.agenerate_department_analyses_batch(user_profile, batch, mbti)
+                else:
+                    reasons = [None]
+                for i, dept in enumerate(batch):
+                    if reasons[i] is None:
+                        await self.rate_limiter.acquire_async()
+                        reasons[i] = await self.agenerate_department_analysis(
+                            user_profile, dept['name'], dept['score'], mbti
+                        )
+                return reasons
+        
+        batches = self._reason_batches(departments)
+        with span("gpt", requests=len(batches)):
+            results = await asyncio.gather(*(generate(batch) for batch in batches))
+        return [reason for batch_reasons in results for reason in batch_reasons]
+
+    def generate_department_analyses_batch(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]],
+                                           mbti: str) -> List[Optional[str]]:
+        """
+        여러 부서의 배치 사유를 한 번의 요청으로 생성 (JSON 형식 응답)
+        
+        캐시에 있는 부서는 요청에서 빼고, 응답에서 빠졌거나 형식이 잘못된 부서는 None으로 반환합니다.
+        
+        Args:
+            user_profile (Dict[str, float]): 사용자 성향 프로필
+            departments (List[Dict[str, Any]]): 'name'과 'score'를 가진 부서 목록
+            mbti (str): MBTI 유형
             
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 인사 전문가입니다. 개인의 성향과 부서 특성을 분석하여 간결하고 전문적인 배치 사유를 제공합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
+        Returns:
+            List[Optional[str]]: 입력 순서와 같은 순서의 배치 사유 목록 (실패한 부서는 None)
+        """
+        reasons, cache_keys, pending = self._prepare_batch(user_profile, departments, mbti)
+        if not pending:
+            return reasons
+        
+        self.rate_limiter.acquire()
+        messages, context, max_tokens = self._batch_request(user_profile, [departments[i] for i in pending], mbti)
+        started = time.perf_counter()
+        try:
+            response = self.backend.complete(messages, max_tokens=max_tokens, temperature=self.temperature,
+                                             context=context, json_mode=True)
+        except Exception as e:
+            GPT_REQUESTS.inc(outcome='error')
+            trace("gpt_batch_error", logging.WARNING, departments=len(pending), error=repr(e))
+            return reasons
+        finally:
+            GPT_REQUEST_SECONDS.observe(time.perf_counter() - started)
+        
+        return self._finish_batch(response, reasons, cache_keys, pending)
+
+    async def agenerate_department_analyses_batch(self, user_profile: Dict[str, float],
+                                                  departments: List[Dict[str, Any]],
+                                                  mbti: str) -> List[Optional[str]]:
+        """generate_department_analyses_batch의 비동기 버전"""
+        reasons, cache_keys, pending = self._prepare_batch(user_profile, departments, mbti)
+        if not pending:
+            return reasons
+        
+        await self.rate_limiter.acquire_async()
+        messages, context, max_tokens = self._batch_request(user_profile, [departments[i] for i in pending], mbti)
+        started = time.perf_counter()
+        try:
+            response = await self.backend.acomplete(messages, max_tokens=max_tokens, temperature=self.temperature,
+                                                    context=context, json_mode=True)
+        except Exception as e:
+            GPT_REQUESTS.inc(outcome='error')
+            trace("gpt_batch_error", logging.WARNING, departments=len(pending), error=repr(e))
+            return reasons
+        finally:
+            GPT_REQUEST_SECONDS.observe(time.perf_counter() - started)
+        
+        return self._finish_batch(response, reasons, cache_keys, pending)
+
+    def _reason_batches(self, departments: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """부서 목록을 한 번에 요청할 묶음으로 나눔"""
+        size = self.reason_batch_size
+        return [departments[i:i + size] for i in range(0, len(departments), size)]
+
+    def _prepare_batch(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]],
+                       mbti: str) -> Tuple[List[Optional[str]], List[Optional[str]], List[int]]:
+        """
+        묶음 요청 전 부서별 캐시 확인
+        
+        캐시 키는 부서별 요청과 같으므로 묶음으로 받은 사유도 부서별 요청에서 재사용됩니다.
+        
+        Returns:
+            Tuple: (사유 목록, 부서별 캐시 키, 요청이 필요한 부서 위치)
+        """
+        reasons = []
+        cache_keys = []
+        pending = []
+        for i, dept in enumerate(departments):
+            cache_key = self._analysis_cache_key(
+                self._analysis_messages(user_profile, dept['name'], dept['score'], mbti)
             )
+            cached = self._cached_analysis(cache_key)
+            reasons.append(cached)
+            cache_keys.append(cache_key)
+            if cached is None:
+                pending.append(i)
+        return reasons, cache_keys, pending
+
+    def _batch_request(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]],
+                       mbti: str) -> Tuple[List[Dict[str, str]], Dict[str, Any], int]:
+        """여러 부서의 배치 사유를 한 번에 요청하는 메시지, 템플릿 백엔드용 원본 값, 최대 토큰 수"""
+        dept_lines = "\n".join(
+            f"            {i}. {dept['name']} - 적합도 {dept['score']:.1f}%"
+            for i, dept in enumerate(departments, 1)
+        )
+        prompt = f"""
+            다음 정보를 바탕으로 개인이 아래 각 부서에 적합한 이유를 부서마다 2-3문장으로 간결하게 설명해주세요.
+            
+            개인 성향:
+            - 분석력: {user_profile.get('분석력', 50)}/100
+            - 창의성: {user_profile.get('창의성', 50)}/100
+            - 소통력: {user_profile.get('소통력', 50)}/100
+            - 협력성: {user_profile.get('협력성', 50)}/100
+            - 실행력: {user_profile.get('실행력', 50)}/100
+            - 계획성: {user_profile.get('계획성', 50)}/100
+            - MBTI: {mbti}
             
-            return response.choices[0].message.content.strip()
+            부서 목록 (번호. 부서명 - 적합도):
+{dept_lines}
             
-        except Exception as e:
-            print(f"GPT 분석 생성 중 오류: {e}")
-            return f"{dept_name} 부서의 업무 특성과 개인의 성향이 {compatibility_score:.1f}% 일치하여 효과적인 업무 수행이 가능할 것으로 예상됩니다."
+            설명은 개인의 강점과 부서의 특성을 연결하여 작성해주세요.
+            다음 JSON 형식으로만 응답해주세요: {{"reasons": [{{"id": 부서 번호, "reason": "배치 사유"}}]}}
+            """
+        
+        messages = [
+            {"role": "system", "content": "당신은 인사 전문가입니다. 개인의 성향과 부서 특성을 분석하여 간결하고 전문적인 배치 사유를 JSON 형식으로 제공합니다."},
+            {"role": "user", "content": prompt}
+        ]
+        context = {
+            'user_profile': user_profile,
+            'mbti': mbti,
+            'departments': [
+                {'id': i, 'dept_name': dept['name'], 'score': dept['score']}
+                for i, dept in enumerate(departments, 1)
+            ]
+        }
+        return messages, context, 200 * len(departments)
+
+    def _finish_batch(self, response: LLMResponse, reasons: List[Optional[str]], cache_keys: List[Optional[str]],
+                      pending: List[int]) -> List[Optional[str]]:
+        """묶음 응답을 검증하여 부서별 사유를 채우고 캐시에 저장"""
+        GPT_TOKENS.inc(response.prompt_tokens, kind='prompt')
+        GPT_TOKENS.inc(response.completion_tokens, kind='completion')
+        GPT_REQUESTS.inc(outcome='ok')
+        
+        parsed = parse_batch_reasons(response.text, len(pending))
+        for number, i in enumerate(pending, 1):
+            reason = parsed.get(number)
+            if reason is None:
+                continue
+            reasons[i] = reason
+            if cache_keys[i] is not None:
+                self.response_cache.set(cache_keys[i], reason)
+        
+        trace("gpt_batch", departments=len(pending), valid=len(parsed))
+        return reasons
 
-    def analyze_matching(self, dept_df: pd.DataFrame, personal_df: pd.DataFrame, mbti: str) -> Dict[str, Any]:
+    def analyze_matching(self, dept_df: pd.DataFrame, personal_df: Union[pd.DataFrame, BehaviorAccumulator],
+                         mbti: str, progress_callback: Optional[ProgressCallback] = None) -> Dict[str, Any]:
         """
         종합적인 부서 매칭 분석 수행
         
         Args:
             dept_df (pd.DataFrame): 부서 분석 데이터
-            personal_df (pd.DataFrame): 개인 분석 데이터
+            personal_df (Union[pd.DataFrame, BehaviorAccumulator]): 개인 분석 데이터 또는 청크 집계 누적기
             mbti (str): MBTI 유형
+            progress_callback (Optional[ProgressCallback]): 단계와 부서별 GPT 분석 진행 상황을 받을 함수
             
         Returns:
             Dict[str, Any]: 분석 결과
         """
         try:
-            # 1. 개인 성향 프로필 생성
-            digital_behavior_scores = self.analyze_digital_behavior(personal_df)
-            print(f"디지털 행동 점수: {digital_behavior_scores}")  # 디버깅용
-            
-            # MBTI 점수와 디지털 행동 점수 가중 평균
-            if mbti != "알 수 없음" and mbti in self.mbti_traits:
-                mbti_scores = self.mbti_traits[mbti]
-                print(f"MBTI ({mbti}) 점수: {mbti_scores}")  # 디버깅용
-                # MBTI 70%, 디지털 행동 30% 가중치
-                user_profile = {}
-                for trait in mbti_scores:
-                    combined_score = (mbti_scores[trait] * 0.7 + digital_behavior_scores[trait] * 0.3)
-                    user_profile[trait] = round(combined_score, 1)  # 소수점 1자리로 반올림
-            else:
-                user_profile = {k: round(v, 1) for k, v in digital_behavior_scores.items()}
+            user_profile, department_scores = self._rank_departments(dept_df, personal_df, mbti, progress_callback)
             
-            print(f"최종 사용자 프로필: {user_profile}")  # 디버깅용
+            # 4. 상위 부서만 GPT 분석 생성 (나머지는 fill_department_reasons로 필요할 때 생성)
+            self._fill_reasons(user_profile, department_scores[:self.reason_top_k], mbti, progress_callback)
             
-            # 2. 부서별 적합도 계산
-            department_scores = []
+            # 5. 결과 반환
+            return self._matching_results(user_profile, department_scores, mbti)
             
-            for _, dept_row in dept_df.iterrows():
-                # 부서명과 하위부서명 추출
-                dept_name = dept_row.get('부서명', dept_row.get('department', '알 수 없는 부서'))
-                subdept_name = dept_row.get('하위부서명', dept_row.get('subdepartment', ''))
-                
-                # 전체 부서명 생성 (하위부서가 있으면 결합)
-                if subdept_name and str(subdept_name).strip() and str(subdept_name) != 'nan':
-                    full_dept_name = f"{dept_name} - {subdept_name}"
-                    display_name = full_dept_name
-                else:
-                    full_dept_name = dept_name
-                    display_name = dept_name
-                
-                print(f"분석 중인 부서: {display_name}")  # 디버깅용
-                
-                # 부서별 요구 성향 (하위부서 고려)
-                dept_requirements = self._get_department_requirements_with_subdept(dept_name, subdept_name)
-                
-                # 적합도 계산
-                compatibility_score = self.calculate_department_compatibility(user_profile, dept_requirements)
-                
-                # GPT 분석 생성
-                analysis = self.generate_department_analysis(user_profile, display_name, compatibility_score, mbti)
-                
-                department_scores.append({
-                    'name': display_name,
-                    'full_name': full_dept_name,
-                    'main_dept': dept_name,
-                    'sub_dept': subdept_name,
-                    'score': compatibility_score,
-                    'reason': analysis,
-                    'requirements': dept_requirements
-                })
-                
-                # API 호출 제한을 위한 짧은 지연
-                time.sleep(0.5)
-            
-            # 3. 점수순으로 정렬
-            department_scores.sort(key=lambda x: x['score'], reverse=True)
+        except Exception as e:
+            trace("matching_error", logging.ERROR, error=repr(e))
+            raise e
+
+    async def analyze_matching_async(self, dept_df: pd.DataFrame,
+                                     personal_df: Union[pd.DataFrame, BehaviorAccumulator],
+                                     mbti: str, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        analyze_matching의 비동기 버전
+        
+        적합도 계산은 스레드에서 실행하고, 상위 부서의 GPT 분석은 비동기 클라이언트로 동시에 요청합니다.
+        
+        Args:
+            executor (Optional[Executor]): 적합도 계산을 실행할 스레드 풀 (없으면 이벤트 루프 기본 풀,
+                서버는 요청이 취소된 뒤에도 끝나지 않은 작업 수를 세는 전용 풀을 넘김)
+        
+        Returns:
+            Dict[str, Any]: analyze_matching과 같은 형식의 분석 결과
+        """
+        try:
+            user_profile, department_scores = await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(self._rank_departments, dept_df, personal_df, mbti)
+            )
             
-            # 모든 부서 점수 출력 (디버깅용)
-            print("\n=== 모든 부서별 적합도 점수 ===")
-            for i, dept in enumerate(department_scores, 1):
-                print(f"{i}. {dept['name']}: {dept['score']:.2f}%")
-            print("===========================\n")
+            pending = [dept for dept in department_scores[:self.reason_top_k] if dept.get('reason') is None]
+            if pending:
+                reasons = await self.agenerate_department_analyses(user_profile, pending, mbti)
+                for dept, reason in zip(pending, reasons):
+                    dept['reason'] = reason
             
-            # 4. 결과 반환
-            return {
-                'user_profile': user_profile,
-                'top_departments': department_scores[:2],
-                'all_departments': department_scores,
-                'mbti': mbti,
-                'chart_data': self._prepare_chart_data(department_scores[:2])
-            }
+            return self._matching_results(user_profile, department_scores, mbti)
             
         except Exception as e:
-            print(f"매칭 분석 중 오류: {e}")
+            trace("matching_error", logging.ERROR, error=repr(e))
             raise e
 
+    def _rank_departments(self, dept_df: pd.DataFrame, personal_df: Union[pd.DataFrame, BehaviorAccumulator],
+                          mbti: str, progress_callback: Optional[ProgressCallback] = None
+                          ) -> Tuple[Dict[str, float], RankedDepartments]:
+        """사용자 프로필을 만들고 부서를 적합도순으로 정렬 (상위 부서만 부분 정렬, 배치 사유는 비어 있음)"""
+        def report(stage: str, completed: int, total: int) -> None:
+            if progress_callback is not None:
+                progress_callback(stage, completed, total, None)
+        
+        # 1. 개인 성향 프로필 생성
+        report("behavior", 0, 1)
+        user_profile = self._build_user_profile(personal_df, mbti)
+        
+        # 2. 부서별 적합도 계산
+        report("requirements", 0, 1)
+        with span("requirements"):
+            dept_columns, dept_matrix = self._build_department_table(dept_df)
+        n_departments = dept_matrix.shape[0]
+        report("scoring", 0, n_departments)
+        
+        # 전체 부서 적합도를 행렬 연산으로 한 번에 계산
+        scores = np.empty(0)
+        if n_departments:
+            with span("scoring", departments=n_departments):
+                scores = compatibility_matrix(profiles_to_matrix([user_profile]), dept_matrix)[0]
+        
+        # 3. 점수순 상위 부서만 부분 정렬하여 딕셔너리로 만들고 나머지는 배열로 보관
+        department_scores = RankedDepartments(
+            dept_columns['name'], dept_columns['main_dept'], dept_columns['sub_dept'], scores, dept_matrix,
+            top_k=max(self.top_k, self.reason_top_k, 2)
+        )
+        return user_profile, department_scores
+
+    def _matching_results(self, user_profile: Dict[str, float], department_scores: RankedDepartments,
+                          mbti: str) -> Dict[str, Any]:
+        """analyze_matching 결과 딕셔너리 구성"""
+        # 모든 부서 점수 기록 (추적이 켜져 있을 때만 배열에서 목록 생성)
+        trace("ranking", departments=lambda: list(zip(
+            department_scores.names[department_scores.order()].tolist(),
+            department_scores.scores[department_scores.order()].tolist()
+        )))
+        
+        return {
+            'user_profile': user_profile,
+            'top_departments': department_scores[:2],
+            'all_departments': department_scores,
+            'mbti': mbti,
+            'chart_data': self._prepare_chart_data(department_scores[:2])
+        }
+
+    def fill_department_reasons(self, results: Dict[str, Any], departments: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        배치 사유가 아직 없는 부서의 GPT 분석을 생성 (전체 목록 펼치기, 내보내기 등에서 사용)
+        
+        Args:
+            results (Dict[str, Any]): analyze_matching 결과
+            departments (Optional[List[Dict[str, Any]]]): 사유를 생성할 부서 목록 (없으면 전체 부서)
+        """
+        if departments is None:
+            departments = results['all_departments']
+        self._fill_reasons(results['user_profile'], departments, results['mbti'])
+
+    def _fill_reasons(self, user_profile: Dict[str, float], departments: List[Dict[str, Any]], mbti: str,
+                      progress_callback: Optional[ProgressCallback] = None) -> None:
+        """reason이 비어 있는 부서에 대해서만 GPT 분석을 생성하여 채움"""
+        pending = [dept for dept in departments if dept.get('reason') is None]
+        if not pending:
+            return
+        
+        # GPT 분석 생성 (동시 요청, 속도 제한 적용)
+        reasons = self.generate_department_analyses(user_profile, pending, mbti, progress_callback)
+        for dept, reason in zip(pending, reasons):
+            dept['reason'] = reason
+
+    def match_cohort(self, dept_df: pd.DataFrame, candidates: Iterable[Dict[str, Any]],
+                     top_k: Optional[int] = None) -> pd.DataFrame:
+        """
+        여러 지원자를 하나의 조직도에 대해 한 번에 매칭
+        
+        부서 요구사항은 한 번만 만들고, 전체 지원자의 적합도를 하나의 행렬 연산으로 계산합니다.
+        GPT 배치 사유는 생성하지 않습니다.
+        
+        Args:
+            dept_df (pd.DataFrame): 부서 분석 데이터
+            candidates (Iterable[Dict[str, Any]]): 'candidate_id', 'personal_df'(DataFrame 또는 BehaviorAccumulator),
+                'mbti'(선택)를 가진 지원자 목록
+            top_k (Optional[int]): 지원자별로 남길 상위 부서 수 (없으면 전체 부서)
+            
+        Returns:
+            pd.DataFrame: 지원자별 부서 순위 (candidate_id, mbti, rank, name, main_dept, sub_dept, score)
+        """
+        candidates = list(candidates)
+        batches = list(self.iter_cohort_matches(dept_df, candidates, top_k=top_k,
+                                                batch_size=max(1, len(candidates))))
+        if not batches:
+            return pd.DataFrame(columns=COHORT_COLUMNS)
+        return pd.concat(batches, ignore_index=True)
+
+    def iter_cohort_matches(self, dept_df: pd.DataFrame, candidates: Iterable[Dict[str, Any]],
+                            top_k: Optional[int] = None, batch_size: int = 64) -> Iterator[pd.DataFrame]:
+        """
+        match_cohort의 스트리밍 버전: batch_size명씩 계산하여 결과가 나오는 대로 반환
+        
+        Args:
+            dept_df (pd.DataFrame): 부서 분석 데이터
+            candidates (Iterable[Dict[str, Any]]): 'candidate_id', 'personal_df'(DataFrame 또는 BehaviorAccumulator),
+                'mbti'(선택)를 가진 지원자 목록
+            top_k (Optional[int]): 지원자별로 남길 상위 부서 수 (없으면 전체 부서)
+            batch_size (int): 한 번의 행렬 연산으로 계산할 지원자 수
+            
+        Yields:
+            pd.DataFrame: batch_size명 분량의 지원자별 부서 순위
+        """
+        # 부서 요구사항은 한 번만 생성
+        with span("requirements"):
+            dept_columns, dept_matrix = self._build_department_table(dept_df)
+        n_departments = dept_matrix.shape[0]
+        if not n_departments:
+            return
+        keep = n_departments if top_k is None else min(max(0, top_k), n_departments)
+        
+        batch = []
+        for candidate in candidates:
+            batch.append(candidate)
+            if len(batch) >= batch_size:
+                yield self._score_cohort_batch(batch, dept_matrix, dept_columns, keep)
+                batch = []
+        if batch:
+            yield self._score_cohort_batch(batch, dept_matrix, dept_columns, keep)
+
+    def _score_cohort_batch(self, batch: List[Dict[str, Any]], dept_matrix: np.ndarray,
+                            dept_columns: Dict[str, np.ndarray], keep: int) -> pd.DataFrame:
+        """지원자 묶음의 적합도를 계산하여 지원자별 순위 DataFrame으로 변환"""
+        ids = [candidate.get('candidate_id', i) for i, candidate in enumerate(batch)]
+        mbtis = [candidate.get('mbti') or "알 수 없음" for candidate in batch]
+        profiles = [self._build_user_profile(candidate['personal_df'], mbti)
+                    for candidate, mbti in zip(batch, mbtis)]
+        
+        with span("scoring", candidates=len(batch), departments=dept_matrix.shape[0]):
+            scores = compatibility_matrix(profiles_to_matrix(profiles), dept_matrix)
+        
+        # 점수 내림차순 상위 keep개 (부분 정렬, 동점이면 조직도 순서 유지)
+        order = top_k_indices(scores, keep)
+        flat_order = order.ravel()
+        
+        return pd.DataFrame({
+            'candidate_id': np.repeat(np.array(ids, dtype=object), keep),
+            'mbti': np.repeat(np.array(mbtis, dtype=object), keep),
+            'rank': np.tile(np.arange(1, keep + 1), len(batch)),
+            'name': dept_columns['name'][flat_order],
+            'main_dept': dept_columns['main_dept'][flat_order],
+            'sub_dept': dept_columns['sub_dept'][flat_order],
+            'score': np.take_along_axis(scores, order, axis=1).ravel()
+        }, columns=COHORT_COLUMNS)
+
+    def _build_user_profile(self, personal_df: Union[pd.DataFrame, BehaviorAccumulator], mbti: str) -> Dict[str, float]:
+        """디지털 행동 점수와 MBTI 점수를 결합한 사용자 성향 프로필 생성"""
+        with span("behavior"):
+            digital_behavior_scores = self.analyze_digital_behavior(personal_df)
+        trace("behavior_scores", scores=digital_behavior_scores)
+        
+        # MBTI 점수와 디지털 행동 점수 가중 평균
+        if mbti != "알 수 없음" and mbti in self.mbti_traits:
+            mbti_scores = self.mbti_traits[mbti]
+            # MBTI 70%, 디지털 행동 30% 가중치
+            user_profile = {}
+            for trait in mbti_scores:
+                combined_score = (mbti_scores[trait] * 0.7 + digital_behavior_scores[trait] * 0.3)
+                user_profile[trait] = round(combined_score, 1)  # 소수점 1자리로 반올림
+        else:
+            user_profile = {k: round(v, 1) for k, v in digital_behavior_scores.items()}
+        
+        trace("user_profile", mbti=mbti, profile=user_profile)
+        return user_profile
+
+    def _build_department_table(self, dept_df: pd.DataFrame) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        조직도 데이터에서 부서 이름 열 배열과 요구 성향 행렬 생성 (부서별 딕셔너리는 만들지 않음)
+        
+        Returns:
+            Tuple[Dict[str, np.ndarray], np.ndarray]: name(하위부서 포함 전체 이름), main_dept, sub_dept 배열,
+                (부서 수 × 성향 수) 요구 성향 행렬
+        """
+        # 부서명과 하위부서명 추출
+        if '부서명' in dept_df.columns:
+            dept_names = dept_df['부서명'].tolist()
+        elif 'department' in dept_df.columns:
+            dept_names = dept_df['department'].tolist()
+        else:
+            dept_names = ['알 수 없는 부서'] * len(dept_df)
+        
+        if '하위부서명' in dept_df.columns:
+            subdept_names = dept_df['하위부서명'].tolist()
+        elif 'subdepartment' in dept_df.columns:
+            subdept_names = dept_df['subdepartment'].tolist()
+        else:
+            subdept_names = [''] * len(dept_df)
+        
+        # 조직도 CSV에 성향 컬럼이 있으면 그 값을 우선 사용하고, 비어 있는 값만 기본 요구사항으로 채움
+        csv_matrix = self._read_requirement_columns(dept_df)
+        if csv_matrix is None:
+            dept_matrix = self.requirements_index.matrix(dept_names, subdept_names)
+        else:
+            dept_matrix = csv_matrix.astype(np.float64)
+            missing_rows = np.flatnonzero(np.isnan(dept_matrix).any(axis=1))
+            if len(missing_rows):
+                fallback = self.requirements_index.matrix([dept_names[i] for i in missing_rows],
+                                                          [subdept_names[i] for i in missing_rows])
+                block = dept_matrix[missing_rows]
+                dept_matrix[missing_rows] = np.where(np.isnan(block), fallback, block)
+        
+        # 전체 부서명 생성 (하위부서가 있으면 결합)
+        full_names = [
+            f"{dept_name} - {subdept_name}" if has_subdepartment(subdept_name) else dept_name
+            for dept_name, subdept_name in zip(dept_names, subdept_names)
+        ]
+        
+        dept_columns = {
+            'name': np.array(full_names, dtype=object),
+            'main_dept': np.array(dept_names, dtype=object),
+            'sub_dept': np.array(subdept_names, dtype=object)
+        }
+        trace("department_table", departments=len(full_names))
+        return dept_columns, dept_matrix
+
+    def _read_requirement_columns(self, dept_df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        조직도 데이터의 성향 컬럼(분석력, 창의성, ...)을 (부서 수 × 성향 수) float32 행렬로 변환
+        
+        숫자가 아니거나 0-100 범위를 벗어난 값, 컬럼이 없는 성향은 NaN으로 두어 기본 요구사항으로 채우게 합니다.
+        
+        Returns:
+            Optional[np.ndarray]: 성향 컬럼이 하나도 없으면 None
+        """
+        trait_columns = [trait for trait in TRAITS if trait in dept_df.columns]
+        if not trait_columns:
+            return None
+        
+        values = dept_df[trait_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+        invalid = (values < 0) | (values > 100)
+        if invalid.any():
+            trace("invalid_requirements", logging.WARNING, count=int(invalid.sum()))
+            values[invalid] = np.nan
+        
+        matrix = np.full((len(dept_df), len(TRAITS)), np.nan, dtype=np.float32)
+        matrix[:, [TRAITS.index(trait) for trait in trait_columns]] = values
+        return matrix
+
     def _get_department_requirements_with_subdept(self, dept_name: str, subdept_name: str = "") -> Dict[str, float]:
         """
         부서와 하위부서를 고려한 요구 성향 반환
         """
-        print(f"부서명: '{dept_name}', 하위부서: '{subdept_name}'")  # 디버깅용
-        
-        # 기본 부서 요구사항
-        base_requirements = self._get_department_requirements(dept_name)
-        
-        # 하위부서가 있으면 추가 조정
-        if subdept_name and str(subdept_name).strip() and str(subdept_name) != 'nan':
-            adjusted_requirements = base_requirements.copy()
-            
-            # 하위부서별 특성 조정
-            subdept_lower = str(subdept_name).lower()
-            
-            # 개발 관련 하위부서
-            if any(keyword in subdept_lower for keyword in ['frontend', '프론트엔드', 'ui', 'ux']):
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 10)
-                adjusted_requirements["소통력"] = min(95, adjusted_requirements["소통력"] + 5)
-            elif any(keyword in subdept_lower for keyword in ['backend', '백엔드', 'server', '서버']):
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 10)
-                adjusted_requirements["안정성"] = min(95, adjusted_requirements["안정성"] + 5)
-            elif any(keyword in subdept_lower for keyword in ['devops', '데브옵스', 'infra', '인프라']):
-                adjusted_requirements["안정성"] = min(95, adjusted_requirements["안정성"] + 15)
-                adjusted_requirements["계획성"] = min(95, adjusted_requirements["계획성"] + 10)
-            elif any(keyword in subdept_lower for keyword in ['ai', '인공지능', 'ml', '머신러닝', 'data', '데이터']):
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 15)
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 5)
-            
-            # 마케팅 관련 하위부서
-            elif any(keyword in subdept_lower for keyword in ['digital', '디지털', 'online', '온라인']):
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 10)
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 5)
-            elif any(keyword in subdept_lower for keyword in ['brand', '브랜드', 'pr', '홍보']):
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 15)
-                adjusted_requirements["소통력"] = min(95, adjusted_requirements["소통력"] + 5)
-            elif any(keyword in subdept_lower for keyword in ['performance', '퍼포먼스', 'growth', '그로스']):
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 10)
-                adjusted_requirements["실행력"] = min(95, adjusted_requirements["실행력"] + 10)
-            
-            # 영업 관련 하위부서
-            elif any(keyword in subdept_lower for keyword in ['b2b', 'enterprise', '기업']):
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 5)
-                adjusted_requirements["계획성"] = min(95, adjusted_requirements["계획성"] + 10)
-            elif any(keyword in subdept_lower for keyword in ['b2c', 'consumer', '소비자']):
-                adjusted_requirements["소통력"] = min(95, adjusted_requirements["소통력"] + 10)
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 5)
-            
-            # 기획 관련 하위부서
-            elif any(keyword in subdept_lower for keyword in ['product', '상품', 'service', '서비스']):
-                adjusted_requirements["창의성"] = min(95, adjusted_requirements["창의성"] + 10)
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 5)
-            elif any(keyword in subdept_lower for keyword in ['strategy', '전략', 'business', '사업']):
-                adjusted_requirements["분석력"] = min(95, adjusted_requirements["분석력"] + 10)
-                adjusted_requirements["계획성"] = min(95, adjusted_requirements["계획성"] + 10)
-            
-            # 랜덤 요소 추가 (하위부서명 기반)
-            import random
-            random.seed(hash(f"{dept_name}_{subdept_name}") % 1000)
-            
-            # 각 능력치에 -3~+3 범위의 랜덤 조정
-            for trait in adjusted_requirements:
-                adjustment = random.randint(-3, 3)
-                adjusted_requirements[trait] = max(40, min(100, adjusted_requirements[trait] + adjustment))
-            
-            print(f"하위부서 조정 후 요구사항: {adjusted_requirements}")
-            return adjusted_requirements
-        
-        return base_requirements
+        return dict(self.requirements_index.requirements(dept_name, subdept_name))
 
     def _get_department_requirements(self, dept_name: str) -> Dict[str, float]:
         """
         부서별 요구 성향 반환 (예시 데이터)
         실제로는 CSV 파일에서 가져와야 함
         """
-        print(f"부서명 조회: '{dept_name}'")  # 디버깅용
-        
-        dept_requirements = {
-            "개발팀": {"분석력": 90, "창의성": 80, "독립성": 85, "실행력": 85, "계획성": 75, "소통력": 60, "협력성": 70, "안정성": 70},
-            "마케팅팀": {"소통력": 90, "창의성": 85, "협력성": 80, "실행력": 80, "분석력": 70, "계획성": 75, "독립성": 60, "안정성": 65},
-            "인사팀": {"소통력": 95, "협력성": 90, "안정성": 85, "계획성": 80, "분석력": 75, "실행력": 75, "창의성": 60, "독립성": 50},
-            "재무팀": {"분석력": 95, "계획성": 90, "안정성": 90, "실행력": 80, "독립성": 70, "소통력": 60, "협력성": 65, "창의성": 45},
-            "영업팀": {"소통력": 95, "실행력": 90, "협력성": 85, "창의성": 75, "분석력": 70, "계획성": 70, "독립성": 60, "안정성": 60},
-            "기획팀": {"분석력": 85, "계획성": 90, "창의성": 85, "소통력": 80, "협력성": 80, "실행력": 80, "독립성": 70, "안정성": 75},
-            "디자인팀": {"창의성": 95, "독립성": 80, "분석력": 70, "실행력": 75, "소통력": 70, "협력성": 70, "계획성": 65, "안정성": 60},
-            "고객서비스팀": {"소통력": 95, "협력성": 90, "안정성": 85, "실행력": 80, "계획성": 75, "분석력": 65, "창의성": 60, "독립성": 45}
-        }
-        
-        # 부서명 정확히 매칭되는지 확인
-        if dept_name in dept_requirements:
-            print(f"부서 매칭 성공: {dept_name}")
-            return dept_requirements[dept_name]
-        else:
-            # 유사한 부서명 찾기
-            for key in dept_requirements.keys():
-                if key in dept_name or dept_name in key:
-                    print(f"유사 부서 매칭: '{dept_name}' -> '{key}'")
-                    return dept_requirements[key]
-            
-            print(f"부서 매칭 실패, 기본값 사용: {dept_name}")
-            # 다양한 기본값 설정으로 차별화
-            import random
-            random.seed(hash(dept_name) % 1000)  # 부서명으로 시드 설정하여 일관성 유지
-            
-            base_scores = {}
-            for trait in ["분석력", "창의성", "독립성", "실행력", "계획성", "소통력", "협력성", "안정성"]:
-                base_scores[trait] = random.randint(60, 85)  # 60-85 범위에서 랜덤
-            
-            return base_scores
+        return dict(self.requirements_index.department_requirements(dept_name))
 
     def _prepare_chart_data(self, top_departments: List[Dict]) -> Dict[str, Any]:
         """차트 생성을 위한 데이터 준비"""
@@ -7,7 +7,16 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import base64
 import io
+import os
+import json
+import time
+import hashlib
 from analysis import DepartmentMatcher
+from llm import ResponseCache, MemoryCacheBackend, SQLiteCacheBackend, create_backend
+from metrics import start_metrics_server
+from behavior import read_behavior_files
+from jobs import JobManager, QUEUED, RUNNING, DONE, FAILED, CANCELLED
+from ranking import RankingTable, SORT_KEYS
 from visualization import create_visualization
 
 # 페이지 설정
@@ -197,7 +206,189 @@ def load_css():
     </style>
     """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_response_cache():
+    """세션 간에 공유하는 GPT 응답 캐시 (RESPONSE_CACHE_PATH가 있으면 SQLite 파일에 저장)"""
+    cache_path = os.environ.get("RESPONSE_CACHE_PATH")
+    if cache_path:
+        backend = SQLiteCacheBackend(cache_path)
+    else:
+        backend = MemoryCacheBackend(max_entries=2048)
+    return ResponseCache(backend, ttl=24 * 60 * 60)
+
+@st.cache_resource
+def get_llm_backend(api_key):
+    """
+    세션 간에 공유하는 배치 사유 생성 백엔드 (연결 풀 클라이언트 포함)
+    
+    LLM_BACKEND(openai, openai-compatible, template), LLM_MODEL, LLM_BASE_URL 환경 변수로 선택합니다.
+    """
+    return create_backend(
+        os.environ.get("LLM_BACKEND", "openai"),
+        api_key=api_key,
+        model=os.environ.get("LLM_MODEL"),
+        base_url=os.environ.get("LLM_BASE_URL")
+    )
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """METRICS_PORT가 설정되어 있으면 Prometheus 지표 서버를 한 번만 시작"""
+    port = os.environ.get("METRICS_PORT")
+    if port:
+        return start_metrics_server(int(port))
+    return None
+
+# 분석기 설정 (결과 캐시 키에도 포함)
+MATCHER_CONFIG = {
+    "temperature": 0.7,
+    "reason_top_k": 2,
+    # 상위 부서 사유를 한 번의 요청으로 생성
+    "reason_batch_size": 5
+}
+
+def create_matcher(api_key):
+    """공유 백엔드와 응답 캐시를 사용하는 분석기 생성"""
+    return DepartmentMatcher(
+        api_key,
+        backend=get_llm_backend(api_key),
+        response_cache=get_response_cache(),
+        **MATCHER_CONFIG
+    )
+
+def analysis_cache_key(dept_bytes, personal_payload, mbti, backend):
+    """업로드 파일 내용, MBTI, 분석기/백엔드 설정으로 결과 캐시 키 생성"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(hashlib.blake2b(dept_bytes, digest_size=20).digest())
+    for name, data in personal_payload:
+        digest.update(name.encode('utf-8'))
+        digest.update(hashlib.blake2b(data, digest_size=20).digest())
+    digest.update(mbti.encode('utf-8'))
+    digest.update(json.dumps(MATCHER_CONFIG, sort_keys=True).encode('utf-8'))
+    digest.update(f"{backend.name}:{backend.model}".encode('utf-8'))
+    return digest.hexdigest()
+
+def run_analysis(api_key, dept_bytes, personal_payload, mbti, progress_callback=None):
+    """
+    업로드 파일 내용으로 부서 매칭 분석 수행
+    
+    Args:
+        api_key (str): OpenAI API 키
+        dept_bytes (bytes): 조직도 CSV 내용
+        personal_payload (tuple): (파일명, CSV 내용) 목록
+        mbti (str): MBTI 유형
+        progress_callback (callable): 진행 상황을 받을 함수 (analyze_matching 참고)
+        
+    Returns:
+        Dict[str, Any]: 분석 결과 (file_info, total_data_points 포함)
+    """
+    # 데이터 로드
+    dept_df = pd.read_csv(io.BytesIO(dept_bytes))
+    
+    # 여러 개인 파일을 청크 단위로 읽어 집계 (파일 전체를 합치지 않음)
+    personal_buffers = []
+    for name, data in personal_payload:
+        buffer = io.BytesIO(data)
+        buffer.name = name
+        personal_buffers.append(buffer)
+    behavior, file_info = read_behavior_files(personal_buffers)
+    
+    # 분석 수행
+    results = create_matcher(api_key).analyze_matching(dept_df, behavior, mbti, progress_callback)
+    
+    # 결과에 파일 정보 추가
+    results['file_info'] = file_info
+    results['total_data_points'] = behavior.row_count
+    return results
+
+@st.cache_data(max_entries=32, ttl=6 * 60 * 60, show_spinner=False)
+def run_cached_analysis(cache_key, _api_key, _dept_bytes, _personal_payload, _mbti, _progress_callback=None):
+    """
+    같은 파일/MBTI/설정의 분석 결과를 세션 간에 공유하는 캐시 (cache_key만으로 구분)
+    
+    파일 내용 자체는 해시하지 않도록 밑줄로 시작하는 인자로 전달합니다.
+    """
+    return run_analysis(_api_key, _dept_bytes, _personal_payload, _mbti, _progress_callback)
+
+@st.cache_resource
+def get_job_manager():
+    """세션 간에 공유하는 백그라운드 분석 작업 관리자 (ANALYSIS_WORKERS개 작업 동시 실행)"""
+    return JobManager(max_workers=int(os.environ.get("ANALYSIS_WORKERS", "2")))
+
+def analysis_job(job, cache_key, api_key, dept_bytes, personal_payload, mbti):
+    """작업자 스레드에서 실행되는 분석 작업 (진행 상황은 job에 기록)"""
+    results = run_cached_analysis(cache_key, api_key, dept_bytes, personal_payload, mbti, job.report_progress)
+    # 화면 표시용 HTML 캐시 키로 사용
+    results['result_key'] = cache_key
+    return results
+
+@st.cache_data(max_entries=32, ttl=6 * 60 * 60, show_spinner=False)
+def render_report_html(result_key, _results):
+    """
+    다운로드용 HTML 보고서 (결과 키별로 한 번만 생성)
+    
+    다운로드 버튼을 누를 때만 호출되며, 이후 다시 실행되어도 같은 결과의 보고서는 다시 만들지 않습니다.
+    """
+    return create_visualization(_results)
+
+@st.cache_data(max_entries=32, ttl=6 * 60 * 60, show_spinner=False)
+def render_score_chart_html(result_key, _top_departments):
+    """상위 부서 적합도 차트 HTML (결과 키별로 한 번만 생성)"""
+    return build_score_chart_html(_top_departments)
+
+@st.cache_resource(max_entries=8, ttl=6 * 60 * 60, show_spinner=False)
+def get_ranking_table(result_key, _departments):
+    """전체 부서 순위 표 (결과 키별로 한 번만 생성, 정렬 순서도 표 안에 보관)"""
+    return RankingTable(_departments)
+
+# 진행 단계 표시 이름과 진행률 시작 지점
+JOB_STAGES = {
+    "behavior": ("디지털 행동 분석", 0.05),
+    "requirements": ("부서 요구 성향 계산", 0.15),
+    "scoring": ("부서별 적합도 계산", 0.25),
+    "gpt": ("부서별 배치 사유 생성", 0.3)
+}
+
+def display_job_status(job):
+    """
+    백그라운드 분석 작업 상태 표시
+    
+    완료된 작업의 결과는 세션 상태로 옮겨 아래 결과 섹션에서 표시합니다.
+    """
+    if job.status in (QUEUED, RUNNING):
+        progress = job.snapshot()
+        label, start = JOB_STAGES.get(progress['stage'], ("분석 대기 중", 0.0))
+        value = start
+        text = label
+        if progress['stage'] == "gpt" and progress['total']:
+            value = start + (1 - start) * progress['completed'] / progress['total']
+            text = f"{label} ({progress['completed']}/{progress['total']})"
+            if progress['department']:
+                text += f" - {progress['department']} 완료"
+        
+        with st.container(border=True):
+            st.progress(min(value, 1.0), text=text)
+            if job.cancel_requested:
+                st.markdown('<div class="progress-text">취소 요청 중입니다...</div>', unsafe_allow_html=True)
+            elif st.button("분석 취소", key="cancel_btn"):
+                get_job_manager().cancel(job.id)
+                st.rerun()
+    
+    elif job.status == DONE:
+        if st.session_state.get('loaded_job_id') != job.id:
+            results = job.result
+            st.session_state.analysis_results = results
+            st.session_state.analysis_complete = True
+            st.session_state.loaded_job_id = job.id
+            st.success(f"분석이 완료되었습니다! (총 {len(results['file_info'])}개 파일, {results['total_data_points']}개 데이터 포인트 분석)")
+    
+    elif job.status == FAILED:
+        st.markdown(f'<div class="error-message">분석 중 오류가 발생했습니다: {job.error}</div>', unsafe_allow_html=True)
+    
+    elif job.status == CANCELLED:
+        st.markdown('<div class="progress-text">분석이 취소되었습니다.</div>', unsafe_allow_html=True)
+
 def main():
+    start_metrics_endpoint()
     load_css()
     
     # 메인 제목
@@ -209,6 +400,10 @@ def main():
     if 'analysis_complete' not in st.session_state:
         st.session_state.analysis_complete = False
     
+    # 새로 고침이나 재접속 시 URL의 작업 ID로 진행 중이던 분석 작업을 다시 연결
+    if 'job_id' not in st.session_state and st.query_params.get('job'):
+        st.session_state.job_id = st.query_params['job']
+    
     # 1. API 키 인증 섹션
     with st.container(border=True):
         st.markdown("**OpenAI API 키 인증**")
@@ -231,14 +426,8 @@ def main():
             if api_key:
                 try:
                     openai.api_key = api_key
-                    # API 키 검증  
-                    from openai import OpenAI
-                    client = OpenAI(api_key=api_key)
-                    test_response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[{"role": "user", "content": "test"}],
-                        max_tokens=1
-                    )
+                    # API 키 검증 (모델 정보 조회만 하며, 분석에도 같은 백엔드를 재사용)
+                    get_llm_backend(api_key).verify()
                     st.session_state.api_verified = True
                     st.session_state.api_key = api_key
                     st.markdown('<div class="custom-success">API 키가 성공적으로 인증되었습니다!</div>', unsafe_allow_html=True)
@@ -299,46 +488,41 @@ def main():
         # 4. 분석 시작 버튼
         st.markdown('<div style="text-align: center; margin: 30px 0;">', unsafe_allow_html=True)
         
+        job_manager = get_job_manager()
+        job = job_manager.get(st.session_state.get('job_id'))
+        job_active = job is not None and not job.finished
+        
         if dept_file and personal_files:
-            if st.button("부서 매칭 분석 시작", key="analyze_btn"):
-                with st.spinner('분석 중입니다...'):
-                    try:
-                        # 데이터 로드
-                        dept_df = pd.read_csv(dept_file)
-                        
-                        # 여러 개인 파일 통합
-                        personal_dfs = []
-                        file_info = []
-                        for pf in personal_files:
-                            df = pd.read_csv(pf)
-                            df['파일명'] = pf.name  # 파일 출처 추가
-                            personal_dfs.append(df)
-                            file_info.append(f"{pf.name} ({len(df)}행)")
-                        
-                        # 파일들을 통합 (세로로 연결)
-                        personal_df = pd.concat(personal_dfs, ignore_index=True)
-                        
-                        # 분석 수행
-                        matcher = DepartmentMatcher(st.session_state.api_key)
-                        results = matcher.analyze_matching(dept_df, personal_df, selected_mbti)
-                        
-                        # 결과에 파일 정보 추가
-                        results['file_info'] = file_info
-                        results['total_data_points'] = len(personal_df)
-                        
-                        # 결과 저장
-                        st.session_state.analysis_results = results
-                        st.session_state.analysis_complete = True
-                        
-                        st.success(f"분석이 완료되었습니다! (총 {len(personal_files)}개 파일, {len(personal_df)}개 데이터 포인트 분석)")
-                        
-                    except Exception as e:
-                        st.markdown(f'<div class="error-message">분석 중 오류가 발생했습니다: {str(e)}</div>', unsafe_allow_html=True)
-        else:
+            if st.button("부서 매칭 분석 시작", key="analyze_btn", disabled=job_active):
+                try:
+                    # 업로드 내용 해시로 이전 분석 결과 재사용 (분석은 작업자 스레드에서 실행)
+                    dept_bytes = dept_file.getvalue()
+                    personal_payload = tuple((pf.name, pf.getvalue()) for pf in personal_files)
+                    cache_key = analysis_cache_key(
+                        dept_bytes, personal_payload, selected_mbti, get_llm_backend(st.session_state.api_key)
+                    )
+                    job_id = job_manager.submit(
+                        analysis_job, cache_key, st.session_state.api_key, dept_bytes, personal_payload, selected_mbti
+                    )
+                    
+                    # 작업 ID는 세션과 URL에 저장하여 새로 고침 후에도 다시 연결
+                    st.session_state.job_id = job_id
+                    st.query_params['job'] = job_id
+                    st.session_state.analysis_complete = False
+                    
+                except Exception as e:
+                    st.markdown(f'<div class="error-message">분석 중 오류가 발생했습니다: {str(e)}</div>', unsafe_allow_html=True)
+                else:
+                    st.rerun()
+        elif not job_active:
             st.markdown('<div class="progress-text">부서 파일과 개인 분석 파일(들)을 모두 업로드해주세요</div>', unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
         
+        # 백그라운드 작업 진행 상황 / 결과 반영
+        if job is not None:
+            display_job_status(job)
+        
         # 5. 결과 표시 및 다운로드
         if st.session_state.analysis_complete and 'analysis_results' in st.session_state:
             st.markdown("---")
@@ -349,15 +533,20 @@ def main():
             # 결과 표시
             display_results(results)
             
-            # HTML 다운로드 버튼
-            html_content = create_visualization(results)
+            # HTML 다운로드 버튼 (보고서는 버튼을 누를 때 생성하고 결과별로 캐시)
+            result_key = results['result_key']
             st.download_button(
                 label="분석 결과 HTML 다운로드",
-                data=html_content,
+                data=lambda: render_report_html(result_key, results),
                 file_name=f"department_matching_result.html",
                 mime="text/html",
                 key="download_btn"
             )
+        
+        # 작업이 끝날 때까지 주기적으로 다시 실행하여 진행 상황 갱신
+        if job_active:
+            time.sleep(1)
+            st.rerun()
 
 def display_results(results):
     """분석 결과를 화면에 표시"""
@@ -380,193 +569,276 @@ def display_results(results):
         with st.container(border=True):
             st.markdown("**부서별 적합도 비교**")
             
-            # 데이터 준비
-            dept_names = [dept['name'] for dept in results['top_departments'][:2]]
-            dept_scores = [dept['score'] for dept in results['top_departments'][:2]]
-            
-            # 입체감 있는 애니메이션 바 차트 HTML/CSS/JS
-            chart_html = f"""
-            <div style="padding: 20px;">
-                <style>
-                .progress-container {{
-                    margin: 15px 0;
-                    padding: 0;
-                }}
-                
-                .dept-label {{
-                    font-size: 13px;
-                    font-weight: 600;
-                    color: #2c2c2c;
-                    margin-bottom: 8px;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                
-                .score-value {{
-                    font-size: 14px;
-                    font-weight: 700;
-                    color: #8e44ad;
-                }}
-                
-                .progress-track {{
-                    width: 100%;
-                    height: 28px;
-                    background: linear-gradient(145deg, #f8f9fa, #e9ecef);
-                    border-radius: 14px;
-                    position: relative;
-                    overflow: hidden;
-                    box-shadow: 
-                        inset 2px 2px 5px rgba(0,0,0,0.1),
-                        inset -2px -2px 5px rgba(255,255,255,0.7);
-                    border: 1px solid rgba(0,0,0,0.05);
-                }}
-                
-                .progress-bar {{
-                    height: 100%;
-                    border-radius: 14px;
-                    position: relative;
-                    background: linear-gradient(135deg, #8e44ad, #9b59b6, #af7ac5);
-                    box-shadow: 
-                        2px 2px 8px rgba(142, 68, 173, 0.3),
-                        inset 1px 1px 3px rgba(255,255,255,0.3);
-                    transition: width 2.5s cubic-bezier(0.4, 0, 0.2, 1);
-                    width: 0%;
-                    overflow: hidden;
-                }}
-                
-                .progress-bar::before {{
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: -100%;
-                    width: 100%;
-                    height: 100%;
-                    background: linear-gradient(90deg, 
-                        transparent, 
-                        rgba(255,255,255,0.4), 
-                        transparent
-                    );
-                    animation: shine 3s infinite;
-                }}
-                
-                .progress-bar.high-score {{
-                    background: linear-gradient(135deg, #27ae60, #2ecc71, #58d68d);
-                    box-shadow: 
-                        2px 2px 8px rgba(46, 204, 113, 0.3),
-                        inset 1px 1px 3px rgba(255,255,255,0.3);
-                }}
-                
-                .progress-bar.medium-score {{
-                    background: linear-gradient(135deg, #f39c12, #e67e22, #f4d03f);
-                    box-shadow: 
-                        2px 2px 8px rgba(243, 156, 18, 0.3),
-                        inset 1px 1px 3px rgba(255,255,255,0.3);
-                }}
-                
-                .progress-bar.low-score {{
-                    background: linear-gradient(135deg, #e74c3c, #c0392b, #ec7063);
-                    box-shadow: 
-                        2px 2px 8px rgba(231, 76, 60, 0.3),
-                        inset 1px 1px 3px rgba(255,255,255,0.3);
-                }}
-                
-                @keyframes shine {{
-                    0% {{ left: -100%; }}
-                    50% {{ left: 100%; }}
-                    100% {{ left: 100%; }}
-                }}
-                
-                .progress-text {{
-                    position: absolute;
-                    top: 50%;
-                    right: 12px;
-                    transform: translateY(-50%);
-                    color: white;
-                    font-size: 11px;
-                    font-weight: 700;
-                    text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-                    opacity: 0;
-                    transition: opacity 1s ease-in-out 1.5s;
-                }}
-                
-                .progress-text.show {{
-                    opacity: 1;
-                }}
-                
-                .chart-title {{
-                    text-align: center;
-                    font-size: 16px;
-                    font-weight: 600;
-                    color: #2c2c2c;
-                    margin-bottom: 25px;
-                    padding-bottom: 10px;
-                    border-bottom: 2px solid #e9ecef;
-                }}
-                </style>
-                
-                <div class="chart-title">부서별 적합도 분석</div>
-                
-                <div id="progress-chart">
-            """
-            
-            # 각 부서별 진행 바 생성
-            for i, (name, score) in enumerate(zip(dept_names, dept_scores)):
-                score_class = "high-score" if score >= 80 else "medium-score" if score >= 60 else "low-score"
-                
-                chart_html += f"""
-                <div class="progress-container">
-                    <div class="dept-label">
-                        <span>{i+1}. {name}</span>
-                        <span class="score-value" id="score-{i}">0%</span>
-                    </div>
-                    <div class="progress-track">
-                        <div class="progress-bar {score_class}" id="bar-{i}" data-score="{score:.1f}">
-                            <div class="progress-text" id="text-{i}">{score:.1f}%</div>
-                        </div>
-                    </div>
-                </div>
-                """
-            
-            chart_html += """
+            # HTML 렌더링 (결과가 바뀌지 않으면 캐시된 HTML 사용)
+            chart_html = render_score_chart_html(results['result_key'], results['top_departments'][:2])
+            st.components.v1.html(chart_html, height=250)
+    
+    # 전체 부서 순위
+    display_full_ranking(results)
+
+# 전체 순위 정렬 기준 (표시 이름 → RankingTable 정렬 키)
+RANKING_SORT_OPTIONS = {"순위": "rank", "적합도": "score", "부서명": "name", "상위 부서": "main_dept"}
+RANKING_SORT_OPTIONS.update({trait: trait for trait in SORT_KEYS if trait not in RANKING_SORT_OPTIONS.values()})
+
+# 전체 순위 표 컬럼 표시 이름
+RANKING_COLUMN_LABELS = {
+    "rank": "순위", "name": "부서", "main_dept": "상위 부서", "sub_dept": "하위 부서",
+    "score": "적합도", "reason": "배치 사유"
+}
+
+@st.fragment
+def display_full_ranking(results):
+    """
+    전체 부서 순위 표와 요구사항 히트맵 표시
+    
+    정렬, 검색, 페이지 나누기는 서버에서 처리하여 한 페이지의 행만 화면에 보내고,
+    이 영역의 위젯을 조작하면 페이지 전체가 아니라 이 영역만 다시 실행됩니다.
+    """
+    table = get_ranking_table(results['result_key'], results['all_departments'])
+    if not len(table):
+        return
+    
+    with st.expander(f"전체 부서 순위 ({len(table)}개)"):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            query = st.text_input("부서 검색", key="ranking_query", placeholder="부서명 일부를 입력하세요")
+        with col2:
+            sort_label = st.selectbox("정렬 기준", list(RANKING_SORT_OPTIONS), key="ranking_sort")
+        with col3:
+            page_size = st.selectbox("페이지당 행 수", [25, 50, 100], index=1, key="ranking_page_size")
+        descending = st.checkbox("내림차순", key="ranking_descending")
+        sort_by = RANKING_SORT_OPTIONS[sort_label]
+        
+        total = len(table.order(sort_by, descending, query))
+        pages = max(1, -(-total // page_size))
+        # 검색어나 페이지 크기가 바뀌어 페이지 수가 줄면 첫 페이지로 이동
+        if st.session_state.get("ranking_page", 1) > pages:
+            st.session_state.ranking_page = 1
+        page = st.number_input(f"페이지 (총 {pages}쪽, {total}개 부서)", min_value=1, max_value=pages,
+                               step=1, key="ranking_page")
+        
+        page_df, _ = table.page(page, page_size, sort_by, descending, query)
+        st.dataframe(
+            page_df.rename(columns=RANKING_COLUMN_LABELS),
+            hide_index=True,
+            width="stretch",
+            column_config={
+                "적합도": st.column_config.ProgressColumn("적합도", format="%.1f%%", min_value=0, max_value=100),
+                "배치 사유": st.column_config.TextColumn("배치 사유", width="large")
+            }
+        )
+        
+        # 요구사항 히트맵 (정렬 순서대로 최대 40개 구간의 평균으로 축소)
+        heatmap = table.heatmap(40, sort_by, descending, query)
+        if heatmap['labels']:
+            fig = go.Figure(go.Heatmap(
+                z=heatmap['z'],
+                x=heatmap['traits'],
+                y=heatmap['labels'],
+                customdata=[[size] * len(heatmap['traits']) for size in heatmap['sizes']],
+                colorscale=[[0, '#ffffff'], [0.5, '#c39bd3'], [1, '#8e44ad']],
+                zmin=0,
+                zmax=100,
+                colorbar=dict(title="요구 수준"),
+                hovertemplate="%{y}<br>%{x}: %{z:.0f} (부서 %{customdata}개 평균)<extra></extra>"
+            ))
+            fig.update_layout(
+                title="부서별 성향 요구사항",
+                yaxis=dict(autorange="reversed"),
+                height=max(300, 22 * len(heatmap['labels']) + 120),
+                margin=dict(l=10, r=10, t=50, b=10)
+            )
+            st.plotly_chart(fig, width="stretch")
+
+def build_score_chart_html(top_departments):
+    """상위 부서 적합도 애니메이션 바 차트 HTML 생성"""
+    
+    # 데이터 준비
+    dept_names = [dept['name'] for dept in top_departments]
+    dept_scores = [dept['score'] for dept in top_departments]
+    
+    # 입체감 있는 애니메이션 바 차트 HTML/CSS/JS
+    chart_html = f"""
+    <div style="padding: 20px;">
+        <style>
+        .progress-container {{
+            margin: 15px 0;
+            padding: 0;
+        }}
+
+        .dept-label {{
+            font-size: 13px;
+            font-weight: 600;
+            color: #2c2c2c;
+            margin-bottom: 8px;
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+        }}
+
+        .score-value {{
+            font-size: 14px;
+            font-weight: 700;
+            color: #8e44ad;
+        }}
+
+        .progress-track {{
+            width: 100%;
+            height: 28px;
+            background: linear-gradient(145deg, #f8f9fa, #e9ecef);
+            border-radius: 14px;
+            position: relative;
+            overflow: hidden;
+            box-shadow: 
+                inset 2px 2px 5px rgba(0,0,0,0.1),
+                inset -2px -2px 5px rgba(255,255,255,0.7);
+            border: 1px solid rgba(0,0,0,0.05);
+        }}
+
+        .progress-bar {{
+            height: 100%;
+            border-radius: 14px;
+            position: relative;
+            background: linear-gradient(135deg, #8e44ad, #9b59b6, #af7ac5);
+            box-shadow: 
+                2px 2px 8px rgba(142, 68, 173, 0.3),
+                inset 1px 1px 3px rgba(255,255,255,0.3);
+            transition: width 2.5s cubic-bezier(0.4, 0, 0.2, 1);
+            width: 0%;
+            overflow: hidden;
+        }}
+
+        .progress-bar::before {{
+            content: '';
+            position: absolute;
+            top: 0;
+            left: -100%;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(90deg, 
+                transparent, 
+                rgba(255,255,255,0.4), 
+                transparent
+            );
+            animation: shine 3s infinite;
+        }}
+
+        .progress-bar.high-score {{
+            background: linear-gradient(135deg, #27ae60, #2ecc71, #58d68d);
+            box-shadow: 
+                2px 2px 8px rgba(46, 204, 113, 0.3),
+                inset 1px 1px 3px rgba(255,255,255,0.3);
+        }}
+
+        .progress-bar.medium-score {{
+            background: linear-gradient(135deg, #f39c12, #e67e22, #f4d03f);
+            box-shadow: 
+                2px 2px 8px rgba(243, 156, 18, 0.3),
+                inset 1px 1px 3px rgba(255,255,255,0.3);
+        }}
+
+        .progress-bar.low-score {{
+            background: linear-gradient(135deg, #e74c3c, #c0392b, #ec7063);
+            box-shadow: 
+                2px 2px 8px rgba(231, 76, 60, 0.3),
+                inset 1px 1px 3px rgba(255,255,255,0.3);
+        }}
+
+        @keyframes shine {{
+            0% {{ left: -100%; }}
+            50% {{ left: 100%; }}
+            100% {{ left: 100%; }}
+        }}
+
+        .progress-text {{
+            position: absolute;
+            top: 50%;
+            right: 12px;
+            transform: translateY(-50%);
+            color: white;
+            font-size: 11px;
+            font-weight: 700;
+            text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
+            opacity: 0;
+            transition: opacity 1s ease-in-out 1.5s;
+        }}
+
+        .progress-text.show {{
+            opacity: 1;
+        }}
+
+        .chart-title {{
+            text-align: center;
+            font-size: 16px;
+            font-weight: 600;
+            color: #2c2c2c;
+            margin-bottom: 25px;
+            padding-bottom: 10px;
+            border-bottom: 2px solid #e9ecef;
+        }}
+        </style>
+
+        <div class="chart-title">부서별 적합도 분석</div>
+
+        <div id="progress-chart">
+    """
+    
+    # 각 부서별 진행 바 생성
+    for i, (name, score) in enumerate(zip(dept_names, dept_scores)):
+        score_class = "high-score" if score >= 80 else "medium-score" if score >= 60 else "low-score"
+
+        chart_html += f"""
+        <div class="progress-container">
+            <div class="dept-label">
+                <span>{i+1}. {name}</span>
+                <span class="score-value" id="score-{i}">0%</span>
+            </div>
+            <div class="progress-track">
+                <div class="progress-bar {score_class}" id="bar-{i}" data-score="{score:.1f}">
+                    <div class="progress-text" id="text-{i}">{score:.1f}%</div>
                 </div>
-                
-                <script>
-                // 페이지 로드 후 애니메이션 시작
-                setTimeout(() => {
-                    const bars = document.querySelectorAll('.progress-bar');
-                    bars.forEach((bar, index) => {
-                        const score = parseFloat(bar.dataset.score);
-                        const scoreElement = document.getElementById(`score-${index}`);
-                        const textElement = document.getElementById(`text-${index}`);
-                        
-                        // 바 애니메이션
-                        setTimeout(() => {
-                            bar.style.width = score + '%';
-                        }, index * 200);
-                        
-                        // 숫자 카운트 애니메이션
-                        setTimeout(() => {
-                            let currentScore = 0;
-                            const increment = score / 50; // 50단계로 나누어 애니메이션
-                            const timer = setInterval(() => {
-                                currentScore += increment;
-                                if (currentScore >= score) {
-                                    currentScore = score;
-                                    clearInterval(timer);
-                                    textElement.classList.add('show');
-                                }
-                                scoreElement.textContent = currentScore.toFixed(1) + '%';
-                            }, 50);
-                        }, index * 200 + 500);
-                    });
-                }, 500);
-                </script>
             </div>
-            """
-            
-            # HTML 렌더링
-            st.components.v1.html(chart_html, height=250)
+        </div>
+        """
+    
+    chart_html += """
+        </div>
+
+        <script>
+        // 페이지 로드 후 애니메이션 시작
+        setTimeout(() => {
+            const bars = document.querySelectorAll('.progress-bar');
+            bars.forEach((bar, index) => {
+                const score = parseFloat(bar.dataset.score);
+                const scoreElement = document.getElementById(`score-${index}`);
+                const textElement = document.getElementById(`text-${index}`);
+
+                // 바 애니메이션
+                setTimeout(() => {
+                    bar.style.width = score + '%';
+                }, index * 200);
+
+                // 숫자 카운트 애니메이션
+                setTimeout(() => {
+                    let currentScore = 0;
+                    const increment = score / 50; // 50단계로 나누어 애니메이션
+                    const timer = setInterval(() => {
+                        currentScore += increment;
+                        if (currentScore >= score) {
+                            currentScore = score;
+                            clearInterval(timer);
+                            textElement.classList.add('show');
+                        }
+                        scoreElement.textContent = currentScore.toFixed(1) + '%';
+                    }, 50);
+                }, index * 200 + 500);
+            });
+        }, 500);
+        </script>
+    </div>
+    """
+    
+    return chart_html
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+from tracing import span
+
+# 관심사 / 사용시간 컬럼으로 인식하는 컬럼명 (앞쪽이 우선)
+INTEREST_COLUMNS = ['관심사', 'category', '카테고리', 'interest', 'interests']
+TIME_COLUMNS = ['사용시간', 'usage_time', '시간', 'time']
+
+# 카테고리 분류 키워드 (위쪽 카테고리가 우선)
+CATEGORY_KEYWORDS = [
+    ('tech', ['tech', '기술', 'programming', '개발', 'work', '업무']),
+    ('social', ['social', '소셜', 'community', '커뮤니티']),
+    ('news', ['news', '뉴스', 'finance', '금융']),
+    ('art', ['art', '예술', 'design', '디자인']),
+    ('education', ['education', '학습', '교육', 'learning']),
+    ('shopping', ['shopping', '쇼핑', 'commerce']),
+    ('entertainment', ['game', '게임', 'entertainment', '엔터'])
+]
+
+# 카테고리가 성향 점수에 미치는 영향 (영향도 × 계수 만큼 가산)
+CATEGORY_EFFECTS = {
+    'tech': {"분석력": 0.6, "창의성": 0.4, "독립성": 0.3},
+    'social': {"소통력": 0.8, "협력성": 0.6},
+    'news': {"분석력": 0.4, "안정성": 0.6, "계획성": 0.3},
+    'art': {"창의성": 0.8, "독립성": 0.5},
+    'education': {"분석력": 0.5, "계획성": 0.6, "안정성": 0.3},
+    'shopping': {"계획성": 0.4, "실행력": 0.3},
+    'entertainment': {"창의성": 0.4, "소통력": 0.3}
+}
+
+# 카테고리별 키워드를 하나의 정규식으로 미리 컴파일
+_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+    for category, keywords in CATEGORY_KEYWORDS
+]
+
+
+def find_column(columns: List[str], candidates: List[str]) -> Optional[str]:
+    """후보 컬럼명 중 데이터에 존재하는 첫 번째 컬럼 반환"""
+    for col in candidates:
+        if col in columns:
+            return col
+    return None
+
+
+def classify_category(value: Any) -> Optional[str]:
+    """관심사 값을 카테고리로 분류 (해당 없으면 None)"""
+    category_str = str(value).lower()
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(category_str):
+            return category
+    return None
+
+
+def time_weights(times: pd.Series) -> pd.Series:
+    """사용시간을 가중치로 변환 (5시간 기준, 최대 3배, 숫자가 아니면 1.0)"""
+    return (pd.to_numeric(times, errors='coerce') / 5.0).clip(upper=3.0).fillna(1.0)
+
+
+def category_time_weights(categories: pd.Series, times: Optional[pd.Series] = None) -> Dict[str, float]:
+    """
+    카테고리별 사용시간 가중치 합계를 계산
+
+    고유한 관심사 값만 분류한 뒤 코드로 매핑하고 groupby로 합산합니다.
+
+    Args:
+        categories (pd.Series): 관심사 컬럼
+        times (Optional[pd.Series]): 사용시간 컬럼 (없으면 모든 행의 가중치 1.0)
+
+    Returns:
+        Dict[str, float]: 카테고리별 가중치 합계 (처음 등장한 순서)
+    """
+    codes, uniques = pd.factorize(categories)
+    # 코드 -1(NaN)은 마지막 항목인 'nan' 분류 결과로 매핑
+    labels = np.array([classify_category(value) for value in uniques] + [classify_category(float('nan'))],
+                      dtype=object)
+    row_labels = labels[codes]
+
+    if times is None:
+        weights = pd.Series(1.0, index=categories.index)
+    else:
+        weights = time_weights(times)
+
+    sums = weights.groupby(row_labels, sort=False).sum()
+    return {category: float(score) for category, score in sums.items()}
+
+
+class BehaviorAccumulator:
+    """
+    개인 디지털 행동 데이터를 청크 단위로 받아 집계하는 누적기
+
+    카테고리별 가중치 합계와 사용시간 합계/개수만 유지하므로
+    메모리 사용량은 전체 데이터 크기가 아니라 청크 크기에 비례합니다.
+    """
+
+    def __init__(self, interest_col: Optional[str], time_col: Optional[str]):
+        """
+        Args:
+            interest_col (Optional[str]): 관심사 컬럼명 (없으면 카테고리 분석 생략)
+            time_col (Optional[str]): 사용시간 컬럼명
+        """
+        self.interest_col = interest_col
+        self.time_col = time_col
+        self.category_scores = {}
+        self.time_sum = 0.0
+        self.time_count = 0
+        self.row_count = 0
+
+    @classmethod
+    def from_columns(cls, columns: List[str]) -> 'BehaviorAccumulator':
+        """전체 컬럼 목록에서 관심사/사용시간 컬럼을 찾아 누적기 생성"""
+        return cls(find_column(columns, INTEREST_COLUMNS), find_column(columns, TIME_COLUMNS))
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """청크 하나를 집계에 반영 (청크에 없는 컬럼은 빈 값으로 취급)"""
+        self.row_count += len(chunk)
+        if not self.interest_col or chunk.empty:
+            return
+
+        times = chunk[self.time_col] if self.time_col in chunk.columns else None
+
+        if self.interest_col in chunk.columns:
+            weights = category_time_weights(chunk[self.interest_col], times)
+            for category, score in weights.items():
+                self.category_scores[category] = self.category_scores.get(category, 0) + score
+
+        if times is not None:
+            valid_times = pd.to_numeric(times, errors='coerce').dropna()
+            self.time_sum += float(valid_times.sum())
+            self.time_count += int(valid_times.count())
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """
+        성향 점수 계산에 필요한 집계값 반환
+
+        Returns:
+            Optional[Dict[str, Any]]: category_scores, time_sum, time_count, row_count
+                (데이터가 비어 있거나 관심사 컬럼이 없으면 None)
+        """
+        if self.row_count == 0 or not self.interest_col:
+            return None
+        return {
+            'category_scores': dict(self.category_scores),
+            'time_sum': self.time_sum,
+            'time_count': self.time_count,
+            'row_count': self.row_count
+        }
+
+
+def summarize_behavior(personal_df: Union[pd.DataFrame, BehaviorAccumulator]) -> Optional[Dict[str, Any]]:
+    """
+    개인 디지털 행동 데이터를 성향 점수 계산에 필요한 집계값으로 요약
+
+    Args:
+        personal_df (Union[pd.DataFrame, BehaviorAccumulator]): 개인 디지털 행동 분석 데이터 또는 청크 누적기
+
+    Returns:
+        Optional[Dict[str, Any]]: category_scores, time_sum, time_count, row_count
+            (데이터가 비어 있거나 관심사 컬럼이 없으면 None)
+    """
+    if isinstance(personal_df, BehaviorAccumulator):
+        return personal_df.summary()
+
+    if personal_df.empty:
+        return None
+
+    accumulator = BehaviorAccumulator.from_columns(personal_df.columns.tolist())
+    accumulator.update(personal_df)
+    return accumulator.summary()
+
+
+def read_behavior_files(files: List[Any], chunksize: int = 50000) -> Tuple[BehaviorAccumulator, List[str]]:
+    """
+    여러 개인 디지털 행동 CSV 파일을 청크 단위로 읽어 하나의 누적기로 집계
+
+    파일 전체를 메모리에 올리거나 합치지 않고, 필요한 컬럼만 chunksize 행씩 읽습니다.
+    관심사/사용시간 컬럼은 모든 파일의 컬럼을 합친 목록에서 선택합니다.
+
+    Args:
+        files (List[Any]): 파일 경로 또는 업로드된 파일 객체 목록 (파일 객체는 name 속성 사용)
+        chunksize (int): 한 번에 읽을 행 수
+
+    Returns:
+        Tuple[BehaviorAccumulator, List[str]]: 집계 누적기, 파일별 정보 ("파일명 (N행)")
+    """
+    # 1. 헤더만 읽어 전체 컬럼 목록 구성
+    headers = []
+    for f in files:
+        header = pd.read_csv(f, nrows=0).columns.tolist()
+        if hasattr(f, 'seek'):
+            f.seek(0)
+        headers.append(header)
+
+    all_columns = []
+    for header in headers:
+        all_columns.extend(col for col in header if col not in all_columns)
+    accumulator = BehaviorAccumulator.from_columns(all_columns)
+
+    # 2. 파일별로 필요한 컬럼만 청크 단위로 읽어 집계
+    file_info = []
+    with span("ingest", files=len(files)):
+        for f, header in zip(files, headers):
+            usecols = [col for col in (accumulator.interest_col, accumulator.time_col) if col and col in header]
+            if not usecols:
+                # 행 수만 세기 위해 첫 번째 컬럼만 읽음
+                usecols = header[:1]
+
+            rows = 0
+            if usecols:
+                for chunk in pd.read_csv(f, usecols=usecols, chunksize=chunksize):
+                    accumulator.update(chunk)
+                    rows += len(chunk)
+
+            name = os.path.basename(str(getattr(f, 'name', f)))
+            file_info.append(f"{name} ({rows}행)")
+
+    return accumulator, file_info
@@ -0,0 +1,188 @@
+"""
+부서 매칭 파이프라인 벤치마크
+
+합성 조직도와 디지털 행동 로그를 만들어 단계별 실행 시간을 측정하고 JSON으로 출력합니다.
+커밋 간 결과 파일을 비교하여 성능 저하를 확인할 수 있습니다.
+결과 JSON은 표준 출력으로, 진행 상황은 표준 오류로 출력합니다 (--output으로 파일 저장).
+
+사용 예:
+    python bench.py --departments 10 100 1000 10000 --rows 100 10000 1000000 --output /tmp/bench_results.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from analysis import DepartmentMatcher
+from department_requirements import DEPARTMENT_REQUIREMENTS
+from llm import TemplateBackend
+from visualization import create_visualization
+
+MBTI_TYPES = ["INTJ", "INTP", "ENTJ", "ENTP", "INFJ", "INFP", "ENFJ", "ENFP",
+              "ISTJ", "ISFJ", "ESTJ", "ESFJ", "ISTP", "ISFP", "ESTP", "ESFP"]
+
+SUBDEPARTMENT_NAMES = ["Frontend", "백엔드", "인프라", "데이터", "디지털", "브랜드", "그로스",
+                       "B2B", "B2C", "상품", "전략", "운영", "지원"]
+
+INTEREST_VALUES = ["기술", "programming", "소셜", "커뮤니티", "뉴스", "금융", "디자인", "예술",
+                   "교육", "learning", "쇼핑", "게임", "엔터", "여행", "기타"]
+
+
+def make_org_chart(n_departments: int, seed: int = 0) -> pd.DataFrame:
+    """
+    합성 조직도 생성 (등록 부서, 등록되지 않은 부서, 하위부서가 섞여 있음)
+
+    Args:
+        n_departments (int): 행 수 (부서/하위부서 수)
+        seed (int): 난수 시드
+
+    Returns:
+        pd.DataFrame: 부서명, 하위부서명 컬럼을 가진 조직도
+    """
+    rng = np.random.default_rng(seed)
+    known = list(DEPARTMENT_REQUIREMENTS)
+    unknown = [f"신규사업{i}팀" for i in range(max(1, n_departments // 10))]
+    dept_names = np.where(
+        rng.random(n_departments) < 0.7,
+        rng.choice(known, n_departments),
+        rng.choice(unknown, n_departments)
+    )
+    subdept_names = np.where(
+        rng.random(n_departments) < 0.6,
+        [f"{name} {i}" for i, name in enumerate(rng.choice(SUBDEPARTMENT_NAMES, n_departments))],
+        ""
+    )
+    return pd.DataFrame({'부서명': dept_names, '하위부서명': subdept_names})
+
+
+def make_behavior_log(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    합성 디지털 행동 로그 생성
+
+    Args:
+        n_rows (int): 행 수
+        seed (int): 난수 시드
+
+    Returns:
+        pd.DataFrame: 관심사, 사용시간 컬럼을 가진 행동 로그
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '관심사': rng.choice(INTEREST_VALUES, n_rows),
+        '사용시간': np.round(rng.gamma(2.0, 2.0, n_rows), 1)
+    })
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """함수를 repeat회 실행하여 최소/중앙값/최대 소요 시간(초) 반환"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return ""
+
+
+def run_benchmarks(department_sizes: List[int], row_sizes: List[int], repeat: int = 3,
+                   pair_count: int = 10000) -> Dict[str, Any]:
+    """
+    전체 벤치마크 실행
+
+    Args:
+        department_sizes (List[int]): 조직도 크기 목록
+        row_sizes (List[int]): 행동 로그 크기 목록
+        repeat (int): 측정 반복 횟수
+        pair_count (int): calculate_department_compatibility 단일 호출 측정 횟수
+
+    Returns:
+        Dict[str, Any]: 실행 환경과 측정 결과
+    """
+    matcher = DepartmentMatcher("benchmark", backend=TemplateBackend())
+    results = []
+
+    def record(name: str, params: Dict[str, Any], func: Callable[[], Any]) -> None:
+        timing = measure(func, repeat)
+        results.append({'name': name, 'params': params, 'seconds': timing})
+        print(f"{name} {params}: median {timing['median'] * 1000:.2f} ms", file=sys.stderr)
+
+    # 1. 디지털 행동 분석
+    for n_rows in row_sizes:
+        behavior_log = make_behavior_log(n_rows)
+        record("analyze_digital_behavior", {'rows': n_rows},
+               lambda: matcher.analyze_digital_behavior(behavior_log))
+
+    # 2. 적합도 계산 (단일 쌍 반복 호출)
+    user_profile = matcher.mbti_traits["INTJ"]
+    requirements = DEPARTMENT_REQUIREMENTS["개발팀"]
+    record("calculate_department_compatibility", {'pairs': pair_count},
+           lambda: [matcher.calculate_department_compatibility(user_profile, requirements)
+                    for _ in range(pair_count)])
+
+    # 3. 전체 매칭 분석 (배치 사유는 네트워크 없이 템플릿 백엔드로 생성)
+    behavior_log = make_behavior_log(min(row_sizes) if row_sizes else 100)
+    for n_departments in department_sizes:
+        org_chart = make_org_chart(n_departments)
+        record("analyze_matching", {'departments': n_departments},
+               lambda: DepartmentMatcher(
+                   "benchmark", backend=TemplateBackend()
+               ).analyze_matching(org_chart, behavior_log, "INTJ"))
+
+    # 4. HTML 보고서 생성 (보고서에는 상위 부서만 표시)
+    analysis_results = matcher.analyze_matching(make_org_chart(max(department_sizes or [10])), behavior_log, "INTJ")
+    record("create_visualization", {'departments': len(analysis_results['top_departments'])},
+           lambda: create_visualization(analysis_results))
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부서 매칭 파이프라인 벤치마크")
+    parser.add_argument("--departments", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="조직도 부서/하위부서 수 (여러 개 지정 가능)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10000, 1000000],
+                        help="디지털 행동 로그 행 수 (여러 개 지정 가능, 최대 10^7 권장)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--pairs", type=int, default=10000, help="단일 적합도 계산 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.departments, args.rows, args.repeat, args.pairs)
+    if args.output is None:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+부서 매칭 일괄 실행 (Streamlit 없이 명령줄에서 실행)
+
+조직도 CSV 하나와 여러 지원자의 디지털 행동 CSV를 받아 지원자별 부서 순위를
+프로세스 풀에서 지원자 묶음 단위로 계산하고 CSV / Parquet / JSONL 파일로 저장합니다.
+
+지원자 구분:
+    - 디렉터리 안의 CSV 파일 하나 = 지원자 한 명 (파일명이 지원자 ID)
+    - 디렉터리 안의 하위 디렉터리 하나 = 지원자 한 명 (하위 디렉터리의 모든 CSV를 합쳐 분석)
+    - glob 패턴을 주면 일치하는 CSV 파일 하나가 지원자 한 명
+
+사용 예:
+    python cli.py --org-chart org.csv --personal "logs/*.csv" --mbti mbti.csv --output results.parquet --html-dir reports
+    python cli.py --org-chart org.csv --personal logs --output results.csv --report-zip reports.zip --dashboard dashboard.html
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from analysis import DepartmentMatcher, COHORT_COLUMNS
+from behavior import read_behavior_files
+from llm import BACKENDS, create_backend
+from report_export import ReportZipWriter, render_candidate_report, trim_results
+
+# 출력 컬럼 (match_cohort 컬럼 + GPT 배치 사유)
+OUTPUT_COLUMNS = COHORT_COLUMNS + ['reason']
+
+OUTPUT_FORMATS = ('csv', 'parquet', 'jsonl')
+
+UNKNOWN_MBTI = "알 수 없음"
+
+
+def discover_candidates(personal: str) -> List[Tuple[str, List[str]]]:
+    """
+    개인 행동 파일 경로에서 지원자 목록 구성
+
+    Args:
+        personal (str): 디렉터리 경로 또는 glob 패턴
+
+    Returns:
+        List[Tuple[str, List[str]]]: (지원자 ID, CSV 파일 경로 목록), 지원자 ID 순
+
+    Raises:
+        ValueError: 서로 다른 파일/디렉터리가 같은 지원자 ID가 되는 경우
+            (예: glob 패턴의 a/kim.csv와 b/kim.csv)
+    """
+    candidates = {}
+
+    def add(candidate_id: str, files: List[str], source: str) -> None:
+        if candidate_id in candidates:
+            raise ValueError(f"같은 지원자 ID({candidate_id})가 되는 경로가 여러 개입니다: "
+                             f"{candidates[candidate_id][1]}, {source} (파일 이름을 바꾸거나 패턴을 좁혀 주세요)")
+        candidates[candidate_id] = (files, source)
+
+    if os.path.isdir(personal):
+        for entry in sorted(os.listdir(personal)):
+            path = os.path.join(personal, entry)
+            if os.path.isdir(path):
+                files = sorted(glob.glob(os.path.join(path, "*.csv")))
+                if files:
+                    add(entry, files, path)
+            elif entry.lower().endswith(".csv"):
+                add(os.path.splitext(entry)[0], [path], path)
+    else:
+        for path in sorted(glob.glob(personal, recursive=True)):
+            if os.path.isfile(path):
+                add(os.path.splitext(os.path.basename(path))[0], [path], path)
+    return sorted((candidate_id, files) for candidate_id, (files, _) in candidates.items())
+
+
+def read_mbti_mapping(path: Optional[str]) -> Dict[str, str]:
+    """
+    지원자별 MBTI 매핑 파일 읽기
+
+    첫 번째 컬럼(또는 candidate_id 컬럼)이 지원자 ID, mbti 컬럼(없으면 두 번째 컬럼)이 MBTI 유형입니다.
+
+    Args:
+        path (Optional[str]): CSV 파일 경로 (없으면 빈 매핑)
+
+    Returns:
+        Dict[str, str]: 지원자 ID → MBTI (비어 있으면 UNKNOWN_MBTI)
+    """
+    if not path:
+        return {}
+    df = pd.read_csv(path, dtype=str).fillna("")
+    if df.shape[1] < 2:
+        raise ValueError(f"MBTI 매핑 파일에는 지원자 ID와 MBTI 두 컬럼이 필요합니다: {path}")
+    columns = {col.lower(): col for col in df.columns}
+    id_col = columns.get('candidate_id', df.columns[0])
+    mbti_col = columns.get('mbti', df.columns[1])
+    # 빈 값은 MBTI 없이 분석
+    return {
+        str(candidate_id).strip(): str(mbti).strip().upper() or UNKNOWN_MBTI
+        for candidate_id, mbti in zip(df[id_col], df[mbti_col])
+    }
+
+
+# 작업자 프로세스마다 한 번만 만드는 조직도와 분석기
+_worker = {}
+
+
+def _init_worker(org_chart: str, api_key: Optional[str], backend_options: Dict[str, Any],
+                 matcher_options: Dict[str, Any]) -> None:
+    _worker['dept_df'] = pd.read_csv(org_chart)
+    backend = create_backend(api_key=api_key or "", **backend_options)
+    _worker['matcher'] = DepartmentMatcher(api_key or "", backend=backend, **matcher_options)
+
+
+def _process_chunk(chunk: List[Tuple[str, List[str], str]], top_k: int, html_dir: Optional[str],
+                   report_zip: bool = False, dashboard: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    지원자 묶음 분석 (작업자 프로세스에서 실행)
+
+    묶음 전체의 적합도는 match_cohort로 한 번에 계산하고, 배치 사유와 보고서는 지원자별로 만듭니다.
+
+    Args:
+        chunk (List[Tuple[str, List[str], str]]): (지원자 ID, CSV 파일 경로 목록, MBTI) 목록
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 지원자 ID → 결과 (실패한 지원자는 {'error': 메시지})
+    """
+    matcher = _worker['matcher']
+    outcomes = {}
+    cohort = []
+    for candidate_id, files, mbti in chunk:
+        try:
+            behavior, _ = read_behavior_files(files)
+        except Exception as e:
+            outcomes[candidate_id] = {'error': str(e)}
+            continue
+        cohort.append({'candidate_id': candidate_id, 'personal_df': behavior, 'mbti': mbti, 'files': files})
+
+    ranking = matcher.match_cohort(_worker['dept_df'], cohort, top_k=top_k)
+    rows_by_candidate = {
+        candidate_id: rows.to_dict('records') for candidate_id, rows in ranking.groupby('candidate_id', sort=False)
+    }
+    for candidate in cohort:
+        candidate_id = candidate['candidate_id']
+        try:
+            outcomes[candidate_id] = _candidate_outcome(matcher, candidate, rows_by_candidate.get(candidate_id, []),
+                                                        html_dir, report_zip, dashboard)
+        except Exception as e:
+            outcomes[candidate_id] = {'error': str(e)}
+    return outcomes
+
+
+def _candidate_outcome(matcher: DepartmentMatcher, candidate: Dict[str, Any], rows: List[Dict[str, Any]],
+                       html_dir: Optional[str], report_zip: bool, dashboard: bool) -> Dict[str, Any]:
+    """match_cohort 순위에 상위 부서 배치 사유를 붙이고 필요하면 보고서 생성"""
+    candidate_id, behavior, mbti = candidate['candidate_id'], candidate['personal_df'], candidate['mbti']
+    for row in rows:
+        row['reason'] = None
+    reason_rows = rows[:matcher.reason_top_k]
+    if reason_rows:
+        user_profile = matcher._build_user_profile(behavior, mbti)
+        reasons = matcher.generate_department_analyses(user_profile, reason_rows, mbti)
+        for row, reason in zip(reason_rows, reasons):
+            row['reason'] = reason
+
+    outcome = {'rows': rows, 'data_points': behavior.row_count}
+    if html_dir or report_zip or dashboard:
+        from visualization import create_visualization, report_payload
+        # 보고서에는 전체 부서 순위가 필요하므로 지원자별로 다시 분석 (배치 사유는 응답 캐시에서 재사용)
+        results = matcher.analyze_matching(_worker['dept_df'], behavior, mbti)
+        results['file_info'] = [os.path.basename(path) for path in candidate['files']]
+        results['total_data_points'] = behavior.row_count
+        if html_dir:
+            with open(os.path.join(html_dir, f"{candidate_id}.html"), "w", encoding="utf-8") as f:
+                f.write(create_visualization(results))
+        # ZIP 보고서는 작업자에서 만들고 기록만 주 프로세스에서 수행
+        if report_zip:
+            _, outcome['report_html'], outcome['report'] = render_candidate_report(candidate_id, trim_results(results))
+        elif dashboard:
+            outcome['report'] = report_payload(results, candidate_id)
+
+    return outcome
+
+
+def _chunk_candidates(candidates: List[Tuple[str, List[str], str]], workers: Optional[int],
+                      chunk_size: Optional[int]) -> List[List[Tuple[str, List[str], str]]]:
+    """지원자 목록을 작업자에게 나눠 줄 묶음으로 분할 (기본값: 작업자마다 4묶음 정도, 최대 64명)"""
+    if chunk_size is None:
+        chunk_size = min(64, -(-len(candidates) // (4 * (workers or os.cpu_count() or 1))))
+    chunk_size = max(1, chunk_size)
+    return [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+
+
+def _dashboard_reports(candidates: List[Tuple[str, List[str]]], outcomes: Dict[str, Dict[str, Any]],
+                       dashboard: str, html_dir: Optional[str]) -> List[Dict[str, Any]]:
+    """대시보드 보고서 데이터 (개별 보고서 링크는 html_dir의 파일을 대시보드 기준 상대 경로로 연결)"""
+    base_dir = os.path.dirname(os.path.abspath(dashboard))
+    reports = []
+    for candidate_id, _ in candidates:
+        if candidate_id not in outcomes:
+            continue
+        report_url = None
+        if html_dir:
+            report_url = os.path.relpath(os.path.join(os.path.abspath(html_dir), f"{candidate_id}.html"),
+                                         base_dir).replace(os.sep, '/')
+        reports.append(dict(outcomes[candidate_id]['report'], report_url=report_url))
+    return reports
+
+
+def write_results(df: pd.DataFrame, path: str, output_format: Optional[str] = None) -> str:
+    """
+    결과 저장 (형식을 지정하지 않으면 확장자로 판단)
+
+    Returns:
+        str: 사용한 형식
+    """
+    if output_format is None:
+        ext = os.path.splitext(path)[1].lower().lstrip('.')
+        output_format = {'json': 'jsonl', 'pq': 'parquet'}.get(ext, ext)
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format} ({', '.join(OUTPUT_FORMATS)} 중 선택)")
+
+    if output_format == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    elif output_format == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        df.to_json(path, orient='records', lines=True, force_ascii=False)
+    return output_format
+
+
+def run_batch(org_chart: str, personal: str, mbti_file: Optional[str], output: str,
+              output_format: Optional[str] = None, html_dir: Optional[str] = None, workers: Optional[int] = None,
+              top_k: int = 5, api_key: Optional[str] = None, backend_options: Optional[Dict[str, Any]] = None,
+              matcher_options: Optional[Dict[str, Any]] = None, report_zip: Optional[str] = None,
+              dashboard: Optional[str] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    여러 지원자의 부서 매칭을 병렬로 실행하여 파일로 저장
+
+    Args:
+        org_chart (str): 조직도 CSV 경로
+        personal (str): 개인 행동 파일 디렉터리 또는 glob 패턴
+        mbti_file (Optional[str]): 지원자별 MBTI 매핑 CSV 경로
+        output (str): 결과 파일 경로
+        output_format (Optional[str]): csv, parquet, jsonl (없으면 확장자로 판단)
+        html_dir (Optional[str]): 지원자별 HTML 보고서를 저장할 디렉터리
+        workers (Optional[int]): 작업자 프로세스 수 (없으면 CPU 수)
+        top_k (int): 지원자별로 저장할 상위 부서 수
+        api_key (Optional[str]): OpenAI API 키 (openai 백엔드에서 없으면 GPT 배치 사유를 생성하지 않음)
+        backend_options (Optional[Dict[str, Any]]): create_backend 인자 (name, model, base_url)
+        matcher_options (Optional[Dict[str, Any]]): DepartmentMatcher 추가 설정
+        report_zip (Optional[str]): 지원자별 보고서와 대시보드를 담을 ZIP 파일 경로
+        dashboard (Optional[str]): 모든 지원자를 페이지 단위로 보여 주는 대시보드 HTML 경로
+        chunk_size (Optional[int]): 작업자가 한 번에 적합도를 계산할 지원자 수 (없으면 지원자 수와 작업자 수로 결정)
+
+    Returns:
+        Dict[str, Any]: 처리 통계 (candidates, failed, rows, data_points, seconds, candidates_per_second)
+    """
+    backend_options = dict(backend_options or {})
+    matcher_options = dict(matcher_options or {})
+    if not api_key and backend_options.get('name', 'openai') == 'openai':
+        matcher_options['reason_top_k'] = 0
+
+    candidates = discover_candidates(personal)
+    mbti_mapping = read_mbti_mapping(mbti_file)
+    if html_dir:
+        os.makedirs(html_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    outcomes = {}
+    failures = []
+    # 보고서는 완료되는 대로 ZIP에 기록 (모든 HTML을 메모리에 모으지 않음)
+    zip_writer = ReportZipWriter(report_zip) if report_zip else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(org_chart, api_key, backend_options, matcher_options)) as executor:
+            chunks = _chunk_candidates(
+                [(candidate_id, files, mbti_mapping.get(candidate_id, UNKNOWN_MBTI))
+                 for candidate_id, files in candidates],
+                workers, chunk_size
+            )
+            futures = {
+                executor.submit(_process_chunk, chunk, top_k, html_dir, bool(report_zip), bool(dashboard)): chunk
+                for chunk in chunks
+            }
+            done = 0
+            for future in as_completed(futures):
+                try:
+                    chunk_outcomes = future.result()
+                except Exception as e:
+                    chunk_outcomes = {candidate_id: {'error': str(e)} for candidate_id, _, _ in futures[future]}
+                for candidate_id, outcome in chunk_outcomes.items():
+                    done += 1
+                    error = outcome.get('error')
+                    if error is None and zip_writer is not None:
+                        try:
+                            zip_writer.add(candidate_id, outcome.pop('report_html'), outcome['report'])
+                        except Exception as e:
+                            error = str(e)
+                    if error is None:
+                        outcomes[candidate_id] = outcome
+                    else:
+                        failures.append((candidate_id, error))
+                        print(f"[{done}/{len(candidates)}] {candidate_id} 실패: {error}", file=sys.stderr)
+    finally:
+        if zip_writer is not None:
+            zip_writer.close()
+
+    if dashboard:
+        from visualization import create_dashboard
+        with open(dashboard, "w", encoding="utf-8") as f:
+            f.write(create_dashboard(_dashboard_reports(candidates, outcomes, dashboard, html_dir)))
+
+    # 지원자 ID 순서로 결과 정리
+    rows = [row for candidate_id, _ in candidates if candidate_id in outcomes
+            for row in outcomes[candidate_id]['rows']]
+    write_results(pd.DataFrame(rows, columns=OUTPUT_COLUMNS), output, output_format)
+
+    seconds = time.perf_counter() - started
+    return {
+        'candidates': len(outcomes),
+        'failed': len(failures),
+        'rows': len(rows),
+        'data_points': sum(outcome['data_points'] for outcome in outcomes.values()),
+        'seconds': seconds,
+        'candidates_per_second': len(outcomes) / seconds if seconds > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부서 매칭 일괄 실행")
+    parser.add_argument("--org-chart", required=True, help="조직도 분석 CSV 파일")
+    parser.add_argument("--personal", required=True,
+                        help="개인 디지털 행동 CSV 디렉터리 또는 glob 패턴 (예: 'logs/*.csv')")
+    parser.add_argument("--mbti", help="지원자별 MBTI 매핑 CSV (candidate_id, mbti 컬럼)")
+    parser.add_argument("--output", required=True, help="결과 파일 경로 (.csv, .parquet, .jsonl)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="결과 파일 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--html-dir", help="지원자별 HTML 보고서를 저장할 디렉터리")
+    parser.add_argument("--report-zip", help="지원자별 보고서와 대시보드(index.html)를 담을 ZIP 파일")
+    parser.add_argument("--dashboard", help="모든 지원자를 페이지 단위로 보여 주는 대시보드 HTML 파일")
+    parser.add_argument("--workers", type=int, help="작업자 프로세스 수 (기본값: CPU 수)")
+    parser.add_argument("--top-k", type=int, default=5, help="지원자별로 저장할 상위 부서 수")
+    parser.add_argument("--reason-top-k", type=int, default=2,
+                        help="GPT 배치 사유를 생성할 상위 부서 수 (openai 백엔드에서 OPENAI_API_KEY가 없으면 0)")
+    parser.add_argument("--reason-batch-size", type=int, default=5,
+                        help="한 번의 GPT 요청으로 배치 사유를 생성할 부서 수 (1이면 부서마다 요청)")
+    parser.add_argument("--backend", choices=BACKENDS, default="openai",
+                        help="배치 사유 생성 백엔드 (template은 네트워크 없이 템플릿으로 생성)")
+    parser.add_argument("--model", help="LLM 모델 이름 (openai-compatible에서 필수)")
+    parser.add_argument("--base-url", help="OpenAI 호환 서버 주소 (예: http://localhost:8000/v1)")
+    parser.add_argument("--requests-per-second", type=float, default=3.0,
+                        help="작업자 프로세스별 초당 GPT 요청 수")
+    args = parser.parse_args()
+
+    stats = run_batch(
+        args.org_chart, args.personal, args.mbti, args.output,
+        output_format=args.format, html_dir=args.html_dir, workers=args.workers, top_k=args.top_k,
+        report_zip=args.report_zip, dashboard=args.dashboard,
+        api_key=os.environ.get("OPENAI_API_KEY"),
+        backend_options={'name': args.backend, 'model': args.model, 'base_url': args.base_url},
+        matcher_options={'reason_top_k': args.reason_top_k, 'reason_batch_size': args.reason_batch_size,
+                         'requests_per_second': args.requests_per_second}
+    )
+
+    print(f"결과 저장: {args.output} ({stats['rows']}행)")
+    print(f"지원자 {stats['candidates']}명 처리, {stats['failed']}명 실패, "
+          f"데이터 포인트 {stats['data_points']}개, {stats['seconds']:.2f}초 "
+          f"({stats['candidates_per_second']:.1f}명/초)")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import hashlib
+import re
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from scoring import TRAITS
+
+# 부서별 요구 성향 (예시 데이터)
+DEPARTMENT_REQUIREMENTS = {
+    "개발팀": {"분석력": 90, "창의성": 80, "독립성": 85, "실행력": 85, "계획성": 75, "소통력": 60, "협력성": 70, "안정성": 70},
+    "마케팅팀": {"소통력": 90, "창의성": 85, "협력성": 80, "실행력": 80, "분석력": 70, "계획성": 75, "독립성": 60, "안정성": 65},
+    "인사팀": {"소통력": 95, "협력성": 90, "안정성": 85, "계획성": 80, "분석력": 75, "실행력": 75, "창의성": 60, "독립성": 50},
+    "재무팀": {"분석력": 95, "계획성": 90, "안정성": 90, "실행력": 80, "독립성": 70, "소통력": 60, "협력성": 65, "창의성": 45},
+    "영업팀": {"소통력": 95, "실행력": 90, "협력성": 85, "창의성": 75, "분석력": 70, "계획성": 70, "독립성": 60, "안정성": 60},
+    "기획팀": {"분석력": 85, "계획성": 90, "창의성": 85, "소통력": 80, "협력성": 80, "실행력": 80, "독립성": 70, "안정성": 75},
+    "디자인팀": {"창의성": 95, "독립성": 80, "분석력": 70, "실행력": 75, "소통력": 70, "협력성": 70, "계획성": 65, "안정성": 60},
+    "고객서비스팀": {"소통력": 95, "협력성": 90, "안정성": 85, "실행력": 80, "계획성": 75, "분석력": 65, "창의성": 60, "독립성": 45}
+}
+
+# 하위부서 키워드별 요구 성향 조정 (위쪽 규칙이 우선, 조정 후 최대 95)
+SUBDEPARTMENT_RULES = [
+    # 개발 관련 하위부서
+    (['frontend', '프론트엔드', 'ui', 'ux'], {"창의성": 10, "소통력": 5}),
+    (['backend', '백엔드', 'server', '서버'], {"분석력": 10, "안정성": 5}),
+    (['devops', '데브옵스', 'infra', '인프라'], {"안정성": 15, "계획성": 10}),
+    (['ai', '인공지능', 'ml', '머신러닝', 'data', '데이터'], {"분석력": 15, "창의성": 5}),
+    # 마케팅 관련 하위부서
+    (['digital', '디지털', 'online', '온라인'], {"창의성": 10, "분석력": 5}),
+    (['brand', '브랜드', 'pr', '홍보'], {"창의성": 15, "소통력": 5}),
+    (['performance', '퍼포먼스', 'growth', '그로스'], {"분석력": 10, "실행력": 10}),
+    # 영업 관련 하위부서
+    (['b2b', 'enterprise', '기업'], {"분석력": 5, "계획성": 10}),
+    (['b2c', 'consumer', '소비자'], {"소통력": 10, "창의성": 5}),
+    # 기획 관련 하위부서
+    (['product', '상품', 'service', '서비스'], {"창의성": 10, "분석력": 5}),
+    (['strategy', '전략', 'business', '사업'], {"분석력": 10, "계획성": 10})
+]
+
+
+def has_subdepartment(subdept_name) -> bool:
+    """하위부서명이 실제 값인지 확인 (빈 문자열, NaN 제외)"""
+    return bool(subdept_name) and bool(str(subdept_name).strip()) and str(subdept_name) != 'nan'
+
+
+def stable_hash_bytes(keys: Sequence[str], size: int = 8) -> np.ndarray:
+    """
+    문자열별 blake2b 해시를 (키 수 × size) uint8 행렬로 반환
+
+    파이썬 hash()와 달리 프로세스나 서버가 달라도 항상 같은 값이 나옵니다.
+    """
+    digests = b''.join(hashlib.blake2b(str(key).encode('utf-8'), digest_size=size).digest() for key in keys)
+    return np.frombuffer(digests, dtype=np.uint8).reshape(len(keys), size)
+
+
+class LRUMemo:
+    """최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 버리는 메모 (여러 스레드에서 공유 가능)"""
+
+    MISSING = object()
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries (int): 최대 저장 항목 수
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        """저장된 값 반환 (없으면 LRUMemo.MISSING)"""
+        with self._lock:
+            value = self._entries.get(key, self.MISSING)
+            if value is not self.MISSING:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RequirementsIndex:
+    """
+    부서 요구 성향 조회용 색인
+
+    DepartmentMatcher 생성 시 한 번만 만들어 두고 재사용합니다.
+    - 부서명 정확히 일치: 해시 맵 조회
+    - 유사 부서명(부분 문자열) 매칭: 부서명별로 한 번만 계산하여 기억
+    - 하위부서 조정 규칙: 규칙별 키워드를 정규식 하나로 미리 컴파일하고, 하위부서명별로 한 번만 판정
+    - 기억하는 부서명/하위부서명/요구 성향 행은 각각 최근 memo_size개까지만 보관 (LRU)
+    - 등록되지 않은 부서의 기본값과 하위부서별 미세 조정은 blake2b 해시로 생성하여
+      프로세스가 달라도 같은 요구 성향 행렬이 나오므로 미리 계산해 저장하거나 공유할 수 있음
+    """
+
+    def __init__(self, table: Optional[Dict[str, Dict[str, float]]] = None,
+                 rules: Optional[List[Tuple[List[str], Dict[str, float]]]] = None,
+                 traits: List[str] = TRAITS, memo_size: int = 10000):
+        """
+        Args:
+            table (Optional[Dict[str, Dict[str, float]]]): 부서별 요구 성향 (없으면 DEPARTMENT_REQUIREMENTS)
+            rules (Optional[List[Tuple[List[str], Dict[str, float]]]]): 하위부서 조정 규칙 (없으면 SUBDEPARTMENT_RULES)
+            traits (List[str]): 행렬의 성향 순서
+            memo_size (int): 매칭 결과와 요구 성향 행을 기억할 최대 항목 수 (종류별)
+        """
+        self.table = DEPARTMENT_REQUIREMENTS if table is None else table
+        self.traits = traits
+        rules = SUBDEPARTMENT_RULES if rules is None else rules
+
+        # 등록 부서 요구 성향 행렬 (등록 순서대로)
+        self._keys = list(self.table)
+        self._key_positions = {key: i for i, key in enumerate(self._keys)}
+        self._table_matrix = np.array(
+            [[self.table[key].get(trait, np.nan) for trait in traits] for key in self._keys],
+            dtype=np.float64
+        ).reshape(len(self._keys), len(traits))
+
+        # 하위부서 규칙별 키워드 정규식과 조정값 행렬 (마지막 행은 '해당 규칙 없음')
+        self._rule_patterns = [
+            re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+            for keywords, _ in rules
+        ]
+        self._rule_adjustments = np.zeros((len(rules) + 1, len(traits)))
+        for i, (_, adjustments) in enumerate(rules):
+            for trait, amount in adjustments.items():
+                self._rule_adjustments[i, traits.index(trait)] = amount
+        self._rule_mask = self._rule_adjustments != 0
+
+        self._resolved_names = LRUMemo(memo_size)
+        self._resolved_rules = LRUMemo(memo_size)
+        self._rows = LRUMemo(memo_size)
+
+    def match_department(self, dept_name) -> Optional[str]:
+        """부서명과 일치하거나 유사한 등록 부서명 반환 (없으면 None)"""
+        match = self._resolved_names.get(dept_name)
+        if match is not LRUMemo.MISSING:
+            return match
+
+        match = None
+        if dept_name in self.table:
+            match = dept_name
+        elif isinstance(dept_name, str):
+            # 유사한 부서명 찾기
+            for key in self._keys:
+                if key in dept_name or dept_name in key:
+                    match = key
+                    break
+
+        self._resolved_names.set(dept_name, match)
+        return match
+
+    def match_rule(self, subdept_name) -> Optional[int]:
+        """하위부서명에 처음 일치하는 조정 규칙 번호 반환 (하위부서가 없거나 일치하는 규칙이 없으면 None)"""
+        rule = self._resolved_rules.get(subdept_name)
+        if rule is not LRUMemo.MISSING:
+            return rule
+
+        rule = None
+        subdept_lower = str(subdept_name).lower()
+        for i, pattern in enumerate(self._rule_patterns):
+            if pattern.search(subdept_lower):
+                rule = i
+                break
+
+        self._resolved_rules.set(subdept_name, rule)
+        return rule
+
+    def matrix(self, dept_names: Sequence, subdept_names: Sequence) -> np.ndarray:
+        """
+        (부서 수 × 성향 수) 요구 성향 행렬을 한 번에 생성
+
+        Args:
+            dept_names (Sequence): 부서명 목록
+            subdept_names (Sequence): 하위부서명 목록 (없으면 빈 문자열)
+
+        Returns:
+            np.ndarray: float64 요구 성향 행렬
+        """
+        n = len(dept_names)
+        if n == 0:
+            return np.empty((0, len(self.traits)))
+
+        # 1. 기본 부서 요구사항 (등록되지 않은 부서는 부서명 해시로 60-85 범위 기본값 생성)
+        # 같은 부서명이 여러 번 나오면 한 번만 조회
+        matches = {}
+        for dept_name in dept_names:
+            if dept_name not in matches:
+                matches[dept_name] = self.match_department(dept_name)
+        positions = np.array([
+            -1 if matches[dept_name] is None else self._key_positions[matches[dept_name]]
+            for dept_name in dept_names
+        ], dtype=np.int64)
+        matrix = np.empty((n, len(self.traits)))
+        known = positions >= 0
+        matrix[known] = self._table_matrix[positions[known]]
+        unknown = np.flatnonzero(~known)
+        if len(unknown):
+            digests = stable_hash_bytes([dept_names[i] for i in unknown], size=len(self.traits))
+            matrix[unknown] = 60 + digests % 26
+
+        # 2. 하위부서 조정 (처음 일치하는 규칙만 적용, 조정된 항목은 최대 95)
+        has_subdept = np.array([has_subdepartment(subdept_name) for subdept_name in subdept_names], dtype=bool)
+        subdept_rows = np.flatnonzero(has_subdept)
+        if len(subdept_rows):
+            no_rule = len(self._rule_patterns)
+            rule_matches = {}
+            for i in subdept_rows:
+                if subdept_names[i] not in rule_matches:
+                    rule_matches[subdept_names[i]] = self.match_rule(subdept_names[i])
+            rules = np.array([
+                no_rule if rule_matches[subdept_names[i]] is None else rule_matches[subdept_names[i]]
+                for i in subdept_rows
+            ], dtype=np.int64)
+            block = matrix[subdept_rows]
+            block = np.where(self._rule_mask[rules],
+                             np.minimum(95, block + self._rule_adjustments[rules]),
+                             block)
+
+            # 하위부서명 해시로 각 능력치에 -3~+3 범위 조정 (40-100 범위 유지)
+            digests = stable_hash_bytes(
+                [f"{dept_names[i]}_{subdept_names[i]}" for i in subdept_rows], size=len(self.traits)
+            )
+            matrix[subdept_rows] = np.clip(block + (digests % 7).astype(np.float64) - 3, 40, 100)
+
+        return matrix
+
+    def row(self, dept_name, subdept_name="") -> np.ndarray:
+        """요구 성향을 성향 순서대로 나열한 NumPy 행 반환 (없는 항목은 NaN)"""
+        key = (dept_name, subdept_name)
+        row = self._rows.get(key)
+        if row is LRUMemo.MISSING:
+            row = self.matrix([dept_name], [subdept_name])[0]
+            row.setflags(write=False)
+            self._rows.set(key, row)
+        return row
+
+    def requirements(self, dept_name, subdept_name="") -> Dict[str, float]:
+        """부서와 하위부서를 고려한 요구 성향 반환"""
+        return {trait: value for trait, value in zip(self.traits, self.row(dept_name, subdept_name).tolist())
+                if value == value}
+
+    def department_requirements(self, dept_name) -> Dict[str, float]:
+        """부서별 요구 성향 반환 (등록되지 않은 부서는 부서명 기반 기본값)"""
+        return self.requirements(dept_name, "")
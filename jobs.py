@@ -0,0 +1,192 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from tracing import trace
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """취소 요청된 작업에서 진행 상황을 보고할 때 발생"""
+
+
+class Job:
+    """
+    백그라운드에서 실행되는 분석 작업 하나
+
+    작업 함수는 job.report_progress(...)로 진행 상황을 알리고,
+    취소가 요청되면 그 호출에서 JobCancelled가 발생하여 작업이 중단됩니다.
+    """
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = QUEUED
+        self.stage = None
+        self.completed = 0
+        self.total = 0
+        self.department = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """취소 요청 (실행 중인 작업은 다음 진행 상황 보고 시점에 중단)"""
+        self._cancel_event.set()
+
+    def report_progress(self, stage: str, completed: int, total: int, department: Optional[str] = None) -> None:
+        """
+        진행 상황 기록 (DepartmentMatcher.analyze_matching의 progress_callback으로 사용)
+
+        Args:
+            stage (str): 현재 단계 (behavior, requirements, scoring, gpt 등)
+            completed (int): 단계 내 완료 수
+            total (int): 단계 내 전체 수
+            department (Optional[str]): 방금 처리를 마친 부서명
+
+        Raises:
+            JobCancelled: 취소가 요청된 경우
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.id)
+        with self._lock:
+            self.stage = stage
+            self.completed = completed
+            self.total = total
+            if department is not None:
+                self.department = department
+
+    def snapshot(self) -> Dict[str, Any]:
+        """화면 표시용 상태 정보 (결과 제외)"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'status': self.status,
+                'stage': self.stage,
+                'completed': self.completed,
+                'total': self.total,
+                'department': self.department,
+                'error': self.error,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobManager:
+    """
+    프로세스 내 작업 큐와 작업자 스레드 풀
+
+    작업과 결과는 세션이 아니라 관리자에 보관되므로, 페이지를 새로 고치거나
+    다시 접속해도 작업 ID만 있으면 진행 상황과 결과를 다시 조회할 수 있습니다.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 100, retention: float = 6 * 60 * 60):
+        """
+        Args:
+            max_workers (int): 동시에 실행할 작업 수 (나머지는 대기열에서 기다림)
+            max_jobs (int): 보관할 최대 작업 수 (초과 시 오래된 완료 작업부터 삭제)
+            retention (float): 완료된 작업을 보관할 시간(초)
+        """
+        self.max_jobs = max(1, max_jobs)
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """
+        작업 제출
+
+        Args:
+            func (Callable[..., Any]): 실행할 함수 (첫 번째 인자로 Job을 받음)
+            *args, **kwargs: 함수에 넘길 나머지 인자
+
+        Returns:
+            str: 작업 ID
+        """
+        job = Job(uuid.uuid4().hex)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        trace("job_submitted", job_id=job.id)
+        return job.id
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """작업 조회 (없거나 삭제되었으면 None)"""
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """작업 취소 요청 (대기 중인 작업은 시작하지 않음)"""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+
+        with job._lock:
+            job.status = RUNNING
+        try:
+            result = func(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+        else:
+            self._finish(job, DONE, result=result)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with job._lock:
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            job.status = status
+        trace("job_finished", job_id=job.id, status=status, error=error,
+              seconds=round(job.finished_at - job.created_at, 3))
+
+    def _prune(self) -> None:
+        """보관 기간이 지난 완료 작업과 최대 개수를 넘는 오래된 완료 작업 삭제 (잠금 상태에서 호출)"""
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.finished_at
+        )
+        excess = len(self._jobs) - self.max_jobs + 1
+        for job in finished:
+            if now - job.finished_at > self.retention or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
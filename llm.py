@@ -0,0 +1,682 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import CACHE_LOOKUPS, GPT_RETRIES
+
+
+class TokenBucketRateLimiter:
+    """
+    토큰 버킷 방식의 API 호출 속도 제한기
+
+    초당 rate 개의 토큰이 채워지고, 최대 capacity 개까지 쌓입니다.
+    여러 스레드가 동시에 acquire()를 호출해도 전체 호출 속도가 rate를 넘지 않습니다.
+    """
+
+    def __init__(self, rate: Optional[float], capacity: int = 1):
+        """
+        Args:
+            rate (Optional[float]): 초당 허용 호출 수 (None 또는 0 이하이면 제한 없음)
+            capacity (int): 한 번에 몰아서 보낼 수 있는 최대 호출 수
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기"""
+        if not self.rate or self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """acquire의 비동기 버전 (기다리는 동안 이벤트 루프를 막지 않음)"""
+        if not self.rate or self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            await asyncio.sleep(wait)
+
+
+def create_openai_client(api_key: str, max_connections: int = 20, max_keepalive_connections: int = 10,
+                         keepalive_expiry: float = 30.0, timeout: float = 30.0, max_retries: int = 3,
+                         base_url: Optional[str] = None) -> Any:
+    """
+    연결 풀을 유지하는 OpenAI 클라이언트 생성
+
+    하나의 클라이언트를 계속 재사용하면 요청마다 새 연결과 TLS 핸드셰이크를 만들지 않습니다.
+    실패한 요청은 OpenAI SDK의 지수 백오프로 max_retries 회까지 재시도합니다.
+
+    Args:
+        api_key (str): OpenAI API 키
+        max_connections (int): 최대 동시 연결 수
+        max_keepalive_connections (int): 유지할 keep-alive 연결 수
+        keepalive_expiry (float): 사용하지 않는 keep-alive 연결을 유지할 시간(초)
+        timeout (float): 요청 타임아웃(초)
+        max_retries (int): 최대 재시도 횟수
+        base_url (Optional[str]): OpenAI 호환 서버 주소 (없으면 OpenAI API)
+
+    Returns:
+        Any: openai.OpenAI 클라이언트
+    """
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=timeout,
+        event_hooks={'request': [_count_http_attempt]}
+    )
+    return OpenAI(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=max_retries,
+                  base_url=base_url)
+
+
+def create_async_openai_client(api_key: str, max_connections: int = 20, max_keepalive_connections: int = 10,
+                               keepalive_expiry: float = 30.0, timeout: float = 30.0, max_retries: int = 3,
+                               base_url: Optional[str] = None) -> Any:
+    """
+    연결 풀을 유지하는 비동기 OpenAI 클라이언트 생성 (인자는 create_openai_client와 같음)
+
+    비동기 클라이언트는 처음 사용한 이벤트 루프에 묶이므로 작업자 프로세스(이벤트 루프)마다 하나씩 만듭니다.
+
+    Returns:
+        Any: openai.AsyncOpenAI 클라이언트
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=timeout,
+        event_hooks={'request': [_count_async_http_attempt]}
+    )
+    return AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=max_retries,
+                       base_url=base_url)
+
+
+# 스레드별 HTTP 요청 시도 횟수 (재시도 횟수 계산용)
+_http_attempts = threading.local()
+
+
+def _count_http_attempt(request: Any) -> None:
+    _http_attempts.count = getattr(_http_attempts, 'count', 0) + 1
+
+
+def http_attempts() -> int:
+    """현재 스레드에서 create_openai_client 클라이언트가 보낸 HTTP 요청 수"""
+    return getattr(_http_attempts, 'count', 0)
+
+
+# 비동기 요청별 HTTP 요청 시도 횟수 (같은 이벤트 루프의 다른 요청과 섞이지 않도록 작업 컨텍스트에 보관)
+_async_http_attempts = contextvars.ContextVar('async_http_attempts', default=None)
+
+
+async def _count_async_http_attempt(request: Any) -> None:
+    counter = _async_http_attempts.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_client(api_key: str, **options: Any) -> Any:
+    """
+    프로세스 전체에서 공유하는 OpenAI 클라이언트 반환 (API 키와 설정별로 하나씩 생성)
+
+    Args:
+        api_key (str): OpenAI API 키
+        **options: create_openai_client 설정
+
+    Returns:
+        Any: openai.OpenAI 클라이언트
+    """
+    key = (api_key, tuple(sorted(options.items())))
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = create_openai_client(api_key, **options)
+            _shared_clients[key] = client
+        return client
+
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU 캐시 저장소"""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """(값, 만료 시각) 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    SQLite 파일 기반 캐시 저장소 (프로세스 재시작 후에도 유지)
+
+    조회할 때는 커밋하지 않고 사용 시각을 메모리에 모아 두었다가 다음 저장 때 함께 기록하며,
+    최대 항목 수를 넘은 항목은 evict_every번 저장할 때마다 한꺼번에 삭제합니다.
+    따라서 저장된 항목 수는 잠시 max_entries를 evict_every - 1개까지 넘을 수 있습니다.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, evict_every: int = 100):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            max_entries (int): 최대 저장 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+            evict_every (int): 초과 항목 삭제를 실행할 저장 횟수 간격
+        """
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.evict_every = max(1, evict_every)
+        self._lock = threading.Lock()
+        self._accessed = {}
+        self._sets_since_evict = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        """(값, 만료 시각) 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                # 사용 시각은 다음 저장 때 함께 기록
+                self._accessed[key] = time.time()
+            return row
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._write_accessed()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time())
+            )
+            self._sets_since_evict += 1
+            if self._sets_since_evict >= self.evict_every:
+                self._evict()
+            self._conn.commit()
+
+    def evict(self) -> None:
+        """모아 둔 사용 시각을 기록하고 최대 항목 수를 넘은 항목 삭제"""
+        with self._lock:
+            self._write_accessed()
+            self._evict()
+            self._conn.commit()
+
+    def _write_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        # 최대 항목 수를 넘으면 오래 사용하지 않은 항목부터 삭제
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._sets_since_evict = 0
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """모아 둔 사용 시각을 기록하고 연결 닫기"""
+        with self._lock:
+            self._write_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    GPT 응답 캐시
+
+    정규화한 프롬프트와 모델, temperature 등 요청 파라미터로 키를 만들어
+    같은 요청은 API를 다시 호출하지 않고 저장된 응답을 반환합니다.
+    """
+
+    def __init__(self, backend: Optional[Any] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            backend (Optional[Any]): 저장소 (MemoryCacheBackend, SQLiteCacheBackend 등, 없으면 메모리 LRU)
+            ttl (Optional[float]): 응답 유효 시간(초) (None이면 만료 없음)
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """요청 내용으로 캐시 키 생성 (메시지의 공백은 정규화)"""
+        payload = {
+            'model': model,
+            'messages': [
+                {'role': message['role'], 'content': " ".join(message['content'].split())}
+                for message in messages
+            ],
+            'params': params
+        }
+        encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 응답 반환 (없거나 만료되었으면 None)"""
+        entry = self.backend.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            self.backend.delete(key)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(result='miss')
+                return None
+            self.hits += 1
+            CACHE_LOOKUPS.inc(result='hit')
+            return entry[0]
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else None
+        self.backend.set(key, value, expires_at)
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패 횟수와 저장 항목 수"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.backend)}
+
+
+class LLMResponse:
+    """LLM 응답 본문과 토큰 사용량"""
+
+    __slots__ = ('text', 'prompt_tokens', 'completion_tokens')
+
+    def __init__(self, text: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class LLMBackend:
+    """
+    배치 사유 생성 백엔드 인터페이스
+
+    하위 클래스는 complete()를 구현하고, 아래 성능 특성을 선언합니다.
+    분석기는 이 값을 보고 속도 제한, 동시 요청, 응답 캐시 사용 여부를 정합니다.
+    """
+
+    name = "base"
+    # 요청 한 건의 예상 지연 시간(초)
+    expected_latency = 1.0
+    # 백엔드가 허용하는 초당 최대 요청 수 (None이면 제한 없음)
+    max_requests_per_second = None
+    # 네트워크 호출 여부 (False이면 속도 제한과 스레드 풀 없이 바로 호출)
+    requires_network = True
+    # 같은 요청의 응답을 캐시할지 여부
+    cacheable = True
+
+    model = ""
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                 context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        """
+        응답 생성
+
+        Args:
+            messages (List[Dict[str, str]]): 채팅 메시지
+            max_tokens (int): 최대 생성 토큰 수
+            temperature (float): temperature
+            context (Optional[Dict[str, Any]]): 프롬프트를 만든 원본 값 (템플릿 백엔드에서 사용)
+            json_mode (bool): JSON 객체 형식의 응답 요청
+
+        Returns:
+            LLMResponse: 응답
+        """
+        raise NotImplementedError
+
+    async def acomplete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                        context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        """complete의 비동기 버전 (기본 구현은 스레드에서 complete 실행)"""
+        return await asyncio.to_thread(self.complete, messages, max_tokens, temperature, context, json_mode)
+
+    def verify(self) -> None:
+        """사용 가능한지 확인 (실패하면 예외 발생, 응답 생성 요청은 보내지 않음)"""
+
+    def request_limits(self, requests_per_second: Optional[float], max_concurrency: int,
+                       burst: int = 1) -> Tuple[Optional[float], int]:
+        """
+        선언된 성능 특성으로 분석기의 초당 요청 수와 동시 요청 수 결정
+
+        - 네트워크를 쓰지 않는 백엔드는 제한 없이 하나씩 바로 호출
+        - 초당 요청 수는 요청한 값과 max_requests_per_second 중 작은 값
+        - 동시 요청 수는 그 속도를 채우는 데 필요한 만큼(초당 요청 수 × expected_latency, 최소 burst)으로 제한
+          (더 많이 보내도 속도 제한기에서 대기할 뿐 처리량은 늘지 않음)
+
+        Args:
+            requests_per_second (Optional[float]): 요청한 초당 요청 수 (None 또는 0 이하이면 제한 없음)
+            max_concurrency (int): 요청한 최대 동시 요청 수
+            burst (int): 속도 제한 내에서 한 번에 보낼 수 있는 최대 요청 수
+
+        Returns:
+            Tuple[Optional[float], int]: (초당 요청 수, 동시 요청 수)
+        """
+        if not self.requires_network:
+            return None, 1
+
+        rates = [rate for rate in (requests_per_second, self.max_requests_per_second) if rate and rate > 0]
+        rate = min(rates) if rates else None
+        concurrency = max(1, max_concurrency)
+        if rate is not None:
+            concurrency = min(concurrency, max(1, burst, math.ceil(rate * self.expected_latency)))
+        return rate, concurrency
+
+    def characteristics(self) -> Dict[str, Any]:
+        """선언된 성능 특성"""
+        return {
+            'backend': self.name,
+            'model': self.model,
+            'expected_latency': self.expected_latency,
+            'max_requests_per_second': self.max_requests_per_second,
+            'requires_network': self.requires_network,
+            'cacheable': self.cacheable
+        }
+
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI 채팅 완성 API 백엔드"""
+
+    name = "openai"
+    expected_latency = 1.5
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", client: Optional[Any] = None,
+                 async_client: Optional[Any] = None, client_options: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            api_key (str): API 키
+            model (str): 모델 이름
+            client (Optional[Any]): 사용할 OpenAI 호환 클라이언트 (없으면 프로세스 공용 연결 풀 클라이언트,
+                테스트에서는 tests/fakes.py의 FakeOpenAIClient 등)
+            async_client (Optional[Any]): 비동기 요청에 사용할 클라이언트
+                (없으면 처음 사용할 때 AsyncOpenAI 연결 풀 클라이언트 생성)
+            client_options (Optional[Dict[str, Any]]): 연결 풀/타임아웃/재시도 설정 (create_openai_client 인자)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.client = client
+        self.async_client = async_client
+        self.client_options = dict(client_options or {})
+
+    def get_client(self) -> Any:
+        """동기 클라이언트 반환 (처음 호출 시 공용 연결 풀 클라이언트를 가져옴)"""
+        if self.client is None:
+            self.client = get_shared_client(self.api_key, **self.client_options)
+        return self.client
+
+    def get_async_client(self) -> Any:
+        """비동기 클라이언트 반환 (이벤트 루프에 묶이므로 작업자 프로세스마다 하나씩 생성)"""
+        if self.async_client is None:
+            self.async_client = create_async_openai_client(self.api_key, **self.client_options)
+        return self.async_client
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                 context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        attempts = http_attempts()
+        try:
+            response = self.get_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self._format_options(json_mode)
+            )
+        finally:
+            GPT_RETRIES.inc(max(0, http_attempts() - attempts - 1))
+        return self._to_response(response)
+
+    async def acomplete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                        context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        # 비동기 클라이언트 없이 직접 지정한 동기 클라이언트만 있으면 스레드에서 동기 요청
+        if self.async_client is None and self.client is not None:
+            return await super().acomplete(messages, max_tokens, temperature, context, json_mode)
+
+        # create_async_openai_client 클라이언트의 요청 훅이 이 요청의 시도 횟수를 셈
+        attempts = [0]
+        token = _async_http_attempts.set(attempts)
+        try:
+            response = await self.get_async_client().chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **self._format_options(json_mode)
+            )
+        finally:
+            _async_http_attempts.reset(token)
+            GPT_RETRIES.inc(max(0, attempts[0] - 1))
+        return self._to_response(response)
+
+    @staticmethod
+    def _format_options(json_mode: bool) -> Dict[str, Any]:
+        return {'response_format': {"type": "json_object"}} if json_mode else {}
+
+    def verify(self) -> None:
+        """모델 정보를 조회하여 API 키와 모델 접근 권한 확인 (토큰을 사용하지 않음)"""
+        self.get_client().models.retrieve(self.model)
+
+    @staticmethod
+    def _to_response(response: Any) -> LLMResponse:
+        usage = getattr(response, 'usage', None)
+        return LLMResponse(
+            response.choices[0].message.content.strip(),
+            (getattr(usage, 'prompt_tokens', 0) or 0) if usage is not None else 0,
+            (getattr(usage, 'completion_tokens', 0) or 0) if usage is not None else 0
+        )
+
+
+class OpenAICompatibleBackend(OpenAIBackend):
+    """OpenAI 호환 API를 제공하는 로컬/사내 서버 백엔드 (vLLM, llama.cpp server, Ollama 등)"""
+
+    name = "openai-compatible"
+    expected_latency = 0.5
+
+    def __init__(self, base_url: str, model: str, api_key: str = "not-needed", client: Optional[Any] = None,
+                 async_client: Optional[Any] = None, client_options: Optional[Dict[str, Any]] = None,
+                 max_requests_per_second: Optional[float] = None, expected_latency: Optional[float] = None):
+        """
+        Args:
+            base_url (str): 서버 주소 (예: http://localhost:8000/v1)
+            model (str): 서버에 올라가 있는 모델 이름
+            api_key (str): API 키 (서버가 요구하지 않으면 아무 값)
+            client, async_client, client_options: OpenAIBackend와 같음
+            max_requests_per_second (Optional[float]): 서버가 감당할 수 있는 초당 요청 수 (None이면 제한 없음)
+            expected_latency (Optional[float]): 요청 한 건의 예상 지연 시간(초) (None이면 기본값)
+        """
+        options = dict(client_options or {}, base_url=base_url)
+        super().__init__(api_key, model, client=client, async_client=async_client, client_options=options)
+        self.base_url = base_url
+        if max_requests_per_second is not None:
+            self.max_requests_per_second = max_requests_per_second
+        if expected_latency is not None:
+            self.expected_latency = expected_latency
+
+    def verify(self) -> None:
+        """모델 목록을 조회하여 서버 연결 확인"""
+        self.get_client().models.list()
+
+
+class TemplateBackend(LLMBackend):
+    """
+    네트워크 없이 템플릿으로 배치 사유를 만드는 결정적 백엔드
+
+    같은 입력에는 항상 같은 문장을 돌려주므로 오프라인/폐쇄망 배포와 부하 테스트에 사용합니다.
+    """
+
+    name = "template"
+    expected_latency = 0.00001
+    requires_network = False
+    cacheable = False
+    model = "template"
+
+    # 강점으로 언급할 성향 (프롬프트에 포함되는 성향과 같음)
+    STRENGTH_TRAITS = ("분석력", "창의성", "소통력", "협력성", "실행력", "계획성")
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                 context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        context = context or {}
+        profile = context.get('user_profile') or {}
+        mbti = context.get('mbti')
+
+        # 여러 부서를 한 번에 요청하면 {"reasons": [{"id", "reason"}, ...]} 형식으로 응답
+        if json_mode and 'departments' in context:
+            reasons = [
+                {'id': dept['id'], 'reason': self._reason(dept['dept_name'], dept['score'], profile, mbti)}
+                for dept in context['departments']
+            ]
+            return LLMResponse(json.dumps({'reasons': reasons}, ensure_ascii=False))
+
+        return LLMResponse(self._reason(context.get('dept_name', "해당"), context.get('score', 0.0), profile, mbti))
+
+    def _reason(self, dept_name: str, score: float, profile: Dict[str, float], mbti: Optional[str]) -> str:
+        score = float(score)
+
+        # 점수가 높은 성향 두 개 (같으면 STRENGTH_TRAITS 순서)
+        strengths = sorted(self.STRENGTH_TRAITS, key=lambda trait: -float(profile.get(trait, 50)))[:2]
+        first, second = strengths
+        mbti_phrase = f"{mbti} 성향을 고려한 " if mbti and mbti != "알 수 없음" else ""
+
+        return (
+            f"{dept_name} 부서는 개인의 강점인 {first}({float(profile.get(first, 50)):.0f}점)과 "
+            f"{second}({float(profile.get(second, 50)):.0f}점)을 업무에 바로 활용할 수 있는 조직입니다. "
+            f"{mbti_phrase}적합도가 {score:.1f}%로 부서의 업무 특성과 잘 맞아 빠르게 성과를 낼 수 있을 것으로 예상됩니다."
+        )
+
+    async def acomplete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: float,
+                        context: Optional[Dict[str, Any]] = None, json_mode: bool = False) -> LLMResponse:
+        return self.complete(messages, max_tokens, temperature, context, json_mode)
+
+
+# create_backend에서 사용할 백엔드 이름
+BACKENDS = ('openai', 'openai-compatible', 'template')
+
+
+def create_backend(name: str = "openai", api_key: str = "", model: Optional[str] = None,
+                   base_url: Optional[str] = None, **options: Any) -> LLMBackend:
+    """
+    이름으로 백엔드 생성 (설정 파일/환경 변수/명령줄 인자에서 사용)
+
+    Args:
+        name (str): openai, openai-compatible, template
+        api_key (str): API 키
+        model (Optional[str]): 모델 이름 (없으면 백엔드 기본값)
+        base_url (Optional[str]): OpenAI 호환 서버 주소 (openai-compatible에서 필수)
+        **options: OpenAIBackend 추가 인자 (client, async_client, client_options,
+            openai-compatible은 max_requests_per_second, expected_latency도 지정 가능)
+
+    Returns:
+        LLMBackend: 백엔드
+    """
+    if name == "openai":
+        return OpenAIBackend(api_key, model or "gpt-3.5-turbo", **options)
+    if name == "openai-compatible":
+        if not base_url or not model:
+            raise ValueError("openai-compatible 백엔드에는 base_url과 model이 필요합니다")
+        return OpenAICompatibleBackend(base_url, model, api_key=api_key or "not-needed", **options)
+    if name == "template":
+        return TemplateBackend()
+    raise ValueError(f"알 수 없는 LLM 백엔드입니다: {name} ({', '.join(BACKENDS)} 중 선택)")
@@ -0,0 +1,187 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Sequence, Tuple
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """증가만 하는 누적 값 (라벨별로 따로 집계)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in values]
+
+
+class Histogram:
+    """관측값 분포 (라벨별 구간 개수, 합계, 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series[2] if series else 0
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            snapshot = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+
+        lines = []
+        for labels, bucket_counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 저장소"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            # 같은 이름으로 다시 등록하면 기존 지표를 반환
+            return self._metrics.setdefault(metric.name, metric)
+
+    def export(self) -> str:
+        """Prometheus 텍스트 형식으로 내보내기"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 파이프라인 단계별 소요 시간 (ingest, behavior, requirements, scoring, gpt, rendering)
+STAGE_SECONDS = REGISTRY.histogram(
+    "department_matching_stage_seconds", "Time spent in each matching pipeline stage"
+)
+
+# GPT 배치 사유 생성
+GPT_REQUEST_SECONDS = REGISTRY.histogram(
+    "department_matching_gpt_request_seconds", "Latency of a single GPT analysis request"
+)
+GPT_REQUESTS = REGISTRY.counter(
+    "department_matching_gpt_requests_total", "GPT analysis requests by outcome (ok, error, cache_hit)"
+)
+GPT_TOKENS = REGISTRY.counter(
+    "department_matching_gpt_tokens_total", "Tokens used by GPT analysis requests by kind (prompt, completion)"
+)
+GPT_RETRIES = REGISTRY.counter(
+    "department_matching_gpt_retries_total", "HTTP retries made by the OpenAI client"
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "department_matching_response_cache_lookups_total", "GPT response cache lookups by result (hit, miss)"
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.export().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집 요청마다 접근 로그를 남기지 않음
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0", registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    /metrics 경로로 지표를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작
+
+    Args:
+        port (int): 포트 (0이면 임의의 빈 포트)
+        host (str): 바인딩할 주소
+        registry (MetricsRegistry): 내보낼 지표 저장소
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server_address로 실제 포트 확인, shutdown()으로 종료)
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,311 @@
+"""
+전체 부서 순위 표
+
+analyze_matching 결과의 all_departments를 열 배열로 한 번만 바꾸어 두고, 정렬, 검색, 페이지 나누기를
+서버에서 처리합니다. 화면에는 한 페이지의 행과 축소된 요구사항 히트맵만 보내므로 부서가 수천 개인
+조직도에서도 브라우저가 멈추지 않습니다.
+"""
+import threading
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from scoring import TRAITS, top_k_indices
+
+# 순위 표 컬럼 (성향 항목 컬럼이 뒤에 붙음)
+RANKING_COLUMNS = ['rank', 'name', 'main_dept', 'sub_dept', 'score', 'reason']
+
+# 정렬 기준 (순위, 점수, 이름 또는 성향 항목)
+SORT_KEYS = ['rank', 'score', 'name', 'main_dept'] + TRAITS
+
+
+def downsample_rows(matrix: np.ndarray, max_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    행렬의 연속한 행을 최대 max_rows개 구간으로 묶어 구간별 평균 계산 (NaN 제외)
+
+    Args:
+        matrix (np.ndarray): (행 수 × 열 수) 행렬
+        max_rows (int): 최대 구간 수
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (구간 수 × 열 수) 평균 행렬, 구간별 시작 행 번호
+    """
+    n_rows = matrix.shape[0]
+    max_rows = max(1, max_rows)
+    if n_rows <= max_rows:
+        return matrix.astype(np.float64), np.arange(n_rows)
+
+    starts = np.linspace(0, n_rows, max_rows + 1).astype(np.int64)[:-1]
+    present = ~np.isnan(matrix)
+    sums = np.add.reduceat(np.where(present, matrix, 0.0), starts, axis=0)
+    counts = np.add.reduceat(present, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    return means, starts
+
+
+class RankedDepartments(SequenceABC):
+    """
+    적합도순 부서 목록 (analyze_matching 결과의 all_departments)
+
+    상위 top_k개 부서만 바로 딕셔너리로 만들고, 나머지는 조직도 순서의 열 배열로 보관하다가
+    인덱스로 접근할 때 딕셔너리로 만듭니다. 한 번 만든 딕셔너리는 보관하므로 배치 사유를 채우는 등의
+    변경이 유지됩니다. 전체 순서는 상위 top_k 밖의 부서에 처음 접근할 때 계산합니다.
+    """
+
+    def __init__(self, names: np.ndarray, main_depts: np.ndarray, sub_depts: np.ndarray, scores: np.ndarray,
+                 requirements: np.ndarray, traits: List[str] = TRAITS, top_k: int = 5):
+        """
+        Args:
+            names (np.ndarray): 부서 전체 이름 (하위부서 포함)
+            main_depts (np.ndarray): 부서명
+            sub_depts (np.ndarray): 하위부서명
+            scores (np.ndarray): 적합도 점수
+            requirements (np.ndarray): (부서 수 × 성향 수) 요구 성향 행렬 (요구하지 않는 성향은 NaN)
+            traits (List[str]): 요구 성향 행렬의 열 순서
+            top_k (int): 바로 딕셔너리로 만들 상위 부서 수
+        """
+        self.names = names
+        self.main_depts = main_depts
+        self.sub_depts = sub_depts
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.requirements = requirements
+        self.traits = list(traits)
+        # 상위 top_k개만 부분 정렬
+        self._top = top_k_indices(self.scores, top_k)
+        self._order = None
+        self._items = {}
+        for position in range(len(self._top)):
+            self[position]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError("부서 순위 범위를 벗어났습니다")
+
+        item = self._items.get(position)
+        if item is None:
+            row = self._top[position] if position < len(self._top) else self.order()[position]
+            item = self._items[position] = self._make_item(row)
+        return item
+
+    def __repr__(self) -> str:
+        return f"RankedDepartments({len(self)}개 부서, 딕셔너리 {len(self._items)}개)"
+
+    def order(self) -> np.ndarray:
+        """전체 부서의 적합도순 행 번호 (처음 호출할 때 계산)"""
+        if self._order is None:
+            self._order = self._top if len(self._top) == len(self) else top_k_indices(self.scores, len(self))
+        return self._order
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        적합도순으로 정렬한 열 배열 (딕셔너리를 만들지 않음)
+
+        Returns:
+            Dict[str, np.ndarray]: name, main_dept, sub_dept, score, reason (생성된 것만), requirements
+        """
+        order = self.order()
+        reasons = np.full(len(self), "", dtype=object)
+        for position, item in self._items.items():
+            reasons[position] = item.get('reason') or ""
+        return {
+            'name': self.names[order],
+            'main_dept': self.main_depts[order],
+            'sub_dept': self.sub_depts[order],
+            'score': self.scores[order],
+            'reason': reasons,
+            'requirements': self.requirements[order]
+        }
+
+    def _make_item(self, row: int) -> Dict[str, Any]:
+        requirement_row = self.requirements[row].tolist()
+        return {
+            'name': self.names[row],
+            'full_name': self.names[row],
+            'main_dept': self.main_depts[row],
+            'sub_dept': self.sub_depts[row],
+            'score': float(self.scores[row]),
+            'reason': None,
+            # 부서별 요구 성향 (하위부서 고려)
+            'requirements': {trait: value for trait, value in zip(self.traits, requirement_row) if value == value}
+        }
+
+
+class RankingTable:
+    """
+    전체 부서 순위를 열 배열로 보관하는 표
+
+    정렬 순서는 (정렬 기준, 방향, 검색어)별로 한 번만 계산하여 보관하고,
+    페이지를 요청하면 해당 행만 DataFrame으로 만듭니다.
+    st.cache_resource로 여러 세션이 같은 표를 공유하므로 정렬 순서 보관소는 잠금으로 보호합니다.
+    """
+
+    def __init__(self, departments: Sequence[Dict[str, Any]], traits: List[str] = TRAITS, max_orders: int = 16):
+        """
+        Args:
+            departments (Sequence[Dict[str, Any]]): 적합도순으로 정렬된 부서 목록 (analyze_matching의 all_departments,
+                RankedDepartments이면 딕셔너리 대신 열 배열을 바로 사용)
+            traits (List[str]): 요구사항 열 순서로 사용할 성향 항목
+            max_orders (int): 보관할 정렬 순서 수
+        """
+        self.traits = list(traits)
+        self.max_orders = max(1, max_orders)
+        self._orders = {}
+        self._orders_lock = threading.Lock()
+        self._search_names = None
+
+        if isinstance(departments, RankedDepartments) and departments.traits == self.traits:
+            # 열 배열을 그대로 사용 (부서별 딕셔너리를 만들지 않음)
+            columns = departments.columns()
+            self.names = columns['name']
+            self.main_depts = columns['main_dept']
+            self.sub_depts = columns['sub_dept']
+            self.scores = columns['score']
+            self.reasons = columns['reason']
+            self.requirements = columns['requirements'].astype(np.float32)
+            return
+
+        self.names = np.array([dept['name'] for dept in departments], dtype=object)
+        self.main_depts = np.array([dept.get('main_dept', dept['name']) for dept in departments], dtype=object)
+        self.sub_depts = np.array([dept.get('sub_dept') or "" for dept in departments], dtype=object)
+        self.scores = np.array([dept['score'] for dept in departments], dtype=np.float64)
+        self.reasons = np.array([dept.get('reason') or "" for dept in departments], dtype=object)
+        # 요구사항 딕셔너리 목록을 (부서 수 × 성향 수) 행렬 하나로 변환 (없는 항목은 NaN)
+        self.requirements = pd.DataFrame.from_records(
+            [dept['requirements'] for dept in departments], columns=self.traits
+        ).to_numpy(dtype=np.float32)
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Any]) -> "RankingTable":
+        """analyze_matching 결과로 순위 표 생성"""
+        return cls(results['all_departments'])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def order(self, sort_by: str = 'rank', descending: bool = False, query: Optional[str] = None) -> np.ndarray:
+        """
+        정렬 및 검색 결과의 행 번호
+
+        Args:
+            sort_by (str): 정렬 기준 (SORT_KEYS 중 하나)
+            descending (bool): 내림차순 여부 (값이 없는 성향은 방향과 관계없이 마지막)
+            query (Optional[str]): 부서명 검색어 (대소문자 구분 없음)
+
+        Returns:
+            np.ndarray: 행 번호 배열
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort_by}")
+        query = (query or "").strip().lower()
+        key = (sort_by, descending, query)
+        with self._orders_lock:
+            order = self._orders.get(key)
+        if order is not None:
+            return order
+
+        if sort_by == 'rank':
+            # all_departments는 이미 적합도순이므로 행 번호가 곧 순위
+            order = np.arange(len(self))
+            if descending:
+                order = order[::-1]
+        elif sort_by in ('name', 'main_dept'):
+            values = (self.names if sort_by == 'name' else self.main_depts).astype(str)
+            if descending:
+                # 뒤집으면 같은 이름끼리의 순서도 뒤집히므로 이름 순번의 부호를 바꾸어 정렬 (같은 이름은 순위 순서)
+                _, codes = np.unique(values, return_inverse=True)
+                order = np.lexsort((np.arange(len(self)), -codes.ravel()))
+            else:
+                order = np.argsort(values, kind='stable')
+        else:
+            values = self.scores if sort_by == 'score' else self.requirements[:, self.traits.index(sort_by)]
+            # 부호를 바꾸어 안정 정렬하면 같은 값끼리는 순위 순서를 유지하고 NaN은 끝에 남음
+            order = np.argsort(-values if descending else values, kind='stable')
+
+        if query:
+            with self._orders_lock:
+                if self._search_names is None:
+                    self._search_names = np.char.lower(self.names.astype(str))
+                search_names = self._search_names
+            matches = np.char.find(search_names, query) >= 0
+            order = order[matches[order]]
+
+        # 정렬은 잠금 밖에서 계산하고 보관소를 고칠 때만 잠금 (같은 순서를 동시에 계산해도 결과는 같음)
+        order.setflags(write=False)
+        with self._orders_lock:
+            if key not in self._orders and len(self._orders) >= self.max_orders:
+                self._orders.pop(next(iter(self._orders)))
+            self._orders[key] = order
+        return order
+
+    def page(self, page: int = 1, page_size: int = 50, sort_by: str = 'rank', descending: bool = False,
+             query: Optional[str] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        한 페이지의 순위 표
+
+        Args:
+            page (int): 페이지 번호 (1부터)
+            page_size (int): 페이지당 행 수
+            sort_by (str): 정렬 기준
+            descending (bool): 내림차순 여부
+            query (Optional[str]): 부서명 검색어
+
+        Returns:
+            Tuple[pd.DataFrame, int]: 페이지 행 (RANKING_COLUMNS + 성향 항목), 검색 결과 전체 행 수
+        """
+        order = self.order(sort_by, descending, query)
+        page_size = max(1, page_size)
+        start = (max(1, page) - 1) * page_size
+        rows = order[start:start + page_size]
+
+        df = pd.DataFrame({
+            'rank': rows + 1,
+            'name': self.names[rows],
+            'main_dept': self.main_depts[rows],
+            'sub_dept': self.sub_depts[rows],
+            'score': self.scores[rows],
+            'reason': self.reasons[rows]
+        })
+        requirements = pd.DataFrame(self.requirements[rows], columns=self.traits)
+        return pd.concat([df, requirements], axis=1), len(order)
+
+    def heatmap(self, max_rows: int = 40, sort_by: str = 'rank', descending: bool = False,
+                query: Optional[str] = None) -> Dict[str, Any]:
+        """
+        요구사항 히트맵 데이터
+
+        현재 정렬 순서의 부서를 최대 max_rows개 구간으로 묶어 구간별 평균 요구 수준을 계산합니다.
+
+        Args:
+            max_rows (int): 히트맵 최대 행 수
+            sort_by (str): 정렬 기준
+            descending (bool): 내림차순 여부
+            query (Optional[str]): 부서명 검색어
+
+        Returns:
+            Dict[str, Any]: z (구간 × 성향 행렬), traits (성향 항목), labels (구간 이름), sizes (구간별 부서 수)
+        """
+        order = self.order(sort_by, descending, query)
+        z, starts = downsample_rows(self.requirements[order], max_rows)
+        ends = np.append(starts[1:], len(order))
+
+        labels = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            name = str(self.names[order[start]])
+            labels.append(f"{start + 1}. {name}" if end - start == 1
+                          else f"{start + 1}~{end}. {name} 외 {end - start - 1}개")
+
+        return {
+            'z': z,
+            'traits': self.traits,
+            'labels': labels,
+            'sizes': (ends - starts).tolist()
+        }
@@ -0,0 +1,182 @@
+"""
+여러 지원자의 HTML 보고서 일괄 생성
+
+지원자별 분석 결과를 프로세스 풀에서 HTML로 만들고, 끝나는 대로 ZIP 파일에 바로 기록합니다.
+보고서마다 스타일과 plotly.js를 반복하지 않도록 공유 자산을 ZIP에 한 번만 넣고,
+모든 지원자를 페이지 단위로 보여 주는 대시보드(index.html)를 함께 만듭니다.
+
+ZIP 구성:
+    index.html                  지원자 대시보드 (차트는 화면에 보일 때 그림)
+    reports/<지원자 ID>.html     지원자별 보고서
+    assets/report.css           공유 스타일
+    assets/charts.js            공유 차트 스크립트
+    assets/plotly-<버전>.min.js  plotly.js (include_plotly=False이면 CDN 사용)
+"""
+import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from tracing import trace
+from visualization import create_dashboard, create_visualization, report_assets, report_payload
+
+ASSET_DIR = "assets"
+REPORT_DIR = "reports"
+
+# 작업자 프로세스로 보낼 분석 결과 키 (all_departments처럼 큰 값은 보내지 않음)
+REPORT_KEYS = ('top_departments', 'user_profile', 'mbti', 'file_info', 'total_data_points')
+
+_UNSAFE_FILENAME = re.compile(r'[^\w.-]+')
+
+
+def report_filename(candidate_id: Any) -> str:
+    """지원자 ID로 ZIP 안에서 사용할 파일 이름 생성"""
+    name = _UNSAFE_FILENAME.sub('_', str(candidate_id)).strip('._')
+    return f"{name or 'candidate'}.html"
+
+
+def trim_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """보고서 생성에 필요한 값만 남긴 분석 결과"""
+    return {key: results[key] for key in REPORT_KEYS if key in results}
+
+
+def render_candidate_report(candidate_id: Any, results: Dict[str, Any], include_plotly: bool = True,
+                            plotly_bundle_path: Optional[str] = None) -> Tuple[Any, str, Dict[str, Any]]:
+    """
+    ZIP에 넣을 지원자 한 명의 보고서 생성 (작업자 프로세스에서 실행)
+
+    Args:
+        candidate_id (Any): 지원자 ID
+        results (Dict[str, Any]): 분석 결과
+        include_plotly (bool): ZIP의 plotly.js를 참조할지 여부 (False이면 CDN)
+        plotly_bundle_path (Optional[str]): ZIP에 넣을 plotly.js 파일 경로
+
+    Returns:
+        Tuple[Any, str, Dict[str, Any]]: (지원자 ID, 보고서 HTML, 대시보드용 보고서 데이터)
+    """
+    report_html = create_visualization(results, inline_plotly=include_plotly,
+                                       plotly_bundle_path=plotly_bundle_path, asset_base=f"../{ASSET_DIR}")
+    payload = report_payload(results, candidate_id, report_url=f"{REPORT_DIR}/{report_filename(candidate_id)}")
+    return candidate_id, report_html, payload
+
+
+class ReportZipWriter:
+    """
+    지원자별 보고서를 받는 대로 ZIP에 기록하는 작성기
+
+    보고서 HTML은 바로 압축하여 기록하고 대시보드에 필요한 작은 데이터만 메모리에 보관합니다.
+    close()에서 공유 자산과 대시보드를 기록합니다.
+    """
+
+    def __init__(self, path: str, include_plotly: bool = True, plotly_bundle_path: Optional[str] = None,
+                 dashboard: bool = True, page_size: int = 20, compression: int = zipfile.ZIP_DEFLATED):
+        """
+        Args:
+            path (str): ZIP 파일 경로
+            include_plotly (bool): plotly.js를 ZIP에 넣어 네트워크 없이 열리게 할지 여부
+            plotly_bundle_path (Optional[str]): ZIP에 넣을 plotly.js 파일 경로
+            dashboard (bool): 대시보드(index.html) 생성 여부
+            page_size (int): 대시보드 한 페이지의 지원자 수
+            compression (int): zipfile 압축 방식
+        """
+        self.path = path
+        self.include_plotly = include_plotly
+        self.plotly_bundle_path = plotly_bundle_path
+        self.dashboard = dashboard
+        self.page_size = page_size
+        self.count = 0
+        self._names = set()
+        self._payloads = []
+        self._zip = zipfile.ZipFile(path, "w", compression=compression)
+
+    def add(self, candidate_id: Any, report_html: str, payload: Dict[str, Any]) -> None:
+        """
+        지원자 보고서 기록
+
+        Args:
+            candidate_id (Any): 지원자 ID
+            report_html (str): render_candidate_report로 만든 보고서 HTML
+            payload (Dict[str, Any]): 대시보드용 보고서 데이터
+        """
+        filename = report_filename(candidate_id)
+        if filename in self._names:
+            raise ValueError(f"같은 파일 이름의 보고서가 이미 있습니다: {filename} (지원자 ID: {candidate_id})")
+        self._names.add(filename)
+        self._zip.writestr(f"{REPORT_DIR}/{filename}", report_html)
+        if self.dashboard:
+            self._payloads.append(payload)
+        self.count += 1
+
+    def close(self) -> None:
+        """공유 자산과 대시보드를 기록하고 ZIP 닫기"""
+        if self._zip is None:
+            return
+        try:
+            for name, content in report_assets(self.include_plotly, self.plotly_bundle_path).items():
+                self._zip.writestr(f"{ASSET_DIR}/{name}", content)
+            if self.dashboard:
+                self._payloads.sort(key=lambda payload: payload['candidate_id'])
+                self._zip.writestr("index.html", create_dashboard(
+                    self._payloads, page_size=self.page_size, inline_plotly=self.include_plotly,
+                    plotly_bundle_path=self.plotly_bundle_path, asset_base=ASSET_DIR
+                ))
+        finally:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self) -> "ReportZipWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def export_reports_zip(items: Iterable[Tuple[Any, Dict[str, Any]]], path: str, workers: Optional[int] = None,
+                       include_plotly: bool = True, plotly_bundle_path: Optional[str] = None,
+                       dashboard: bool = True, page_size: int = 20) -> Dict[str, Any]:
+    """
+    여러 지원자의 보고서를 프로세스 풀에서 만들어 ZIP 하나로 저장
+
+    items는 순서대로 읽으면서 작업자 수의 몇 배만큼만 동시에 제출하므로,
+    제너레이터를 넘기면 전체 분석 결과를 메모리에 올리지 않고 처리할 수 있습니다.
+
+    Args:
+        items (Iterable[Tuple[Any, Dict[str, Any]]]): (지원자 ID, analyze_matching 결과)
+        path (str): ZIP 파일 경로
+        workers (Optional[int]): 작업자 프로세스 수 (없으면 CPU 수)
+        include_plotly (bool): plotly.js를 ZIP에 넣을지 여부
+        plotly_bundle_path (Optional[str]): ZIP에 넣을 plotly.js 파일 경로
+        dashboard (bool): 대시보드(index.html) 생성 여부
+        page_size (int): 대시보드 한 페이지의 지원자 수
+
+    Returns:
+        Dict[str, Any]: 처리 통계 (reports, failed, failures)
+    """
+    max_pending = (workers or os.cpu_count() or 1) * 4
+    failures = []
+
+    with ReportZipWriter(path, include_plotly=include_plotly, plotly_bundle_path=plotly_bundle_path,
+                         dashboard=dashboard, page_size=page_size) as writer, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def collect(futures) -> None:
+            for future in futures:
+                candidate_id = pending.pop(future)
+                try:
+                    writer.add(*future.result())
+                except Exception as e:
+                    failures.append((candidate_id, str(e)))
+                    trace("report_export_error", candidate_id=str(candidate_id), error=repr(e))
+
+        for candidate_id, results in items:
+            future = executor.submit(render_candidate_report, candidate_id, trim_results(results),
+                                     include_plotly, plotly_bundle_path)
+            pending[future] = candidate_id
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(list(pending))
+
+    return {'reports': writer.count, 'failed': len(failures), 'failures': failures}
@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Dict, List, Sequence
+
+# 성향 항목 순서 (행렬의 열 순서)
+TRAITS = ["분석력", "독립성", "계획성", "창의성", "소통력", "협력성", "실행력", "안정성"]
+
+
+def profiles_to_matrix(profiles: Sequence[Dict[str, float]], traits: List[str] = TRAITS) -> np.ndarray:
+    """
+    성향 딕셔너리 목록을 (행 수 × 성향 수) 행렬로 변환 (없는 항목은 NaN)
+
+    Args:
+        profiles (Sequence[Dict[str, float]]): 사용자 프로필 또는 부서 요구사항 목록
+        traits (List[str]): 열 순서로 사용할 성향 항목
+
+    Returns:
+        np.ndarray: float64 행렬
+    """
+    matrix = np.full((len(profiles), len(traits)), np.nan)
+    for i, profile in enumerate(profiles):
+        for j, trait in enumerate(traits):
+            if trait in profile:
+                matrix[i, j] = profile[trait]
+    return matrix
+
+
+def compatibility_matrix(user_matrix: np.ndarray, dept_matrix: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+    """
+    사용자 × 부서 적합도 행렬을 한 번에 계산
+
+    DepartmentMatcher.calculate_department_compatibility와 같은 규칙을 사용합니다.
+    - 부족한 경우 차이 × 1.2, 초과한 경우 차이 × 0.8 만큼 감점
+    - 가중치는 요구 수준 / 100 × 1.5, 요구 수준 85 이상은 × 1.3, 75 이상은 × 1.1
+    - 요구 수준 80 이상인 핵심 역량에서 차이가 25를 넘으면 차이 × 0.3 추가 감점
+    - 0-100 범위로 제한 후 소수점 1자리 반올림
+
+    성향 합계는 TRAITS 순서로 하나씩 더하고 반올림도 파이썬 round와 맞추므로,
+    TRAITS 순서로 만든 프로필이면 calculate_department_compatibility와 결과가 정확히 같습니다.
+
+    부서 행렬의 NaN 항목은 해당 부서가 요구하지 않는 성향으로 보고 계산에서 제외합니다.
+
+    Args:
+        user_matrix (np.ndarray): (사용자 수 × 성향 수) 행렬
+        dept_matrix (np.ndarray): (부서 수 × 성향 수) 행렬
+        chunk_size (int): 메모리 사용량을 제한하기 위해 한 번에 계산할 사용자 수
+
+    Returns:
+        np.ndarray: (사용자 수 × 부서 수) 적합도 점수 행렬
+    """
+    users = np.atleast_2d(np.asarray(user_matrix, dtype=np.float64))
+    depts = np.atleast_2d(np.asarray(dept_matrix, dtype=np.float64))
+
+    # 부서별 가중치와 핵심 역량 여부는 사용자와 무관하므로 한 번만 계산
+    required = ~np.isnan(depts)
+    reqs = np.where(required, depts, 0.0)
+    weights = (reqs / 100) * 1.5
+    weights = weights * np.where(reqs >= 85, 1.3, np.where(reqs >= 75, 1.1, 1.0))
+    weights = np.where(required, weights, 0.0)
+    total_weight = _sum_traits(weights)
+    core = required & (reqs >= 80)
+
+    scores = np.empty((users.shape[0], depts.shape[0]))
+    for start in range(0, users.shape[0], max(1, chunk_size)):
+        user_chunk = users[start:start + chunk_size, None, :]
+        difference = np.abs(user_chunk - reqs[None, :, :])
+
+        # 부족한 경우 더 큰 페널티, 초과한 경우 적은 페널티
+        trait_scores = np.where(
+            user_chunk < reqs[None, :, :],
+            np.maximum(0, 100 - difference * 1.2),
+            np.maximum(0, 100 - difference * 0.8)
+        )
+        compatibility = _sum_traits(trait_scores * weights[None, :, :])
+
+        # 큰 차이가 나는 핵심 역량에 대한 페널티
+        penalty = _sum_traits(np.where(core[None, :, :] & (difference > 25), difference * 0.3, 0.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chunk_scores = np.where(total_weight > 0, compatibility / total_weight - penalty, 50.0)
+        scores[start:start + chunk_size] = chunk_scores
+
+    # 최종 점수를 0-100 범위로 제한하고 소수점 1자리로 반올림
+    return round_scores(np.clip(scores, 0, 100))
+
+
+def _sum_traits(values: np.ndarray) -> np.ndarray:
+    """
+    마지막 축(성향)을 앞에서부터 차례로 더한 합계
+
+    np.sum은 부분합을 나누어 더하므로 마지막 자리가 달라질 수 있어,
+    calculate_department_compatibility의 반복문과 같은 순서로 더합니다.
+    """
+    total = np.zeros(values.shape[:-1])
+    for j in range(values.shape[-1]):
+        total += values[..., j]
+    return total
+
+
+def round_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    소수점 1자리 반올림 (파이썬 round와 같은 결과)
+
+    np.round는 10을 곱한 뒤 반올림하므로 0.15처럼 정확히 표현되지 않는 값의 결과가
+    round(x, 1)과 다를 수 있습니다. 반올림 경계에 가까운 값만 round로 다시 계산합니다.
+
+    Args:
+        scores (np.ndarray): 점수 배열
+
+    Returns:
+        np.ndarray: 반올림한 점수 배열
+    """
+    rounded = np.round(scores, 1)
+    scaled = scores * 10
+    boundary = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if boundary.any():
+        rounded[boundary] = [round(float(value), 1) for value in scores[boundary]]
+    return rounded
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    점수 상위 k개의 열 번호 (점수 내림차순, 동점이면 앞쪽 열 우선)
+
+    전체를 정렬하지 않고 np.argpartition으로 상위 k개만 고른 뒤 그 안에서만 정렬합니다.
+    k번째 점수와 같은 점수가 경계에 걸친 행만 전체 안정 정렬로 다시 계산하므로
+    결과는 np.argsort(-scores, kind='stable')[..., :k]와 같습니다.
+
+    Args:
+        scores (np.ndarray): 점수 벡터 또는 (행 수 × 열 수) 점수 행렬
+        k (int): 고를 개수 (열 수보다 크면 전체)
+
+    Returns:
+        np.ndarray: 벡터면 (k,), 행렬이면 (행 수 × k) 열 번호
+    """
+    scores = np.asarray(scores)
+    single = scores.ndim == 1
+    negated = -np.atleast_2d(scores)
+    k = min(max(0, k), negated.shape[1])
+
+    if k == 0:
+        order = np.empty((negated.shape[0], 0), dtype=np.intp)
+    elif k == negated.shape[1]:
+        order = np.argsort(negated, axis=1, kind='stable')
+    else:
+        # 상위 k개를 열 번호 순으로 두고 안정 정렬하여 동점이면 앞쪽 열 우선
+        selected = np.sort(np.argpartition(negated, k - 1, axis=1)[:, :k], axis=1)
+        within = np.argsort(np.take_along_axis(negated, selected, axis=1), axis=1, kind='stable')
+        order = np.take_along_axis(selected, within, axis=1)
+
+        # k번째 점수와 같은 점수가 선택 밖에도 있으면 앞쪽 열이 빠졌을 수 있으므로 해당 행만 다시 정렬
+        threshold = np.take_along_axis(negated, order[:, -1:], axis=1)
+        ties = (negated <= threshold).sum(axis=1) > k
+        if ties.any():
+            order[ties] = np.argsort(negated[ties], axis=1, kind='stable')[:, :k]
+
+    return order[0] if single else order
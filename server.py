@@ -0,0 +1,324 @@
+"""
+부서 매칭 HTTP API (ASGI)
+
+인사 시스템에서 부서 매칭을 JSON으로 호출할 수 있는 가벼운 ASGI 앱입니다.
+작업자 프로세스마다 분석기(부서 요구 성향 색인, 연결 풀 OpenAI 클라이언트 포함)를 하나만 만들어 공유합니다.
+
+엔드포인트:
+    GET  /health          상태 확인 (처리 중인 요청 수, 끝나지 않은 분석 작업 수)
+    GET  /metrics         Prometheus 지표
+    POST /v1/match        지원자 한 명 분석 (analyze_matching 결과)
+    POST /v1/match/batch  여러 지원자 일괄 순위 계산 (match_cohort 결과, GPT 사유 없음)
+
+실행 예 (uvicorn 필요):
+    uvicorn server:app --workers 4
+"""
+import asyncio
+import io
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analysis import DepartmentMatcher
+from llm import create_backend
+from metrics import REGISTRY
+from ranking import RankedDepartments
+from tracing import trace
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_BYTES = 20 * 1024 * 1024
+
+
+class BadRequest(Exception):
+    """잘못된 요청 (400 응답)"""
+
+
+def _json_safe(value: Any) -> Any:
+    """NaN/inf는 null로, numpy 값은 파이썬 값으로, 부서 순위 목록은 리스트로 바꾸어 JSON으로 직렬화할 수 있게 변환"""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, RankedDepartments)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class TrackedThreadPool(ThreadPoolExecutor):
+    """
+    제출한 작업 중 아직 끝나지 않은 작업 수(대기 중 포함)를 세는 스레드 풀
+
+    제한 시간이 지나 요청이 취소되어도 이미 시작한 스레드 작업은 멈출 수 없으므로,
+    요청 수가 아니라 이 수로 실제로 남아 있는 분석 작업을 판단합니다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = ""):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.pending = 0
+        self._pending_lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._pending_lock:
+            self.pending += 1
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._finished(None)
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Optional[Future]) -> None:
+        with self._pending_lock:
+            self.pending -= 1
+
+
+def _read_table(payload: Dict[str, Any], key: str, required: bool = True) -> Optional[pd.DataFrame]:
+    """
+    요청 본문에서 표 데이터 읽기
+
+    key에는 레코드 목록([{컬럼: 값}, ...])을, key + '_csv'에는 CSV 문자열을 넣을 수 있습니다.
+    """
+    records = payload.get(key)
+    csv_text = payload.get(f"{key}_csv")
+    if records is not None:
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise BadRequest(f"'{key}'는 레코드 목록이어야 합니다")
+        try:
+            return pd.DataFrame.from_records(records)
+        except (TypeError, ValueError) as e:
+            raise BadRequest(f"'{key}'를 읽을 수 없습니다: {e}")
+    if csv_text is not None:
+        if not isinstance(csv_text, str):
+            raise BadRequest(f"'{key}_csv'는 CSV 문자열이어야 합니다")
+        try:
+            return pd.read_csv(io.StringIO(csv_text))
+        except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            raise BadRequest(f"'{key}_csv'를 읽을 수 없습니다: {e}")
+    if required:
+        raise BadRequest(f"'{key}' 또는 '{key}_csv'가 필요합니다")
+    return None
+
+
+class MatchingService:
+    """
+    부서 매칭 ASGI 앱
+
+    동시에 처리하는 분석 요청이 max_in_flight개를 넘으면 바로 503으로 거절하고(백프레셔),
+    request_timeout초 안에 끝나지 않은 요청은 504로 응답합니다.
+
+    적합도 계산은 전용 스레드 풀(TrackedThreadPool)에서 실행합니다. 504로 응답한 요청의 스레드 작업은
+    끝날 때까지 계속 실행되므로, 끝나지 않은 작업이 max_in_flight개 이상 남아 있어도 새 요청을 거절합니다.
+    """
+
+    def __init__(self, matcher: DepartmentMatcher, max_in_flight: int = 16, request_timeout: float = 30.0,
+                 max_body_bytes: int = MAX_BODY_BYTES, max_workers: Optional[int] = None):
+        """
+        Args:
+            matcher (DepartmentMatcher): 모든 요청이 공유할 분석기
+            max_in_flight (int): 동시에 처리할 최대 분석 요청 수 (끝나지 않은 스레드 작업 수에도 적용)
+            request_timeout (float): 요청별 제한 시간(초)
+            max_body_bytes (int): 요청 본문 최대 크기
+            max_workers (Optional[int]): 적합도 계산 스레드 수 (없으면 max_in_flight)
+        """
+        self.matcher = matcher
+        self.max_in_flight = max(1, max_in_flight)
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.in_flight = 0
+        self.executor = TrackedThreadPool(max_workers=max_workers or self.max_in_flight,
+                                          thread_name_prefix="matching")
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+            ('POST', '/v1/match'): self.match,
+            ('POST', '/v1/match/batch'): self.match_batch
+        }
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Awaitable[Dict[str, Any]]],
+                       send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        method, path = scope['method'], scope['path'].rstrip('/') or '/'
+        handler = self.routes.get((method, path))
+        if handler is None:
+            allowed = any(route_path == path for _, route_path in self.routes)
+            await self._send_json(send, 405 if allowed else 404, {'error': "지원하지 않는 경로입니다"})
+            return
+
+        if method == 'GET':
+            await handler(send)
+            return
+
+        # 백프레셔: 처리 중인 요청이나 (504로 응답한 요청을 포함해) 끝나지 않은 분석 작업이 가득 차면 거절
+        if self.in_flight >= self.max_in_flight or self.executor.pending >= self.max_in_flight:
+            await self._send_json(send, 503, {'error': "처리 중인 요청이 너무 많습니다"},
+                                  headers=[(b'retry-after', b'1')])
+            return
+
+        self.in_flight += 1
+        try:
+            try:
+                payload = await self._read_json(receive)
+                body = await asyncio.wait_for(handler(payload), timeout=self.request_timeout)
+            except BadRequest as e:
+                await self._send_json(send, 400, {'error': str(e)})
+            except asyncio.TimeoutError:
+                trace("request_timeout", path=path, timeout=self.request_timeout)
+                await self._send_json(send, 504, {'error': f"{self.request_timeout}초 안에 분석이 끝나지 않았습니다"})
+            except Exception as e:
+                trace("request_error", logging.ERROR, path=path, error=repr(e))
+                await self._send_json(send, 500, {'error': str(e)})
+            else:
+                await self._send_json(send, 200, body)
+        finally:
+            self.in_flight -= 1
+
+    async def health(self, send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        await self._send_json(send, 200, {'status': 'ok', 'in_flight': self.in_flight,
+                                          'pending_work': self.executor.pending,
+                                          'max_in_flight': self.max_in_flight})
+
+    async def metrics(self, send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        body = REGISTRY.export().encode('utf-8')
+        await self._send(send, 200, body, b'text/plain; version=0.0.4; charset=utf-8')
+
+    async def match(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        지원자 한 명 분석
+
+        요청: {"org_chart": [...] 또는 "org_chart_csv": "...",
+               "behavior": [...] 또는 "behavior_csv": "...", "mbti": "INTJ"}
+        """
+        dept_df = _read_table(payload, 'org_chart')
+        personal_df = _read_table(payload, 'behavior')
+        mbti = str(payload['mbti']).upper() if payload.get('mbti') else "알 수 없음"
+        return await self.matcher.analyze_matching_async(dept_df, personal_df, mbti, executor=self.executor)
+
+    async def match_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        여러 지원자 일괄 순위 계산
+
+        요청: {"org_chart": [...] 또는 "org_chart_csv": "...", "top_k": 5,
+               "candidates": [{"candidate_id": "...", "behavior": [...] 또는 "behavior_csv": "...", "mbti": "..."}]}
+        """
+        dept_df = _read_table(payload, 'org_chart')
+        raw_candidates = payload.get('candidates')
+        if not isinstance(raw_candidates, list) or not raw_candidates:
+            raise BadRequest("'candidates'는 비어 있지 않은 목록이어야 합니다")
+
+        candidates = []
+        for i, candidate in enumerate(raw_candidates):
+            if not isinstance(candidate, dict):
+                raise BadRequest(f"candidates[{i}]는 객체여야 합니다")
+            candidates.append({
+                'candidate_id': candidate.get('candidate_id', i),
+                'personal_df': _read_table(candidate, 'behavior'),
+                'mbti': str(candidate['mbti']).upper() if candidate.get('mbti') else "알 수 없음"
+            })
+
+        top_k = payload.get('top_k')
+        # JSON의 true/false는 파이썬 bool(int의 하위 클래스)이 되므로 따로 거절
+        if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 0):
+            raise BadRequest("'top_k'는 0 이상의 정수여야 합니다")
+
+        df = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.matcher.match_cohort, dept_df, candidates, top_k
+        )
+        return {'results': df.to_dict(orient='records')}
+
+    async def _read_json(self, receive: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise BadRequest("요청이 중간에 끊어졌습니다")
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise BadRequest(f"요청 본문이 {self.max_body_bytes}바이트를 넘습니다")
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                break
+
+        try:
+            payload = json.loads(b''.join(chunks) or b'{}')
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise BadRequest(f"JSON 형식이 아닙니다: {e}")
+        if not isinstance(payload, dict):
+            raise BadRequest("요청 본문은 JSON 객체여야 합니다")
+        return payload
+
+    async def _send_json(self, send: Callable[[Dict[str, Any]], Awaitable[None]], status: int, body: Any,
+                         headers: Optional[List[tuple]] = None) -> None:
+        encoded = json.dumps(_json_safe(body), ensure_ascii=False).encode('utf-8')
+        await self._send(send, status, encoded, b'application/json; charset=utf-8', headers)
+
+    async def _send(self, send: Callable[[Dict[str, Any]], Awaitable[None]], status: int, body: bytes,
+                    content_type: bytes, headers: Optional[List[tuple]] = None) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+                       + (headers or [])
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive: Callable[[], Awaitable[Dict[str, Any]]],
+                        send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_app(matcher: Optional[DepartmentMatcher] = None, max_in_flight: Optional[int] = None,
+               request_timeout: Optional[float] = None) -> MatchingService:
+    """
+    ASGI 앱 생성
+
+    Args:
+        matcher (Optional[DepartmentMatcher]): 공유할 분석기 (없으면 OPENAI_API_KEY와 LLM_BACKEND, LLM_MODEL,
+            LLM_BASE_URL 환경 변수로 생성, 테스트에서는 TemplateBackend나 tests/fakes.py의 FakeAsyncOpenAIClient 사용)
+        max_in_flight (Optional[int]): 동시에 처리할 최대 분석 요청 수 (기본값: MAX_IN_FLIGHT 환경 변수 또는 16)
+        request_timeout (Optional[float]): 요청별 제한 시간(초) (기본값: REQUEST_TIMEOUT 환경 변수 또는 30)
+
+    Returns:
+        MatchingService: ASGI 앱
+    """
+    if matcher is None:
+        api_key = os.environ.get("OPENAI_API_KEY", "")
+        backend = create_backend(
+            os.environ.get("LLM_BACKEND", "openai"),
+            api_key=api_key,
+            model=os.environ.get("LLM_MODEL"),
+            base_url=os.environ.get("LLM_BASE_URL")
+        )
+        matcher = DepartmentMatcher(api_key, backend=backend)
+    if max_in_flight is None:
+        max_in_flight = int(os.environ.get("MAX_IN_FLIGHT", "16"))
+    if request_timeout is None:
+        request_timeout = float(os.environ.get("REQUEST_TIMEOUT", "30"))
+    return MatchingService(matcher, max_in_flight=max_in_flight, request_timeout=request_timeout)
+
+
+# uvicorn server:app 으로 실행하면 작업자 프로세스마다 하나씩 생성
+app = create_app()
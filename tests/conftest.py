@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 최상위 모듈(analysis, behavior 등)을 테스트에서 바로 import할 수 있도록 저장소 루트를 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def org_chart() -> pd.DataFrame:
+    """저장소에 포함된 예시 조직도"""
+    return pd.read_csv(os.path.join(ROOT, "sample_department_data.csv"))
+
+
+@pytest.fixture
+def behavior_log() -> pd.DataFrame:
+    """저장소에 포함된 예시 디지털 행동 데이터"""
+    return pd.read_csv(os.path.join(ROOT, "sample_personal_data.csv"))
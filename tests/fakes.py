@@ -0,0 +1,56 @@
+"""
+테스트용 OpenAI 클라이언트 대체 객체
+"""
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Union
+
+
+class FakeOpenAIClient:
+    """
+    테스트용 OpenAI 클라이언트 대체 객체
+
+    client.chat.completions.create(...) 형태의 호출을 받아 고정된 형식의 응답을 돌려주고,
+    호출 인자를 calls에 기록합니다.
+    """
+
+    def __init__(self, reply: Union[str, Callable[[Dict[str, Any]], str]] = "테스트 응답입니다."):
+        """
+        Args:
+            reply (Union[str, Callable[[Dict[str, Any]], str]]): 고정 응답 또는 요청 인자를 받아 응답을 만드는 함수
+        """
+        self.reply = reply
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(
+            retrieve=lambda model: SimpleNamespace(id=model),
+            list=lambda: SimpleNamespace(data=[])
+        )
+
+    def _create(self, **kwargs: Any) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(
+                content=self.reply(kwargs) if callable(self.reply) else self.reply
+            ))],
+            usage=SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        )
+
+
+class FakeAsyncOpenAIClient(FakeOpenAIClient):
+    """테스트용 AsyncOpenAI 클라이언트 대체 객체 (await client.chat.completions.create(...))"""
+
+    def __init__(self, reply: Union[str, Callable[[Dict[str, Any]], str]] = "테스트 응답입니다.", delay: float = 0.0):
+        """
+        Args:
+            reply (Union[str, Callable[[Dict[str, Any]], str]]): 고정 응답 또는 응답을 만드는 함수
+            delay (float): 응답 전 대기 시간(초) (네트워크 지연 흉내)
+        """
+        super().__init__(reply)
+        self.delay = delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_async))
+
+    async def _create_async(self, **kwargs: Any) -> SimpleNamespace:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._create(**kwargs)
@@ -0,0 +1,168 @@
+"""
+여러 부서의 배치 사유를 한 번에 요청하는 JSON 응답 경로(reason_batch_size > 1) 테스트
+"""
+import json
+import re
+import time
+
+import pytest
+
+from analysis import DepartmentMatcher, parse_batch_reasons
+from tests.fakes import FakeOpenAIClient
+
+PROFILE = {"분석력": 80, "독립성": 60, "계획성": 70, "창의성": 50, "소통력": 65, "협력성": 55, "실행력": 75, "안정성": 60}
+DEPARTMENTS = [{'name': name, 'score': score}
+               for name, score in [("개발팀", 91.0), ("기획팀", 84.5), ("마케팅팀", 77.0), ("인사팀", 70.5)]]
+
+
+def scripted_client(batch_reply: str) -> FakeOpenAIClient:
+    """묶음 요청(JSON 형식)에는 batch_reply를, 부서별 요청에는 '<부서명> 개별 사유'를 돌려주는 클라이언트"""
+    def reply(kwargs):
+        if 'response_format' in kwargs:
+            return batch_reply
+        return re.search(r"개인이 (\S+) 부서에", kwargs['messages'][-1]['content']).group(1) + " 개별 사유"
+    return FakeOpenAIClient(reply=reply)
+
+
+def batch_reply(*entries) -> str:
+    return json.dumps({"reasons": [{"id": number, "reason": reason} for number, reason in entries]},
+                      ensure_ascii=False)
+
+
+def single_requests(client: FakeOpenAIClient) -> int:
+    return sum('response_format' not in call for call in client.calls)
+
+
+@pytest.mark.parametrize("text", ["", "not json", "[1, 2", "null", "42", '{"reasons": "개발팀"}', '{"other": []}'])
+def test_parse_malformed_json(text):
+    assert parse_batch_reasons(text, 3) == {}
+
+
+def test_parse_skips_invalid_entries():
+    text = json.dumps({"reasons": [
+        {"id": 1, "reason": " 첫 번째 "},
+        {"id": 1, "reason": "중복"},
+        {"id": "2", "reason": "문자열 번호"},
+        {"id": 0, "reason": "범위 밖"},
+        {"id": 4, "reason": "범위 밖"},
+        {"id": True, "reason": "bool 번호"},
+        {"id": 3, "reason": "   "},
+        {"reason": "번호 없음"},
+        "항목이 아님",
+    ]}, ensure_ascii=False)
+
+    assert parse_batch_reasons(text, 3) == {1: "첫 번째", 2: "문자열 번호"}
+    # 최상위 목록도 받아들임
+    assert parse_batch_reasons('[{"id": 3, "reason": "목록"}]', 3) == {3: "목록"}
+
+
+def test_batch_request_numbers_departments_in_order():
+    matcher = DepartmentMatcher("test-key", client=FakeOpenAIClient(), reason_batch_size=4)
+
+    messages, context, max_tokens = matcher._batch_request(PROFILE, DEPARTMENTS[1:3], "INTJ")
+
+    assert "1. 기획팀 - 적합도 84.5%" in messages[-1]['content']
+    assert "2. 마케팅팀 - 적합도 77.0%" in messages[-1]['content']
+    assert context['departments'] == [{'id': 1, 'dept_name': "기획팀", 'score': 84.5},
+                                      {'id': 2, 'dept_name': "마케팅팀", 'score': 77.0}]
+    assert max_tokens == 400
+
+
+def test_prepare_batch_skips_cached_departments():
+    matcher = DepartmentMatcher("test-key", client=FakeOpenAIClient(), reason_batch_size=4)
+    cache_key = matcher._analysis_cache_key(matcher._analysis_messages(PROFILE, "기획팀", 84.5, "INTJ"))
+    matcher.response_cache.set(cache_key, "캐시된 사유")
+
+    reasons, cache_keys, pending = matcher._prepare_batch(PROFILE, DEPARTMENTS, "INTJ")
+
+    assert reasons == [None, "캐시된 사유", None, None]
+    assert cache_keys[1] == cache_key and None not in cache_keys
+    assert pending == [0, 2, 3]
+
+
+def test_finish_batch_maps_reply_numbers_onto_pending_positions():
+    client = scripted_client(batch_reply((2, "마케팅 사유"), (1, "개발 사유"), (3, "범위 밖")))
+    matcher = DepartmentMatcher("test-key", client=client, reason_batch_size=4)
+    reasons, cache_keys, pending = [None, "캐시된 사유", None], ["k0", "k1", "k2"], [0, 2]
+
+    response = matcher.backend.complete([], max_tokens=10, temperature=0.0, json_mode=True)
+    assert matcher._finish_batch(response, reasons, cache_keys, pending) == ["개발 사유", "캐시된 사유", "마케팅 사유"]
+    assert matcher.response_cache.get("k0") == "개발 사유"
+    assert matcher.response_cache.get("k2") == "마케팅 사유"
+
+
+def test_complete_batch_reply_sends_one_request():
+    client = scripted_client(batch_reply((4, "인사 사유"), (1, "개발 사유"), (3, "마케팅 사유"), (2, "기획 사유")))
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_batch_size=4)
+
+    reasons = matcher.generate_department_analyses(PROFILE, DEPARTMENTS, "INTJ")
+
+    assert reasons == ["개발 사유", "기획 사유", "마케팅 사유", "인사 사유"]
+    assert len(client.calls) == 1
+    assert client.calls[0]['response_format'] == {"type": "json_object"}
+
+
+@pytest.mark.parametrize("reply", [
+    batch_reply((1, "개발 사유"), (3, "마케팅 사유")),
+    batch_reply((1, "개발 사유"), (1, "중복"), (3, "마케팅 사유"), (7, "범위 밖"), ("x", "잘못된 번호")),
+])
+def test_only_missing_departments_fall_back(reply):
+    client = scripted_client(reply)
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_batch_size=4)
+
+    reasons = matcher.generate_department_analyses(PROFILE, DEPARTMENTS, "INTJ")
+
+    assert reasons == ["개발 사유", "기획팀 개별 사유", "마케팅 사유", "인사팀 개별 사유"]
+    assert single_requests(client) == 2
+
+
+def test_malformed_batch_reply_falls_back_for_every_department():
+    client = scripted_client("배치 사유를 알려드릴게요")
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_batch_size=4)
+
+    reasons = matcher.generate_department_analyses(PROFILE, DEPARTMENTS, "INTJ")
+
+    assert reasons == [f"{dept['name']} 개별 사유" for dept in DEPARTMENTS]
+    assert single_requests(client) == 4
+
+
+def test_batches_keep_department_order_under_concurrency():
+    # 묶음마다 번호가 1부터 시작하므로 프롬프트의 부서 이름으로 답하고, 늦게 보낸 묶음이 먼저 끝나도록 지연
+    def reply(kwargs):
+        prompt = kwargs['messages'][-1]['content']
+        if 'response_format' not in kwargs:
+            return re.search(r"개인이 (\S+) 부서에", prompt).group(1) + " 개별 사유"
+        names = re.findall(r"\d+\. (\S+) - 적합도", prompt)
+        time.sleep(0.05 if "개발팀" in names else 0.0)
+        return batch_reply(*((i, f"{name} 묶음 사유") for i, name in enumerate(names, 1)))
+
+    client = FakeOpenAIClient(reply=reply)
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, max_concurrency=4,
+                                reason_batch_size=2)
+    departments = DEPARTMENTS + [{'name': "재무팀", 'score': 60.0}]
+
+    reasons = matcher.generate_department_analyses(PROFILE, departments, "INTJ")
+
+    # 마지막 묶음은 부서가 하나뿐이라 부서별 요청으로 보냄
+    assert reasons == [f"{dept['name']} 묶음 사유" for dept in DEPARTMENTS] + ["재무팀 개별 사유"]
+    assert len(client.calls) == 3
+
+
+def test_batched_reasons_fill_top_departments_in_rank_order(org_chart, behavior_log):
+    def reply(kwargs):
+        if 'response_format' not in kwargs:
+            return "개별 사유"
+        names = re.findall(r"\d+\. (\S+) - 적합도", kwargs['messages'][-1]['content'])
+        # 응답 순서를 뒤집어도 번호로 원래 위치를 찾아야 함
+        return batch_reply(*((i, f"{name} 사유") for i, name in reversed(list(enumerate(names, 1)))))
+
+    client = FakeOpenAIClient(reply=reply)
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_top_k=3,
+                                reason_batch_size=3)
+
+    results = matcher.analyze_matching(org_chart, behavior_log, "INTJ")
+
+    top = results['top_departments']
+    assert [dept['reason'] for dept in top[:3]] == [f"{dept['name']} 사유" for dept in top[:3]]
+    assert all(dept['reason'] is None for dept in top[3:])
+    assert len(client.calls) == 1
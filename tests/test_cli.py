@@ -0,0 +1,105 @@
+"""
+명령줄 일괄 실행(cli) 테스트
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import cli
+from cli import UNKNOWN_MBTI, discover_candidates, read_mbti_mapping, run_batch
+from tests.conftest import ROOT
+
+ORG_CHART = os.path.join(ROOT, "sample_department_data.csv")
+
+
+def write_text(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def write_csv(path):
+    return write_text(path, "관심사,사용시간\ntech,3\n")
+
+
+def test_discover_candidates_from_directory(tmp_path):
+    single = write_csv(tmp_path / "kim.csv")
+    first = write_csv(tmp_path / "lee" / "a.csv")
+    second = write_csv(tmp_path / "lee" / "b.csv")
+
+    assert discover_candidates(str(tmp_path)) == [("kim", [single]), ("lee", [first, second])]
+
+
+def test_discover_candidates_from_glob(tmp_path):
+    kim = write_csv(tmp_path / "a" / "kim.csv")
+    lee = write_csv(tmp_path / "b" / "lee.csv")
+
+    assert discover_candidates(str(tmp_path / "**" / "*.csv")) == [("kim", [kim]), ("lee", [lee])]
+
+
+def test_discover_candidates_rejects_duplicate_basenames(tmp_path):
+    write_csv(tmp_path / "a" / "kim.csv")
+    write_csv(tmp_path / "b" / "kim.csv")
+
+    with pytest.raises(ValueError, match="kim"):
+        discover_candidates(str(tmp_path / "**" / "*.csv"))
+
+
+def test_discover_candidates_rejects_file_and_directory_with_same_id(tmp_path):
+    write_csv(tmp_path / "kim.csv")
+    write_csv(tmp_path / "kim" / "a.csv")
+
+    with pytest.raises(ValueError, match="kim"):
+        discover_candidates(str(tmp_path))
+
+
+def test_read_mbti_mapping_maps_blank_to_unknown(tmp_path):
+    path = tmp_path / "mbti.csv"
+    path.write_text("candidate_id,mbti\nkim, intj \nlee,\npark,  \n", encoding="utf-8")
+
+    assert read_mbti_mapping(str(path)) == {"kim": "INTJ", "lee": UNKNOWN_MBTI, "park": UNKNOWN_MBTI}
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setattr(cli, '_worker', {})
+    cli._init_worker(ORG_CHART, None, {'name': "template"}, {'reason_top_k': 2})
+    return cli._worker
+
+
+def test_process_chunk_matches_analyze_matching(tmp_path, worker):
+    rows = ["관심사,사용시간\ntech,3\nsocial,8\n", "관심사,사용시간\nart,1\nnews,2\n", "관심사,사용시간\ngame,12\n"]
+    chunk = [(f"c{i}", [write_text(tmp_path / f"c{i}.csv", text)], mbti)
+             for i, (text, mbti) in enumerate(zip(rows, ["INTJ", UNKNOWN_MBTI, "ENFP"]))]
+    chunk.insert(1, ("missing", [str(tmp_path / "missing.csv")], "INTJ"))
+
+    outcomes = cli._process_chunk(chunk, top_k=3, html_dir=None)
+
+    assert list(outcomes) == ["missing", "c0", "c1", "c2"]
+    assert "error" in outcomes.pop("missing")
+    matcher = worker['matcher']
+    for candidate_id, files, mbti in [item for item in chunk if item[0] in outcomes]:
+        results = matcher.analyze_matching(worker['dept_df'], pd.read_csv(files[0]), mbti)
+        expected = [
+            (candidate_id, mbti, rank, dept['name'], dept['main_dept'], dept['sub_dept'], dept['score'], dept['reason'])
+            for rank, dept in enumerate(results['all_departments'][:3], 1)
+        ]
+        assert [tuple(row[col] for col in cli.OUTPUT_COLUMNS) for row in outcomes[candidate_id]['rows']] == expected
+        assert outcomes[candidate_id]['rows'][2]['reason'] is None
+
+
+def test_run_batch_chunks_candidates(tmp_path):
+    personal = tmp_path / "logs"
+    for i in range(5):
+        write_text(personal / f"c{i}.csv", f"관심사,사용시간\ntech,{i + 1}\nsocial,{5 - i}\n")
+    mbti = write_text(tmp_path / "mbti.csv", "candidate_id,mbti\nc0,INTJ\nc1,\n")
+    output = str(tmp_path / "results.csv")
+
+    stats = run_batch(ORG_CHART, str(personal), mbti, output, workers=2, top_k=2, chunk_size=2,
+                      backend_options={'name': "template"})
+
+    assert stats['candidates'] == 5 and stats['failed'] == 0 and stats['rows'] == 10
+    df = pd.read_csv(output, encoding='utf-8-sig')
+    assert df['candidate_id'].tolist() == [f"c{i}" for i in range(5) for _ in range(2)]
+    assert df['mbti'].tolist()[:4] == ["INTJ", "INTJ", UNKNOWN_MBTI, UNKNOWN_MBTI]
@@ -0,0 +1,107 @@
+"""
+여러 지원자 일괄 매칭(DepartmentMatcher.match_cohort, iter_cohort_matches)이
+지원자별 analyze_matching과 같은 점수와 순서를 내는지 확인하는 테스트
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import COHORT_COLUMNS, DepartmentMatcher
+from llm import TemplateBackend
+
+MBTIS = ["INTJ", "ENFP", None, "ISTP", "알 수 없음", "ESFJ", "XXXX"]
+INTERESTS = ['tech', 'social', 'news', 'art', 'education', 'shopping', 'game', '여행']
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return DepartmentMatcher("", backend=TemplateBackend(), reason_top_k=0)
+
+
+@pytest.fixture
+def candidates():
+    rng = np.random.default_rng(0)
+    return [
+        {
+            'candidate_id': f"C{i:02d}",
+            'mbti': MBTIS[i % len(MBTIS)],
+            'personal_df': pd.DataFrame({
+                '관심사': [INTERESTS[j] for j in rng.integers(0, len(INTERESTS), 12)],
+                '사용시간': rng.uniform(0, 10, 12).round(1),
+            }),
+        }
+        for i in range(11)
+    ]
+
+
+def expected_rows(matcher, org_chart, candidate, top_k=None):
+    """지원자 한 명을 analyze_matching으로 분석한 결과를 match_cohort 행 형식으로 변환"""
+    mbti = candidate['mbti'] or "알 수 없음"
+    ranked = matcher.analyze_matching(org_chart, candidate['personal_df'], mbti)['all_departments']
+    order = ranked.order()[:top_k]
+    return [
+        (candidate['candidate_id'], mbti, rank, ranked.names[row], ranked.main_depts[row], ranked.sub_depts[row],
+         ranked.scores[row])
+        for rank, row in enumerate(order, 1)
+    ]
+
+
+def as_rows(frame: pd.DataFrame):
+    return [tuple(row) for row in frame[COHORT_COLUMNS].itertuples(index=False)]
+
+
+def test_match_cohort_matches_analyze_matching(matcher, org_chart, candidates):
+    cohort = matcher.match_cohort(org_chart, candidates)
+
+    assert list(cohort.columns) == COHORT_COLUMNS
+    assert len(cohort) == len(candidates) * len(org_chart)
+    expected = [row for candidate in candidates for row in expected_rows(matcher, org_chart, candidate)]
+    assert as_rows(cohort) == expected
+
+
+@pytest.mark.parametrize("top_k", [0, 1, 3, 100])
+def test_match_cohort_top_k(matcher, org_chart, candidates, top_k):
+    cohort = matcher.match_cohort(org_chart, candidates, top_k=top_k)
+
+    keep = min(top_k, len(org_chart))
+    assert len(cohort) == len(candidates) * keep
+    expected = [row for candidate in candidates for row in expected_rows(matcher, org_chart, candidate, keep)]
+    assert as_rows(cohort) == expected
+
+
+def test_match_cohort_without_candidates(matcher, org_chart):
+    cohort = matcher.match_cohort(org_chart, [])
+
+    assert cohort.empty
+    assert list(cohort.columns) == COHORT_COLUMNS
+    assert list(matcher.iter_cohort_matches(org_chart, [])) == []
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 4])
+def test_iter_cohort_matches_streams_batches(matcher, org_chart, candidates, batch_size):
+    # 목록이 아닌 이터레이터도 끝까지 한 번만 읽으며 batch_size명씩 반환
+    batches = list(matcher.iter_cohort_matches(org_chart, iter(candidates), top_k=2, batch_size=batch_size))
+
+    sizes = [batch['candidate_id'].nunique() for batch in batches]
+    assert sizes == [batch_size] * (len(candidates) // batch_size) + (
+        [len(candidates) % batch_size] if len(candidates) % batch_size else [])
+    assert as_rows(pd.concat(batches, ignore_index=True)) == as_rows(
+        matcher.match_cohort(org_chart, candidates, top_k=2))
+
+
+def test_score_cohort_batch_keeps_org_chart_order_on_ties(matcher):
+    # 요구사항이 모두 같은 부서는 점수가 같으므로 조직도 순서를 유지
+    dept_columns = {key: np.array([f"{key}{i}" for i in range(4)], dtype=object)
+                    for key in ('name', 'main_dept', 'sub_dept')}
+    dept_matrix = np.full((4, 8), 60.0)
+    dept_matrix[2] = 90.0
+    batch = [{'candidate_id': "A", 'personal_df': pd.DataFrame({'관심사': ['tech'], '사용시간': [3.0]})}]
+
+    frame = matcher._score_cohort_batch(batch, dept_matrix, dept_columns, keep=4)
+
+    names = frame['name'].tolist()
+    assert [name for name in names if name != "name2"] == ["name0", "name1", "name3"]
+    assert frame['score'].nunique() == 2
+    assert frame['score'].is_monotonic_decreasing
+    assert frame['rank'].tolist() == [1, 2, 3, 4]
+    assert frame['mbti'].tolist() == ["알 수 없음"] * 4
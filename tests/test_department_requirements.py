@@ -0,0 +1,132 @@
+"""
+부서 요구 성향 색인(department_requirements.RequirementsIndex)과 조직도 성향 컬럼 읽기 테스트
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import DepartmentMatcher
+from department_requirements import LRUMemo, RequirementsIndex
+from llm import TemplateBackend
+from scoring import TRAITS
+from tests.conftest import ROOT
+
+DEPT_NAMES = ["개발팀", "마케팅팀", "신규사업팀", "개발", "재무팀", "알 수 없는 팀", np.nan, "디자인팀"]
+SUBDEPT_NAMES = ["백엔드", "", "Growth 파트", "AI 연구", np.nan, "서비스 기획", "", "UX"]
+
+
+def test_memo_size_does_not_change_results():
+    unbounded = RequirementsIndex()
+    bounded = RequirementsIndex(memo_size=2)
+
+    expected = unbounded.matrix(DEPT_NAMES, SUBDEPT_NAMES)
+    np.testing.assert_array_equal(bounded.matrix(DEPT_NAMES, SUBDEPT_NAMES), expected)
+    for i, (dept_name, subdept_name) in enumerate(zip(DEPT_NAMES, SUBDEPT_NAMES)):
+        np.testing.assert_array_equal(bounded.row(dept_name, subdept_name), expected[i])
+        assert bounded.requirements(dept_name, subdept_name) == unbounded.requirements(dept_name, subdept_name)
+
+
+def test_memos_are_bounded():
+    index = RequirementsIndex(memo_size=100)
+    names = [f"부서{i}" for i in range(1000)]
+    index.matrix(names, [f"파트{i}" for i in range(1000)])
+    for name in names:
+        index.row(name)
+
+    assert len(index._resolved_names) == 100
+    assert len(index._resolved_rules) == 100
+    assert len(index._rows) == 100
+
+
+def test_lru_memo_keeps_recently_used_entries():
+    memo = LRUMemo(2)
+    memo.set("a", None)
+    memo.set("b", 1)
+    assert memo.get("a") is None
+    memo.set("c", 2)
+
+    assert memo.get("b") is LRUMemo.MISSING
+    assert memo.get("a") is None and memo.get("c") == 2
+
+
+# 문자열 해시 순서에 따라 결과가 달라지지 않는지 다른 PYTHONHASHSEED의 새 프로세스에서 확인
+HASH_SEED_SCRIPT = """
+import json, sys
+from department_requirements import RequirementsIndex
+names, subnames = json.loads(sys.stdin.read())
+print(json.dumps(RequirementsIndex(memo_size=3).matrix(names, subnames).tolist()))
+"""
+
+
+def matrix_with_hash_seed(seed: str, names, subnames):
+    env = dict(os.environ, PYTHONHASHSEED=seed)
+    output = subprocess.run([sys.executable, "-c", HASH_SEED_SCRIPT], input=json.dumps([names, subnames]),
+                            capture_output=True, text=True, cwd=ROOT, env=env, check=True).stdout
+    return np.array(json.loads(output), dtype=float)
+
+
+def test_matrix_does_not_depend_on_hash_seed():
+    names = [name if isinstance(name, str) else None for name in DEPT_NAMES] * 3 + [f"부서{i}" for i in range(20)]
+    subnames = [name if isinstance(name, str) else None for name in SUBDEPT_NAMES] * 3 + [""] * 20
+
+    first = matrix_with_hash_seed("1", names, subnames)
+    np.testing.assert_array_equal(first, matrix_with_hash_seed("12345", names, subnames))
+    np.testing.assert_array_equal(first, RequirementsIndex().matrix(names, subnames))
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return DepartmentMatcher("", backend=TemplateBackend())
+
+
+def org_chart(**trait_columns) -> pd.DataFrame:
+    return pd.DataFrame({'부서명': ["개발팀", "마케팅팀", "재무팀"], '하위부서명': ["백엔드", "", "회계"], **trait_columns})
+
+
+def index_matrix(matcher, df: pd.DataFrame) -> np.ndarray:
+    return matcher.requirements_index.matrix(df['부서명'].tolist(), df['하위부서명'].tolist())
+
+
+def test_without_trait_columns_uses_index(matcher):
+    df = org_chart(주요업무=["개발", "홍보", "회계"])
+
+    assert matcher._read_requirement_columns(df) is None
+    dept_columns, dept_matrix = matcher._build_department_table(df)
+    np.testing.assert_array_equal(dept_matrix, index_matrix(matcher, df))
+    assert dept_columns['name'].tolist() == ["개발팀 - 백엔드", "마케팅팀", "재무팀 - 회계"]
+
+
+def test_partial_trait_columns_fill_the_rest_from_index(matcher):
+    df = org_chart(분석력=[90, 40, 75], 소통력=[55.5, 80, 60])
+
+    csv_matrix = matcher._read_requirement_columns(df)
+    assert csv_matrix.dtype == np.float32 and csv_matrix.shape == (3, len(TRAITS))
+    others = [i for i, trait in enumerate(TRAITS) if trait not in ("분석력", "소통력")]
+    assert np.isnan(csv_matrix[:, others]).all()
+
+    _, dept_matrix = matcher._build_department_table(df)
+    expected = index_matrix(matcher, df)
+    expected[:, TRAITS.index("분석력")] = [90, 40, 75]
+    expected[:, TRAITS.index("소통력")] = [55.5, 80, 60]
+    np.testing.assert_array_equal(dept_matrix, expected)
+
+
+def test_invalid_trait_values_fall_back_to_index(matcher):
+    df = org_chart(분석력=["85", "높음", None], 창의성=[101, -1, 100], 협력성=[0, " 70 ", ""])
+
+    csv_matrix = matcher._read_requirement_columns(df)
+    column = {trait: csv_matrix[:, TRAITS.index(trait)] for trait in ("분석력", "창의성", "협력성")}
+    np.testing.assert_array_equal(column["분석력"], [85, np.nan, np.nan])
+    np.testing.assert_array_equal(column["창의성"], [np.nan, np.nan, 100])
+    np.testing.assert_array_equal(column["협력성"], [0, 70, np.nan])
+
+    _, dept_matrix = matcher._build_department_table(df)
+    expected = index_matrix(matcher, df)
+    valid = ~np.isnan(csv_matrix)
+    expected[valid] = csv_matrix[valid]
+    np.testing.assert_array_equal(dept_matrix, expected)
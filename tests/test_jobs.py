@@ -0,0 +1,152 @@
+"""
+백그라운드 분석 작업(jobs.JobManager) 테스트
+"""
+import threading
+import time
+
+import pytest
+
+import jobs
+from jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, Job, JobCancelled, JobManager
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=1)
+    yield manager
+    manager.shutdown()
+
+
+def wait_until_finished(manager: JobManager, job_id: str, timeout: float = 5.0) -> Job:
+    deadline = time.monotonic() + timeout
+    job = manager.get(job_id)
+    while not job.finished:
+        assert time.monotonic() < deadline, f"작업이 끝나지 않았습니다: {job.snapshot()}"
+        time.sleep(0.005)
+    return job
+
+
+def blocking_job(started: threading.Event, release: threading.Event):
+    def run(job: Job) -> str:
+        started.set()
+        assert release.wait(5.0)
+        return "결과"
+    return run
+
+
+def test_queued_running_done(manager):
+    started, release = threading.Event(), threading.Event()
+    first = manager.submit(blocking_job(started, release))
+    second = manager.submit(lambda job, value: value * 2, 21)
+
+    assert started.wait(5.0)
+    assert manager.get(first).snapshot()['status'] == RUNNING
+    # 작업자가 하나뿐이므로 두 번째 작업은 대기열에 있음
+    assert manager.get(second).snapshot()['status'] == QUEUED
+
+    release.set()
+    assert wait_until_finished(manager, first).result == "결과"
+    job = wait_until_finished(manager, second)
+    assert job.status == DONE and job.result == 42 and job.finished_at is not None
+
+
+def test_failed_job_keeps_error(manager):
+    def fail(job: Job):
+        raise ValueError("잘못된 조직도")
+
+    job = wait_until_finished(manager, manager.submit(fail))
+
+    assert job.status == FAILED
+    assert job.snapshot()['error'] == "잘못된 조직도"
+    assert job.result is None
+
+
+def test_cancel_queued_job_does_not_run(manager):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    first = manager.submit(blocking_job(started, release))
+    second = manager.submit(lambda job: calls.append(job.id))
+    assert started.wait(5.0)
+
+    assert manager.cancel(second)
+    release.set()
+
+    assert wait_until_finished(manager, second).status == CANCELLED
+    assert wait_until_finished(manager, first).status == DONE
+    assert calls == []
+    assert not manager.cancel(second)
+
+
+def test_cancel_running_job_at_next_progress_report(manager):
+    started = threading.Event()
+
+    def run(job: Job):
+        started.set()
+        for completed in range(10 ** 6):
+            job.report_progress("gpt", completed, 10 ** 6, f"부서{completed}")
+            time.sleep(0.001)
+
+    job_id = manager.submit(run)
+    assert started.wait(5.0)
+    assert manager.cancel(job_id)
+
+    job = wait_until_finished(manager, job_id)
+    assert job.status == CANCELLED
+    assert job.snapshot()['stage'] == "gpt"
+
+
+def test_report_progress_raises_after_cancel():
+    job = Job("job")
+    job.report_progress("scoring", 3, 10, "개발팀")
+    job.report_progress("gpt", 1, 2)
+
+    snapshot = job.snapshot()
+    assert (snapshot['stage'], snapshot['completed'], snapshot['total'], snapshot['department']) == \
+        ("gpt", 1, 2, "개발팀")
+
+    job.cancel()
+    with pytest.raises(JobCancelled):
+        job.report_progress("gpt", 2, 2)
+    assert job.snapshot()['completed'] == 1
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def finished_job(manager: JobManager, clock: Clock, status: str = DONE) -> Job:
+    job = Job(f"job{len(manager._jobs)}")
+    manager._jobs[job.id] = job
+    manager._finish(job, status)
+    clock.now += 1
+    return job
+
+
+def test_prune_removes_expired_and_excess_finished_jobs(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(jobs.time, "time", clock)
+    manager = JobManager(max_workers=1, max_jobs=4, retention=10)
+    try:
+        old, middle = finished_job(manager, clock), finished_job(manager, clock, FAILED)
+        running = Job("running")
+        running.status = RUNNING
+        manager._jobs[running.id] = running
+        recent = finished_job(manager, clock, CANCELLED)
+
+        # 보관 기간 안이고 개수도 넘지 않으면 유지, 한도에 닿으면 가장 먼저 끝난 작업 하나만 삭제
+        with manager._lock:
+            manager._prune()
+        assert list(manager._jobs) == [middle.id, running.id, recent.id]
+        assert old.id not in manager._jobs
+
+        clock.now += 8.5
+        with manager._lock:
+            manager._prune()
+        # middle은 보관 기간(10초)을 넘었고, 실행 중인 작업은 개수와 관계없이 유지
+        assert list(manager._jobs) == [running.id, recent.id]
+    finally:
+        manager.shutdown()
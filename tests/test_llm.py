@@ -0,0 +1,80 @@
+"""
+LLM 백엔드(llm.OpenAIBackend 등) 테스트
+"""
+import asyncio
+from typing import Any
+
+import llm
+from analysis import DepartmentMatcher
+from llm import OpenAIBackend, OpenAICompatibleBackend, TemplateBackend
+from metrics import GPT_RETRIES
+from tests.fakes import FakeAsyncOpenAIClient, FakeOpenAIClient
+
+MESSAGES = [{"role": "user", "content": "배치 사유를 알려주세요."}]
+
+
+class RetryingAsyncClient(FakeAsyncOpenAIClient):
+    """요청마다 정해진 횟수만큼 HTTP 요청 훅을 호출하는 비동기 클라이언트 (SDK 재시도 흉내)"""
+
+    def __init__(self, attempts: int, delay: float = 0.0):
+        super().__init__(delay=delay)
+        self.attempts = attempts
+
+    async def _create_async(self, **kwargs: Any):
+        for _ in range(self.attempts):
+            await llm._count_async_http_attempt(None)
+            await asyncio.sleep(self.delay)
+        return self._create(**kwargs)
+
+
+def test_async_retries_are_counted():
+    before = GPT_RETRIES.value()
+    backend = OpenAIBackend("test-key", async_client=RetryingAsyncClient(attempts=3))
+
+    response = asyncio.run(backend.acomplete(MESSAGES, max_tokens=50, temperature=0.0))
+
+    assert response.text == "테스트 응답입니다."
+    assert GPT_RETRIES.value() - before == 2
+
+
+def test_concurrent_async_retries_are_counted_per_request():
+    before = GPT_RETRIES.value()
+    backends = [OpenAIBackend("test-key", async_client=RetryingAsyncClient(attempts, delay=0.01))
+                for attempts in (1, 2, 4, 1)]
+
+    async def run():
+        await asyncio.gather(*(backend.acomplete(MESSAGES, max_tokens=50, temperature=0.0)
+                               for backend in backends))
+
+    asyncio.run(run())
+
+    assert GPT_RETRIES.value() - before == 0 + 1 + 3 + 0
+    assert llm._async_http_attempts.get() is None
+
+
+def test_request_limits_follow_backend_characteristics():
+    backend = OpenAICompatibleBackend("http://localhost:8000/v1", "local-model", max_requests_per_second=2.0,
+                                      expected_latency=2.0)
+
+    # 요청한 속도보다 서버 한도가 낮으면 서버 한도, 동시 요청은 2 req/s × 2초 = 4개면 충분
+    assert backend.request_limits(10.0, 16, burst=3) == (2.0, 4)
+    assert backend.request_limits(None, 16, burst=3) == (2.0, 4)
+    assert backend.request_limits(1.0, 16, burst=3) == (1.0, 3)
+    assert backend.request_limits(10.0, 2, burst=3) == (2.0, 2)
+
+    unlimited = OpenAICompatibleBackend("http://localhost:8000/v1", "local-model")
+    assert unlimited.request_limits(None, 16) == (None, 16)
+    assert TemplateBackend().request_limits(10.0, 16) == (None, 1)
+
+
+def test_matcher_derives_limits_from_backend():
+    backend = OpenAICompatibleBackend("http://localhost:8000/v1", "local-model", client=FakeOpenAIClient(),
+                                      max_requests_per_second=5.0, expected_latency=1.0)
+    matcher = DepartmentMatcher("", backend=backend, max_concurrency=32, requests_per_second=None, burst=2)
+
+    assert matcher.rate_limiter.rate == 5.0
+    assert matcher.max_concurrency == 5
+
+    offline = DepartmentMatcher("", backend=TemplateBackend(), max_concurrency=32)
+    assert offline.rate_limiter.rate is None
+    assert offline.max_concurrency == 1
@@ -0,0 +1,161 @@
+"""
+GPT 응답 캐시(llm.ResponseCache)와 저장소 테스트
+"""
+import asyncio
+import sqlite3
+
+import pytest
+
+import llm
+from analysis import DepartmentMatcher
+from llm import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+from tests.fakes import FakeAsyncOpenAIClient, FakeOpenAIClient
+
+PROFILE = {"분석력": 80, "독립성": 60, "계획성": 70, "창의성": 50, "소통력": 65, "협력성": 55, "실행력": 75, "안정성": 60}
+
+
+class Clock:
+    """llm 모듈이 보는 time.time()을 대신하는 시계"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryCacheBackend(max_entries=3)
+    else:
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_entries=3, evict_every=1)
+        yield backend
+        backend.close()
+
+
+def test_make_key_normalizes_whitespace():
+    key = ResponseCache.make_key("m", [{"role": "user", "content": "a  b\n c"}], temperature=0.7)
+
+    assert key == ResponseCache.make_key("m", [{"role": "user", "content": "a b c"}], temperature=0.7)
+    assert key != ResponseCache.make_key("m", [{"role": "user", "content": "a b c"}], temperature=0.2)
+
+
+def test_ttl_expiry(clock, backend):
+    cache = ResponseCache(backend, ttl=60)
+    cache.set("k", "v")
+
+    clock.now += 59
+    assert cache.get("k") == "v"
+
+    clock.now += 1
+    assert cache.get("k") is None
+    assert len(backend) == 0
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 0}
+
+
+def test_no_ttl_never_expires(clock, backend):
+    cache = ResponseCache(backend)
+    cache.set("k", "v")
+
+    clock.now += 10 ** 9
+    assert cache.get("k") == "v"
+
+
+def test_lru_eviction(clock, backend):
+    cache = ResponseCache(backend)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.set(key, key.upper())
+
+    # a를 사용하면 가장 오래 사용하지 않은 항목은 b
+    clock.now += 1
+    assert cache.get("a") == "A"
+    clock.now += 1
+    cache.set("d", "D")
+
+    assert len(backend) == 3
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["A", "C", "D"]
+
+
+def test_sqlite_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteCacheBackend(path)
+    ResponseCache(backend).set("k", "저장된 응답")
+    backend.close()
+
+    reopened = SQLiteCacheBackend(path)
+    assert ResponseCache(reopened).get("k") == "저장된 응답"
+    reopened.close()
+
+
+def test_sqlite_get_does_not_commit(clock, tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteCacheBackend(path)
+    backend.set("k", "v", None)
+    changes = backend._conn.total_changes
+
+    clock.now += 10
+    assert backend.get("k") == ("v", None)
+    assert backend._conn.total_changes == changes
+    assert not backend._conn.in_transaction
+
+    # 사용 시각은 다음 저장 때 함께 기록
+    backend.set("other", "v", None)
+    with sqlite3.connect(path) as conn:
+        accessed_at = conn.execute("SELECT accessed_at FROM responses WHERE key = 'k'").fetchone()[0]
+    assert accessed_at == clock.now
+    backend.close()
+
+
+def test_sqlite_evicts_in_batches(clock, tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), max_entries=5, evict_every=4)
+    for i in range(7):
+        clock.now += 1
+        backend.set(f"k{i}", "v", None)
+
+    # 4번째 저장에서 한 번 정리한 뒤에는 다음 정리 전까지 max_entries를 넘을 수 있음
+    assert len(backend) == 7
+    clock.now += 1
+    backend.set("k7", "v", None)
+    assert len(backend) == 5
+    assert backend.get("k2") is None and backend.get("k3") is not None
+
+    clock.now += 1
+    backend.set("k8", "v", None)
+    backend.evict()
+    assert len(backend) == 5
+    # 위에서 k3를 조회했으므로 가장 오래 사용하지 않은 항목은 k4
+    assert backend.get("k4") is None and backend.get("k3") is not None
+    backend.close()
+
+
+def test_matcher_uses_response_cache():
+    client = FakeOpenAIClient(reply=lambda kwargs: f"응답 {len(kwargs['messages'])}")
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None)
+
+    first = matcher.generate_department_analysis(PROFILE, "개발팀", 81.5, "INTJ")
+    second = matcher.generate_department_analysis(PROFILE, "개발팀", 81.5, "INTJ")
+
+    assert first == second == "응답 2"
+    assert len(client.calls) == 1
+    assert matcher.response_cache.stats()['hits'] == 1
+
+
+def test_matcher_uses_response_cache_async():
+    client = FakeAsyncOpenAIClient(reply="비동기 응답")
+    matcher = DepartmentMatcher("test-key", async_client=client, requests_per_second=None)
+
+    async def run():
+        return [await matcher.agenerate_department_analysis(PROFILE, "기획팀", 70.0, "ENFP") for _ in range(2)]
+
+    assert asyncio.run(run()) == ["비동기 응답", "비동기 응답"]
+    assert len(client.calls) == 1
@@ -0,0 +1,90 @@
+"""
+Prometheus 지표(metrics)와 /metrics 엔드포인트 테스트
+"""
+import re
+import urllib.request
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import llm
+from analysis import DepartmentMatcher
+from behavior import read_behavior_files
+from llm import TemplateBackend
+from metrics import GPT_REQUESTS, GPT_RETRIES, GPT_TOKENS, start_metrics_server
+from tests.fakes import FakeOpenAIClient
+from visualization import create_visualization
+
+STAGES = ("ingest", "behavior", "requirements", "scoring", "gpt", "rendering")
+
+
+class MeteredClient(FakeOpenAIClient):
+    """토큰 사용량을 돌려주고, 요청마다 HTTP 요청 훅을 두 번 호출하는 클라이언트 (재시도 1회 흉내)"""
+
+    def _create(self, **kwargs: Any) -> SimpleNamespace:
+        llm._count_http_attempt(None)
+        llm._count_http_attempt(None)
+        response = super()._create(**kwargs)
+        response.usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30, total_tokens=150)
+        return response
+
+
+@pytest.fixture
+def metrics_server():
+    server = start_metrics_server(0, host="127.0.0.1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def scrape(server) -> str:
+    host, port = server.server_address[:2]
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+        assert response.status == 200
+        return response.read().decode('utf-8')
+
+
+def sample_value(text: str, name: str, **labels: str) -> float:
+    """노출 형식 텍스트에서 라벨이 일치하는 표본 값"""
+    label_text = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    series = f"{name}{{{label_text}}}" if labels else name
+    match = re.search(rf'^{re.escape(series)} (\S+)$', text, re.MULTILINE)
+    assert match, f"{series} 표본이 없습니다"
+    return float(match.group(1))
+
+
+def test_scrape_shows_stage_histograms(metrics_server, org_chart, tmp_path):
+    path = tmp_path / "behavior.csv"
+    path.write_text("관심사,사용시간\ntech,7.5\nsocial,2.3\nnews,1.8\n", encoding="utf-8")
+    accumulator, _ = read_behavior_files([str(path)])
+
+    matcher = DepartmentMatcher("", backend=TemplateBackend())
+    results = matcher.analyze_matching(org_chart, accumulator, "INTJ")
+    create_visualization(results, inline_plotly=False)
+
+    text = scrape(metrics_server)
+    for stage in STAGES:
+        assert re.search(rf'^department_matching_stage_seconds_bucket\{{stage="{stage}",le="\+Inf"\}} [1-9]',
+                         text, re.MULTILINE), stage
+        assert sample_value(text, "department_matching_stage_seconds_count", stage=stage) >= 1
+
+
+def test_scrape_shows_gpt_counters(metrics_server, org_chart, behavior_log):
+    before = scrape(metrics_server)
+    ok_before = GPT_REQUESTS.value(outcome='ok')
+    prompt_before = GPT_TOKENS.value(kind='prompt')
+    completion_before = GPT_TOKENS.value(kind='completion')
+    retries_before = GPT_RETRIES.value()
+
+    client = MeteredClient()
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_top_k=2)
+    matcher.analyze_matching(org_chart, behavior_log, "INTJ")
+    assert len(client.calls) == 2
+
+    text = scrape(metrics_server)
+    assert sample_value(text, "department_matching_gpt_requests_total", outcome="ok") == ok_before + 2
+    assert sample_value(text, "department_matching_gpt_tokens_total", kind="prompt") == prompt_before + 240
+    assert sample_value(text, "department_matching_gpt_tokens_total", kind="completion") == completion_before + 60
+    assert sample_value(text, "department_matching_gpt_retries_total") == retries_before + 2
+    assert "# TYPE department_matching_gpt_requests_total counter" in before
@@ -0,0 +1,128 @@
+"""
+적합도순 부서 목록(ranking.RankedDepartments)과 전체 부서 순위 표(ranking.RankingTable) 테스트
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from analysis import DepartmentMatcher
+from llm import TemplateBackend
+from ranking import SORT_KEYS, RankedDepartments, RankingTable
+from scoring import TRAITS
+
+
+def make_departments(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    scores = np.sort(rng.uniform(40, 95, count).round(1))[::-1]
+    return [
+        {'name': f"부서{i:04d}", 'main_dept': f"본부{i % 7}", 'sub_dept': "", 'score': float(score), 'reason': None,
+         'requirements': {trait: float(value) for trait, value in zip(TRAITS, rng.integers(40, 100, len(TRAITS)))}}
+        for i, score in enumerate(scores)
+    ]
+
+
+def make_ranked(scores, top_k: int = 3) -> RankedDepartments:
+    count = len(scores)
+    names = np.array([f"부서{i}" for i in range(count)], dtype=object)
+    requirements = np.full((count, len(TRAITS)), 60.0)
+    requirements[::2, 0] = np.nan
+    return RankedDepartments(names, names.copy(), np.full(count, "", dtype=object), np.asarray(scores, dtype=float),
+                             requirements, top_k=top_k)
+
+
+def test_ranked_departments_builds_items_lazily():
+    ranked = make_ranked(np.random.default_rng(0).uniform(0, 100, 50), top_k=3)
+
+    assert sorted(ranked._items) == [0, 1, 2]
+    assert ranked._order is None
+
+    item = ranked[10]
+    assert sorted(ranked._items) == [0, 1, 2, 10]
+    assert ranked[10] is item and ranked[-40] is item
+    assert item['score'] == ranked.scores[ranked.order()[10]]
+    assert 'requirements' in item and ("분석력" in item['requirements']) == (ranked.order()[10] % 2 == 1)
+    with pytest.raises(IndexError):
+        ranked[50]
+
+
+@pytest.mark.parametrize("scores", [
+    np.random.default_rng(1).uniform(0, 100, 40),
+    np.random.default_rng(2).integers(0, 5, 40).astype(float),
+    np.full(12, 70.0),
+])
+@pytest.mark.parametrize("top_k", [0, 3, 100])
+def test_ranked_departments_order_matches_stable_argsort(scores, top_k):
+    ranked = make_ranked(scores, top_k=top_k)
+    expected = np.argsort(-scores, kind='stable')
+
+    np.testing.assert_array_equal(ranked.order(), expected)
+    assert [item['name'] for item in ranked] == [f"부서{row}" for row in expected]
+    np.testing.assert_array_equal(ranked.columns()['score'], scores[expected])
+
+
+def test_filled_reasons_persist_on_cached_items(org_chart, behavior_log):
+    matcher = DepartmentMatcher("", backend=TemplateBackend(), reason_top_k=1)
+    results = matcher.analyze_matching(org_chart, behavior_log, "INTJ")
+    ranked = results['all_departments']
+
+    assert ranked[0]['reason'] and ranked[1]['reason'] is None
+    matcher.fill_department_reasons(results, ranked[1:3])
+    assert ranked[1]['reason'] and ranked[2]['reason']
+    assert results['top_departments'][1] is ranked[1]
+
+    matcher.fill_department_reasons(results)
+    reasons = [dept['reason'] for dept in ranked]
+    assert all(reasons)
+    assert ranked.columns()['reason'].tolist() == reasons
+    assert RankingTable.from_results(results).reasons.tolist() == reasons
+
+
+def test_order_sorts_and_filters():
+    table = RankingTable(make_departments(50))
+
+    np.testing.assert_array_equal(table.order(), np.arange(50))
+    by_name = table.order('name', descending=True)
+    assert list(table.names[by_name]) == sorted(table.names, reverse=True)
+    assert list(table.names[table.order(query="부서001")]) == [f"부서001{i}" for i in range(10)]
+
+
+def test_descending_order_keeps_rank_order_on_ties():
+    departments = make_departments(60)
+    for i, dept in enumerate(departments):
+        dept['name'] = f"부서{i % 5}"
+    table = RankingTable(departments)
+    rows = np.arange(60)
+
+    for sort_by, values in [('name', table.names), ('main_dept', table.main_depts)]:
+        values = values.astype(str)
+        # 값은 내림차순, 같은 값끼리는 순위(행 번호) 오름차순
+        expected = sorted(rows, key=lambda row: (values[row], -row), reverse=True)
+        np.testing.assert_array_equal(table.order(sort_by, descending=True), expected)
+        np.testing.assert_array_equal(table.order(sort_by), sorted(rows, key=lambda row: (values[row], row)))
+
+    np.testing.assert_array_equal(table.order('rank', descending=True), rows[::-1])
+
+
+def test_order_cache_is_bounded():
+    table = RankingTable(make_departments(20), max_orders=3)
+    for sort_by in SORT_KEYS:
+        table.order(sort_by)
+
+    assert len(table._orders) == 3
+
+
+def test_order_is_safe_across_threads():
+    table = RankingTable(make_departments(500), max_orders=4)
+    reference = RankingTable(make_departments(500))
+    requests = [(sort_by, descending, query) for sort_by in SORT_KEYS for descending in (False, True)
+                for query in ("", "부서0", "1")]
+
+    def run(i: int) -> bool:
+        sort_by, descending, query = requests[i % len(requests)]
+        expected = reference.order(sort_by, descending, query)
+        return np.array_equal(table.order(sort_by, descending, query), expected)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(run, range(4000)))
+    assert len(table._orders) <= 4
@@ -0,0 +1,137 @@
+"""
+GPT 배치 사유 생성(DepartmentMatcher.generate_department_analyses 등) 테스트
+"""
+import asyncio
+import re
+import threading
+import time
+
+from analysis import DepartmentMatcher
+from tests.fakes import FakeAsyncOpenAIClient, FakeOpenAIClient
+
+PROFILE = {"분석력": 80, "독립성": 60, "계획성": 70, "창의성": 50, "소통력": 65, "협력성": 55, "실행력": 75, "안정성": 60}
+DEPARTMENTS = [{'name': f"부서{i:02d}", 'score': 90.0 - i} for i in range(12)]
+
+
+def department_of(kwargs) -> str:
+    return re.search(r"개인이 (\S+) 부서에", kwargs['messages'][-1]['content']).group(1)
+
+
+class SlowClient(FakeOpenAIClient):
+    """앞 부서일수록 늦게 응답하고, 동시에 처리 중인 요청 수의 최댓값을 기록하는 클라이언트"""
+
+    def __init__(self, failing=()):
+        super().__init__(reply=lambda kwargs: f"{department_of(kwargs)} 사유")
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _create(self, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            dept_name = department_of(kwargs)
+            time.sleep(0.002 * (len(DEPARTMENTS) - int(dept_name[2:])))
+            if dept_name in self.failing:
+                raise ConnectionError("연결 실패")
+            return super()._create(**kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_concurrent_reasons_keep_department_order():
+    client = SlowClient(failing={"부서03", "부서07"})
+    matcher = DepartmentMatcher("test-key", client=client, max_concurrency=6, requests_per_second=None)
+    progress = []
+
+    reasons = matcher.generate_department_analyses(PROFILE, DEPARTMENTS, "INTJ",
+                                                   progress_callback=lambda *args: progress.append(args))
+
+    expected = [f"{dept['name']} 사유" for dept in DEPARTMENTS]
+    for i in (3, 7):
+        expected[i] = (f"부서{i:02d} 부서의 업무 특성과 개인의 성향이 {90.0 - i:.1f}% 일치하여 "
+                       f"효과적인 업무 수행이 가능할 것으로 예상됩니다.")
+    assert reasons == expected
+    assert client.max_in_flight > 1
+    finished = [args for args in progress if args[3] is not None]
+    assert [args[1] for args in finished] == list(range(1, len(DEPARTMENTS) + 1))
+    assert sorted(args[3] for args in finished) == [dept['name'] for dept in DEPARTMENTS]
+
+
+def test_async_reasons_keep_department_order():
+    class SlowAsyncClient(FakeAsyncOpenAIClient):
+        async def _create_async(self, **kwargs):
+            await asyncio.sleep(0.002 * (len(DEPARTMENTS) - int(department_of(kwargs)[2:])))
+            return self._create(**kwargs)
+
+    client = SlowAsyncClient(reply=lambda kwargs: f"{department_of(kwargs)} 사유")
+    matcher = DepartmentMatcher("test-key", async_client=client, max_concurrency=4, requests_per_second=None)
+
+    reasons = asyncio.run(matcher.agenerate_department_analyses(PROFILE, DEPARTMENTS, "INTJ"))
+
+    assert reasons == [f"{dept['name']} 사유" for dept in DEPARTMENTS]
+    assert len(client.calls) == len(DEPARTMENTS)
+
+
+def test_rate_limiter_spaces_requests():
+    client = FakeOpenAIClient()
+    matcher = DepartmentMatcher("test-key", client=client, max_concurrency=4, requests_per_second=50.0, burst=2)
+
+    started = time.perf_counter()
+    matcher.generate_department_analyses(PROFILE, DEPARTMENTS[:7], "INTJ")
+
+    # 처음 2개는 버스트로 바로 보내고 나머지 5개는 초당 50개 속도로 보냄
+    assert time.perf_counter() - started >= 5 / 50 * 0.9
+    assert len(client.calls) == 7
+
+
+def requested_departments(client: FakeOpenAIClient):
+    return [department_of(call) for call in client.calls]
+
+
+def test_only_top_departments_request_reasons(org_chart, behavior_log):
+    client = FakeOpenAIClient(reply=lambda kwargs: f"{department_of(kwargs)} 사유")
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_top_k=3)
+
+    results = matcher.analyze_matching(org_chart, behavior_log, "INTJ")
+
+    ranked = results['all_departments']
+    assert len(ranked) == len(org_chart) > 3
+    assert sorted(requested_departments(client)) == sorted(dept['name'] for dept in ranked[:3])
+    assert [dept['reason'] for dept in ranked[:3]] == [f"{dept['name']} 사유" for dept in ranked[:3]]
+    assert all(dept['reason'] is None for dept in ranked[3:])
+
+    # 필요한 부서만 나중에 생성하고, 이미 사유가 있는 부서는 다시 요청하지 않음
+    matcher.fill_department_reasons(results, ranked[2:5])
+    assert len(client.calls) == 5
+    assert ranked[4]['reason'] == f"{ranked[4]['name']} 사유" and ranked[5]['reason'] is None
+
+    matcher.fill_department_reasons(results)
+    assert len(client.calls) == len(ranked)
+    assert sorted(requested_departments(client)) == sorted(dept['name'] for dept in ranked)
+    assert all(dept['reason'] == f"{dept['name']} 사유" for dept in ranked)
+
+
+def test_async_matching_requests_only_top_departments(org_chart, behavior_log):
+    client = FakeAsyncOpenAIClient(reply=lambda kwargs: f"{department_of(kwargs)} 사유")
+    matcher = DepartmentMatcher("test-key", async_client=client, requests_per_second=None, reason_top_k=2)
+
+    results = asyncio.run(matcher.analyze_matching_async(org_chart, behavior_log, "ENFP"))
+
+    ranked = results['all_departments']
+    assert sorted(requested_departments(client)) == sorted(dept['name'] for dept in ranked[:2])
+    assert [dept['reason'] for dept in results['top_departments']] == [f"{dept['name']} 사유" for dept in ranked[:2]]
+    assert all(dept['reason'] is None for dept in ranked[2:])
+
+
+def test_reason_top_k_zero_makes_no_requests(org_chart, behavior_log):
+    client = FakeOpenAIClient()
+    matcher = DepartmentMatcher("test-key", client=client, requests_per_second=None, reason_top_k=0)
+
+    results = matcher.analyze_matching(org_chart, behavior_log, "INTJ")
+
+    assert client.calls == []
+    assert all(dept['reason'] is None for dept in results['all_departments'])
@@ -0,0 +1,109 @@
+"""
+여러 지원자 보고서 ZIP 내보내기(report_export) 테스트
+"""
+import json
+import re
+import zipfile
+
+import pytest
+
+from report_export import ReportZipWriter, export_reports_zip, render_candidate_report, report_filename
+from visualization import plotly_asset_name
+
+REQUIREMENTS = {"분석력": 90, "독립성": 85, "계획성": 75, "창의성": 80,
+                "소통력": 60, "협력성": 70, "실행력": 85, "안정성": 70}
+PROFILE = {"분석력": 80, "독립성": 60, "계획성": 70, "창의성": 50, "소통력": 65, "협력성": 55, "실행력": 75, "안정성": 60}
+
+
+def make_results(mbti: str, top_name: str):
+    return {
+        'top_departments': [
+            {'name': top_name, 'score': 88.0, 'reason': "분석력이 뛰어납니다.", 'requirements': REQUIREMENTS},
+            {'name': "기획팀", 'score': 81.5, 'reason': None, 'requirements': REQUIREMENTS}
+        ],
+        # 작업자 프로세스로 보내지 않는 값 (피클할 수 없어 보내면 실패)
+        'all_departments': lambda: None,
+        'user_profile': PROFILE,
+        'mbti': mbti,
+        'file_info': ["log.csv (3행)"],
+        'total_data_points': 3
+    }
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "plotly.min.js"
+    path.write_text("/* 테스트용 plotly 번들 */", encoding="utf-8")
+    return str(path)
+
+
+def dashboard_data(index_html: str):
+    match = re.search(r'<script type="application/json" id="dashboard-data">(.*?)</script>', index_html, re.S)
+    return json.loads(match.group(1))
+
+
+def test_export_two_candidates(tmp_path, bundle):
+    path = str(tmp_path / "reports.zip")
+    items = iter([("lee", make_results("ENFP", "마케팅팀")), ("kim/01", make_results("INTJ", "개발팀</script>"))])
+
+    stats = export_reports_zip(items, path, workers=2, plotly_bundle_path=bundle, page_size=1)
+
+    assert stats == {'reports': 2, 'failed': 0, 'failures': []}
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == sorted([
+            "index.html", "reports/lee.html", "reports/kim_01.html",
+            "assets/report.css", "assets/charts.js", f"assets/{plotly_asset_name()}"
+        ])
+        assert archive.read(f"assets/{plotly_asset_name()}").decode() == "/* 테스트용 plotly 번들 */"
+        report = archive.read("reports/kim_01.html").decode()
+        index_html = archive.read("index.html").decode()
+
+    assert f'<script src="../assets/{plotly_asset_name()}"' in report
+    assert "cdn.plot.ly" not in report and "cdn.plot.ly" not in index_html
+    assert f'<script src="assets/{plotly_asset_name()}"' in index_html
+
+    # 대시보드 데이터는 지원자 ID 순서이고 개별 보고서로 연결
+    reports = dashboard_data(index_html)
+    assert [(item['candidate_id'], item['mbti'], item['report_url']) for item in reports] == [
+        ("kim/01", "INTJ", "reports/kim_01.html"), ("lee", "ENFP", "reports/lee.html")
+    ]
+    assert [dept['name'] for dept in reports[0]['departments']] == ["개발팀</script>", "기획팀"]
+    assert [dept['reason'] for dept in reports[0]['departments']] == ["분석력이 뛰어납니다.", ""]
+    assert "</script>" not in index_html.split('id="dashboard-data">', 1)[1].split("</script>", 1)[0]
+
+
+def test_export_without_plotly_bundle_uses_cdn(tmp_path):
+    path = str(tmp_path / "reports.zip")
+
+    export_reports_zip([("kim", make_results("INTJ", "개발팀"))], path, workers=1, include_plotly=False,
+                       dashboard=False)
+
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == ["assets/charts.js", "assets/report.css", "reports/kim.html"]
+        assert "cdn.plot.ly" in archive.read("reports/kim.html").decode()
+
+
+def test_duplicate_filenames_are_rejected(tmp_path, bundle):
+    assert report_filename("kim 01") == report_filename("kim/01") == "kim_01.html"
+    path = str(tmp_path / "reports.zip")
+
+    with ReportZipWriter(path, plotly_bundle_path=bundle) as writer:
+        writer.add(*render_candidate_report("kim 01", make_results("INTJ", "개발팀"), plotly_bundle_path=bundle))
+        with pytest.raises(ValueError, match="kim_01.html"):
+            writer.add(*render_candidate_report("kim/01", make_results("ENFP", "기획팀"), plotly_bundle_path=bundle))
+
+    assert writer.count == 1
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist().count("reports/kim_01.html") == 1
+        assert [item['candidate_id'] for item in dashboard_data(archive.read("index.html").decode())] == ["kim 01"]
+
+
+def test_export_reports_collision_as_failure(tmp_path, bundle):
+    path = str(tmp_path / "reports.zip")
+    items = [("kim 01", make_results("INTJ", "개발팀")), ("kim/01", make_results("ENFP", "기획팀")),
+             ("lee", make_results("ISTP", "재무팀"))]
+
+    stats = export_reports_zip(items, path, workers=1, plotly_bundle_path=bundle)
+
+    assert stats['reports'] == 2 and stats['failed'] == 1
+    assert stats['failures'][0][0] == "kim/01" and "kim_01.html" in stats['failures'][0][1]
@@ -0,0 +1,66 @@
+"""
+NumPy 적합도 엔진(scoring)이 DepartmentMatcher.calculate_department_compatibility와
+같은 점수를 내는지 확인하는 테스트
+"""
+import numpy as np
+import pytest
+
+from analysis import DepartmentMatcher
+from llm import TemplateBackend
+from scoring import TRAITS, compatibility_matrix, profiles_to_matrix, round_scores, top_k_indices
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return DepartmentMatcher("", backend=TemplateBackend())
+
+
+def random_profiles(rng: np.random.Generator, count: int, integer: bool):
+    if integer:
+        users = rng.integers(0, 101, (count, len(TRAITS))).astype(float)
+        depts = rng.integers(30, 101, (count, len(TRAITS))).astype(float)
+    else:
+        users = rng.uniform(0, 100, (count, len(TRAITS))).round(2)
+        depts = rng.uniform(30, 100, (count, len(TRAITS))).round(1)
+    # 일부 부서는 몇몇 성향을 요구하지 않음
+    depts[rng.random(depts.shape) < 0.2] = np.nan
+    user_profiles = [dict(zip(TRAITS, row.tolist())) for row in users]
+    dept_requirements = [{trait: value for trait, value in zip(TRAITS, row.tolist()) if not np.isnan(value)}
+                         for row in depts]
+    return user_profiles, dept_requirements
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_compatibility_matrix_matches_scalar(matcher, integer):
+    rng = np.random.default_rng(0)
+    user_profiles, dept_requirements = random_profiles(rng, 300, integer)
+
+    scores = compatibility_matrix(profiles_to_matrix(user_profiles), profiles_to_matrix(dept_requirements),
+                                  chunk_size=64)
+
+    expected = np.array([[matcher.calculate_department_compatibility(user, dept) for dept in dept_requirements]
+                         for user in user_profiles])
+    np.testing.assert_array_equal(scores, expected)
+
+
+def test_department_without_requirements_scores_50(matcher):
+    scores = compatibility_matrix(profiles_to_matrix([{trait: 70 for trait in TRAITS}]), profiles_to_matrix([{}]))
+
+    assert scores.tolist() == [[50.0]]
+    assert matcher.calculate_department_compatibility({trait: 70 for trait in TRAITS}, {}) == 50.0
+
+
+def test_round_scores_matches_python_round():
+    values = np.array([0.05, 0.15, 0.25, 0.35, 2.675, 12.25, 33.35, 49.95, 99.95, 100.0])
+    values = np.concatenate([values, np.random.default_rng(1).uniform(0, 100, 10000)])
+
+    assert round_scores(values).tolist() == [round(float(value), 1) for value in values]
+
+
+@pytest.mark.parametrize("k", [0, 1, 3, 10, 50])
+def test_top_k_indices_matches_stable_sort(k):
+    scores = np.random.default_rng(2).integers(0, 10, (20, 40)).astype(float)
+
+    expected = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+    np.testing.assert_array_equal(top_k_indices(scores, k), expected)
+    np.testing.assert_array_equal(top_k_indices(scores[0], k), expected[0])
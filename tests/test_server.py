@@ -0,0 +1,128 @@
+"""
+부서 매칭 HTTP API(server.MatchingService) 테스트
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from analysis import DepartmentMatcher
+from llm import TemplateBackend
+from server import MatchingService
+
+ORG_CHART = [{"부서명": "개발팀", "하위부서명": "백엔드"}, {"부서명": "마케팅팀", "하위부서명": ""},
+             {"부서명": "인사팀", "하위부서명": ""}]
+BEHAVIOR = [{"관심사": "tech", "사용시간": 4}, {"관심사": "social", "사용시간": 2}]
+
+
+async def call(app: MatchingService, method: str, path: str, body=None):
+    """ASGI 앱을 직접 호출하여 (상태 코드, JSON 본문) 반환"""
+    encoded = json.dumps(body or {}, ensure_ascii=False).encode('utf-8')
+    messages = [{'type': 'http.request', 'body': encoded, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path}, receive, send)
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+def batch_request(**extra):
+    return dict({'org_chart': ORG_CHART, 'candidates': [{'candidate_id': "kim", 'behavior': BEHAVIOR}]}, **extra)
+
+
+@pytest.fixture
+def matcher():
+    return DepartmentMatcher("", backend=TemplateBackend())
+
+
+def test_match_batch(matcher):
+    app = MatchingService(matcher)
+    status, body = asyncio.run(call(app, 'POST', '/v1/match/batch', batch_request(top_k=2)))
+
+    assert status == 200
+    assert [row['rank'] for row in body['results']] == [1, 2]
+
+
+@pytest.mark.parametrize("top_k", [True, False, -1, 1.5, "3"])
+def test_match_batch_rejects_invalid_top_k(matcher, top_k):
+    app = MatchingService(matcher)
+    status, body = asyncio.run(call(app, 'POST', '/v1/match/batch', batch_request(top_k=top_k)))
+
+    assert status == 400
+    assert 'top_k' in body['error']
+
+
+@pytest.mark.parametrize("org_chart", [[1, 2], ["개발팀"], [[1, 2], {"부서명": "개발팀"}]])
+def test_invalid_records_are_bad_requests(matcher, org_chart):
+    app = MatchingService(matcher)
+    status, body = asyncio.run(call(app, 'POST', '/v1/match', {'org_chart': org_chart, 'behavior': BEHAVIOR}))
+
+    assert status == 400
+    assert 'org_chart' in body['error']
+
+
+def test_timed_out_work_keeps_its_slot(matcher, monkeypatch):
+    release = threading.Event()
+    match_cohort = matcher.match_cohort
+
+    def slow_match_cohort(*args):
+        release.wait(5)
+        return match_cohort(*args)
+
+    monkeypatch.setattr(matcher, 'match_cohort', slow_match_cohort)
+    app = MatchingService(matcher, max_in_flight=1, request_timeout=0.05)
+
+    async def scenario():
+        timed_out = await call(app, 'POST', '/v1/match/batch', batch_request())
+        # 504로 응답했지만 스레드 작업은 아직 실행 중이므로 새 요청은 거절
+        health = await call(app, 'GET', '/health')
+        rejected = await call(app, 'POST', '/v1/match/batch', batch_request())
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while app.executor.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        accepted = await call(app, 'POST', '/v1/match/batch', batch_request())
+        return timed_out, health, rejected, accepted
+
+    timed_out, health, rejected, accepted = asyncio.run(scenario())
+
+    assert timed_out[0] == 504
+    assert health[1]['in_flight'] == 0 and health[1]['pending_work'] == 1
+    assert rejected[0] == 503
+    assert accepted[0] == 200
+    assert app.executor.pending == 0
+
+
+def test_match_runs_ranking_in_service_pool(matcher):
+    app = MatchingService(matcher)
+    status, body = asyncio.run(call(app, 'POST', '/v1/match', {'org_chart': ORG_CHART, 'behavior': BEHAVIOR,
+                                                                'mbti': "intj"}))
+
+    assert status == 200
+    assert body['mbti'] == "INTJ"
+    assert len(body['top_departments']) >= 2
+    assert app.executor.pending == 0
+
+
+def test_request_error_is_logged_as_error(matcher, monkeypatch, caplog):
+    def broken_match_cohort(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(matcher, 'match_cohort', broken_match_cohort)
+    app = MatchingService(matcher)
+
+    with caplog.at_level(logging.ERROR, logger="department_matching"):
+        status, body = asyncio.run(call(app, 'POST', '/v1/match/batch', batch_request()))
+
+    assert status == 500
+    assert any('request_error' in record.getMessage() and record.levelno == logging.ERROR
+               for record in caplog.records)
@@ -0,0 +1,80 @@
+"""
+JSON 줄 추적 로그(tracing.trace, span) 테스트
+"""
+import io
+import json
+import logging
+
+import pytest
+
+import tracing
+from metrics import STAGE_SECONDS
+from tracing import configure_tracing, span, trace
+
+
+@pytest.fixture
+def stream():
+    """테스트 동안 추적 설정을 바꾸고 끝나면 원래대로 되돌림"""
+    saved = (list(tracing.logger.handlers), tracing.logger.level, tracing.logger.propagate, tracing._threshold)
+    yield io.StringIO()
+    handlers, level, propagate, threshold = saved
+    for handler in list(tracing.logger.handlers):
+        tracing.logger.removeHandler(handler)
+    for handler in handlers:
+        tracing.logger.addHandler(handler)
+    tracing.logger.setLevel(level)
+    tracing.logger.propagate = propagate
+    tracing._threshold = threshold
+
+
+def records(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_only_events_at_or_above_threshold_are_written(stream):
+    configure_tracing("info", stream)
+
+    trace("debug_event", logging.DEBUG, value=1)
+    trace("info_event", logging.INFO, value=2, names=["개발팀"])
+    trace("error_event", logging.ERROR, error="실패")
+
+    lines = records(stream)
+    assert [(line['event'], line['level']) for line in lines] == [("info_event", "info"), ("error_event", "error")]
+    assert lines[0]['value'] == 2 and lines[0]['names'] == ["개발팀"]
+    assert "개발팀" in stream.getvalue()
+
+
+def test_callable_fields_are_not_evaluated_below_threshold(stream):
+    configure_tracing("warning", stream)
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return [1, 2, 3]
+
+    trace("ranking", departments=expensive)
+    assert calls == [] and stream.getvalue() == ""
+
+    trace("ranking", logging.WARNING, departments=expensive)
+    assert calls == [1]
+    assert records(stream)[0]['departments'] == [1, 2, 3]
+
+
+def test_span_records_histogram_but_writes_only_when_info_is_enabled(stream):
+    configure_tracing("warning", stream)
+    before = STAGE_SECONDS.count(stage="test_stage")
+
+    with span("test_stage", rows=lambda: pytest.fail("추적이 꺼져 있으면 필드를 만들지 않아야 합니다")):
+        pass
+    assert STAGE_SECONDS.count(stage="test_stage") == before + 1
+    assert stream.getvalue() == ""
+
+    configure_tracing("info", stream)
+    with pytest.raises(ValueError):
+        with span("test_stage", rows=lambda: 3):
+            raise ValueError("잘못된 값")
+
+    assert STAGE_SECONDS.count(stage="test_stage") == before + 2
+    (line,) = records(stream)
+    assert (line['event'], line['stage'], line['rows']) == ("span", "test_stage", 3)
+    assert line['duration_ms'] >= 0 and "잘못된 값" in line['error']
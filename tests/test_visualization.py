@@ -0,0 +1,109 @@
+"""
+HTML 보고서(visualization) 테스트
+"""
+import json
+
+import numpy as np
+import pytest
+
+import visualization
+from visualization import (PLOTLY_CDN_URL, create_visualization, generate_department_list_html, plotly_asset_name,
+                           plotly_version, report_payload, to_json)
+
+REQUIREMENTS = {"분석력": 90, "독립성": 85, "계획성": 75, "창의성": 80,
+                "소통력": 60, "협력성": 70, "실행력": 85, "안정성": 70}
+TOP_DEPARTMENTS = [
+    {'name': "개발팀", 'score': 88.0, 'reason': None, 'requirements': REQUIREMENTS},
+    {'name': "기획팀 <전략>", 'score': 81.5, 'reason': "분석력이 뛰어납니다.", 'requirements': REQUIREMENTS}
+]
+
+
+def test_department_list_without_reasons():
+    html_text = generate_department_list_html(TOP_DEPARTMENTS)
+
+    assert "None" not in html_text
+    assert '<div class="dept-reason"></div>' in html_text
+    assert "기획팀 &lt;전략&gt;" in html_text and "분석력이 뛰어납니다." in html_text
+
+RESULTS = {
+    'top_departments': TOP_DEPARTMENTS,
+    'user_profile': {"분석력": 80, "독립성": 60, "계획성": 70, "창의성": 50,
+                     "소통력": 65, "협력성": 55, "실행력": 75, "안정성": 60},
+    'mbti': "INTJ",
+    'file_info': ["kim.csv (1행)"],
+    'total_data_points': 1
+}
+
+
+def test_report_without_reasons():
+    html_text = create_visualization(RESULTS, inline_plotly=False)
+
+    assert '<div class="dept-reason">None</div>' not in html_text
+
+
+def test_report_payload_without_reasons():
+    results = {'top_departments': TOP_DEPARTMENTS, 'user_profile': REQUIREMENTS, 'mbti': "INTJ"}
+    payload = report_payload(results, "kim", "reports/kim.html")
+
+    assert [dept['reason'] for dept in payload['departments']] == ["", "분석력이 뛰어납니다."]
+
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_to_json_escapes_closing_tags(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(visualization, "orjson", None)
+    value = {'name': "</script><script>alert(1)</script>", 'scores': np.array([1.5, 2.0]), 'count': np.int64(3)}
+
+    encoded = to_json(value)
+
+    assert "</" not in encoded
+    assert json.loads(encoded) == {'name': value['name'], 'scores': [1.5, 2.0], 'count': 3}
+
+
+def test_department_name_cannot_close_chart_script():
+    departments = [dict(TOP_DEPARTMENTS[0], name="개발팀</script><script>alert(1)//")]
+
+    html_text = create_visualization(dict(RESULTS, top_departments=departments), inline_plotly=False)
+
+    assert "</script><script>alert(1)" not in html_text
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "plotly.min.js"
+    path.write_text("/* 테스트용 plotly 번들 */", encoding="utf-8")
+    return str(path)
+
+
+def test_plotly_from_cdn_by_default(monkeypatch):
+    monkeypatch.delenv("REPORT_INLINE_PLOTLY", raising=False)
+
+    html_text = create_visualization(RESULTS)
+
+    assert f'<script src="{PLOTLY_CDN_URL.format(version=plotly_version())}"' in html_text
+    assert "plotly-latest" not in html_text
+
+
+def test_inline_plotly_bundle(monkeypatch, bundle):
+    html_text = create_visualization(RESULTS, inline_plotly=True, plotly_bundle_path=bundle)
+
+    assert "<script>/* 테스트용 plotly 번들 */</script>" in html_text
+    assert "cdn.plot.ly" not in html_text
+
+    # 환경 변수로도 같은 보고서를 만듦
+    monkeypatch.setenv("REPORT_INLINE_PLOTLY", "true")
+    monkeypatch.setenv("PLOTLY_BUNDLE_PATH", bundle)
+    assert "<script>/* 테스트용 plotly 번들 */</script>" in create_visualization(RESULTS)
+
+
+def test_plotly_from_shared_assets(bundle):
+    local = create_visualization(RESULTS, inline_plotly=True, plotly_bundle_path=bundle, asset_base="../assets/")
+    remote = create_visualization(RESULTS, inline_plotly=False, asset_base="../assets")
+
+    assert f'<script src="../assets/{plotly_asset_name()}"' in local
+    assert "테스트용 plotly 번들" not in local and "cdn.plot.ly" not in local
+    assert PLOTLY_CDN_URL.format(version=plotly_version()) in remote
+    for html_text in (local, remote):
+        assert '<link rel="stylesheet" href="../assets/report.css">' in html_text
+        assert '<script src="../assets/charts.js"' in html_text
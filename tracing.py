@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Optional, TextIO
+
+from metrics import STAGE_SECONDS
+
+# 추적 로그는 한 줄에 하나의 JSON 객체로 기록
+logger = logging.getLogger("department_matching")
+
+# 이 수준 미만의 추적 이벤트는 호출 즉시 반환 (기본값: 경고 이상만 기록)
+_threshold = logging.WARNING
+
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR
+}
+
+
+def configure_tracing(level: Any = logging.DEBUG, stream: Optional[TextIO] = None) -> None:
+    """
+    추적 로그 활성화
+
+    Args:
+        level (Any): 기록할 최소 수준 (logging 상수 또는 'debug', 'info' 등)
+        stream (Optional[TextIO]): JSON 줄을 기록할 스트림 (기본값: 표준 오류)
+    """
+    global _threshold
+    if isinstance(level, str):
+        level = LEVELS.get(level.lower(), logging.DEBUG)
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    _threshold = level
+
+
+def is_enabled(level: int = logging.DEBUG) -> bool:
+    """해당 수준의 추적 이벤트가 기록되는지 여부 (비용이 큰 필드를 만들기 전에 확인)"""
+    return level >= _threshold
+
+
+def trace(event: str, level: int = logging.DEBUG, **fields: Any) -> None:
+    """
+    추적 이벤트 기록
+
+    기록되지 않는 수준이면 아무 작업도 하지 않습니다.
+    필드 값으로 인자 없는 함수를 넘기면 실제로 기록할 때만 호출하여 값을 만듭니다.
+
+    Args:
+        event (str): 이벤트 이름
+        level (int): 로그 수준
+        **fields: 함께 기록할 값
+    """
+    if level < _threshold:
+        return
+    _emit(event, level, fields)
+
+
+def _emit(event: str, level: int, fields: dict) -> None:
+    record = {'ts': round(time.time(), 6), 'level': logging.getLevelName(level).lower(), 'event': event}
+    for key, value in fields.items():
+        record[key] = value() if callable(value) else value
+    logger.log(level, json.dumps(record, ensure_ascii=False, default=str))
+
+
+class _Span:
+    """
+    단계별 소요 시간을 측정하여 지표에 반영하고, 추적이 켜져 있으면 종료 시 기록하는 컨텍스트 매니저
+
+    추적이 꺼져 있어도 호출마다 새로 만들고 시간을 재어 STAGE_SECONDS에 반영합니다
+    (비용은 perf_counter 두 번과 히스토그램 갱신 한 번). JSON 직렬화와 기록만 생략합니다.
+    """
+
+    __slots__ = ('stage', 'fields', 'started')
+
+    def __init__(self, stage: str, fields: dict):
+        self.stage = stage
+        self.fields = fields
+        self.started = 0.0
+
+    def __enter__(self) -> '_Span':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self.started
+        STAGE_SECONDS.observe(duration, stage=self.stage)
+        if logging.INFO < _threshold:
+            return False
+
+        duration_ms = duration * 1000
+        fields = dict(self.fields, stage=self.stage, duration_ms=round(duration_ms, 3))
+        if exc_type is not None:
+            fields['error'] = repr(exc)
+        _emit('span', logging.INFO, fields)
+        return False
+
+
+def span(stage: str, **fields: Any) -> Any:
+    """
+    단계(ingest, behavior, requirements, scoring, gpt, rendering 등) 소요 시간 측정
+
+    소요 시간은 추적 수준과 관계없이 항상 metrics.STAGE_SECONDS 히스토그램에 반영되고,
+    INFO 이하 수준으로 추적이 켜져 있을 때만 JSON 줄로도 기록됩니다.
+    따라서 추적이 꺼져 있어도 아무 일도 하지 않는 객체가 아니므로 아주 짧은 반복문 안에서는 쓰지 않습니다.
+
+    사용 예:
+        with span("scoring", departments=len(departments)):
+            ...
+
+    Args:
+        stage (str): 단계 이름
+        **fields: 함께 기록할 값
+    """
+    return _Span(stage, fields)
+
+
+# DEPT_MATCHING_TRACE 환경 변수(debug, info 등)가 있으면 바로 활성화
+if os.environ.get("DEPT_MATCHING_TRACE"):
+    configure_tracing(os.environ["DEPT_MATCHING_TRACE"])
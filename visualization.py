@@ -1,167 +1,430 @@
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
+import html
+import json
+import os
+import re
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional
 
-def create_visualization(results: Dict[str, Any]) -> str:
+import numpy as np
+
+from tracing import span
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+# 인라인하지 않을 때 사용하는 plotly.js CDN 주소 (설치된 plotly 패키지에 포함된 버전으로 고정)
+PLOTLY_CDN_URL = "https://cdn.plot.ly/plotly-{version}.min.js"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON으로 직렬화할 수 없는 값입니다: {type(value).__name__}")
+
+
+def to_json(value: Any) -> str:
     """
-    분석 결과를 HTML로 시각화
-    
+    차트 데이터를 <script> 안에 넣을 수 있는 JSON 문자열로 변환
+
+    orjson이 설치되어 있으면 사용하고, "</"는 "<\\/"로 바꾸어 스크립트 태그가 닫히지 않게 합니다.
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    else:
+        encoded = json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+    return encoded.replace('</', '<\\/')
+
+
+def reason_text(reason: Any) -> str:
+    """배치 사유 표시 문자열 (API 키 없이 분석해 사유가 없으면(None) 빈 문자열)"""
+    return "" if reason is None else str(reason)
+
+
+@lru_cache(maxsize=4)
+def get_plotly_bundle(path: Optional[str] = None) -> str:
+    """
+    인라인할 plotly.js 번들 (프로세스에서 한 번만 읽어 메모리에 보관)
+
     Args:
-        results (Dict[str, Any]): 분석 결과 데이터
-        
+        path (Optional[str]): 축소된 plotly.js 파일 경로 (없으면 설치된 plotly 패키지에 포함된 번들)
+
     Returns:
-        str: HTML 콘텐츠
+        str: plotly.js 소스
     """
-    
-    # 1. 막대 차트 생성 (부서별 적합도)
-    bar_chart = create_compatibility_bar_chart(results['top_departments'])
-    
-    # 2. 레이더 차트 생성 (개인 성향 프로필)
-    radar_chart = create_personal_profile_radar(results['user_profile'])
-    
-    # 3. 히트맵 생성 (부서별 요구사항 비교)
-    heatmap_chart = create_department_requirements_heatmap(results['top_departments'])
-    
-    # HTML 템플릿 생성
-    html_content = f"""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    from plotly.offline import get_plotlyjs
+    return get_plotlyjs()
+
+
+@lru_cache(maxsize=1)
+def plotly_version() -> str:
+    """설치된 plotly 패키지에 포함된 plotly.js 버전"""
+    from plotly.offline import get_plotlyjs_version
+    return get_plotlyjs_version()
+
+
+def plotly_script_tag(inline: bool = False, bundle_path: Optional[str] = None) -> str:
+    """
+    plotly.js를 불러오는 <script> 태그
+
+    Args:
+        inline (bool): 번들을 HTML에 직접 넣을지 여부 (네트워크 없이 열림)
+        bundle_path (Optional[str]): 인라인할 번들 파일 경로
+
+    Returns:
+        str: <script> 태그
+    """
+    if inline:
+        return f"<script>{get_plotly_bundle(bundle_path)}</script>"
+    return f'<script src="{PLOTLY_CDN_URL.format(version=plotly_version())}" charset="utf-8"></script>'
+
+
+def _inline_plotly_default() -> bool:
+    """REPORT_INLINE_PLOTLY 환경 변수로 인라인 여부 기본값 결정"""
+    return os.environ.get("REPORT_INLINE_PLOTLY", "").lower() in ("1", "true", "yes")
+
+
+class CompiledTemplate:
+    """
+    $name 자리표시자를 가진 HTML/JS 템플릿
+
+    모듈을 불러올 때 한 번만 고정 문자열 조각과 자리표시자로 나누어 두므로,
+    렌더링할 때는 구문 분석 없이 조각을 이어 붙이기만 합니다.
+    """
+
+    _PLACEHOLDER = re.compile(r'\$([A-Za-z_][A-Za-z0-9_]*)')
+
+    def __init__(self, source: str):
+        pieces = self._PLACEHOLDER.split(source)
+        self._parts = pieces[:]
+        # 홀수 위치가 자리표시자 (값으로 바꿀 위치, 이름)
+        self._slots = tuple((index, pieces[index]) for index in range(1, len(pieces), 2))
+        self.fields = tuple(dict.fromkeys(name for _, name in self._slots))
+
+    def render(self, **values: Any) -> str:
+        parts = self._parts[:]
+        for index, name in self._slots:
+            parts[index] = str(values[name])
+        return "".join(parts)
+
+
+# 보고서 스타일 (개별 보고서와 대시보드가 함께 사용)
+REPORT_CSS = """\
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0;
+    padding: 20px;
+    background-color: #ffffff;
+    color: #2c2c2c;
+    font-size: 13px;
+    line-height: 1.6;
+}
+
+.header {
+    text-align: center;
+    background: linear-gradient(135deg, #f8f9fa, #e9ecef);
+    padding: 30px;
+    border-radius: 15px;
+    border: 1px solid #dee2e6;
+    margin-bottom: 30px;
+}
+
+.header h1 {
+    color: #2c2c2c;
+    margin: 0;
+    font-size: 28px;
+    font-weight: 600;
+}
+
+.header .date {
+    color: #6c757d;
+    font-size: 12px;
+    margin-top: 10px;
+}
+
+.section {
+    background-color: #ffffff;
+    margin: 20px 0;
+    padding: 25px;
+    border-radius: 12px;
+    border: 1px solid #c0c0c0;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+}
+
+.section h2 {
+    color: #2c2c2c;
+    font-size: 18px;
+    font-weight: 600;
+    margin-bottom: 20px;
+    border-bottom: 2px solid #8e44ad;
+    padding-bottom: 8px;
+}
+
+.dept-card {
+    background-color: #f8f9fa;
+    margin: 15px 0;
+    padding: 15px;
+    border-radius: 8px;
+    border-left: 4px solid #8e44ad;
+}
+
+.dept-name {
+    font-size: 16px;
+    font-weight: 600;
+    color: #2c2c2c;
+    margin-bottom: 5px;
+}
+
+.dept-score {
+    font-size: 14px;
+    color: #8e44ad;
+    font-weight: 500;
+    margin-bottom: 8px;
+}
+
+.dept-reason {
+    font-size: 12px;
+    color: #4a4a4a;
+    line-height: 1.5;
+}
+
+.chart-container {
+    margin: 20px 0;
+    text-align: center;
+}
+
+.summary {
+    background: linear-gradient(135deg, #f8f9fa, #e9ecef);
+    padding: 20px;
+    border-radius: 10px;
+    border: 1px solid #dee2e6;
+    margin-top: 30px;
+}
+
+.summary h3 {
+    color: #2c2c2c;
+    font-size: 16px;
+    margin-bottom: 15px;
+}
+
+.profile-item {
+    display: inline-block;
+    margin: 5px 10px;
+    padding: 5px 10px;
+    background-color: #ffffff;
+    border-radius: 15px;
+    border: 1px solid #c0c0c0;
+    font-size: 11px;
+    color: #4a4a4a;
+}
+
+@media print {
+    body { 
+        font-size: 11px; 
+    }
+    .section { 
+        break-inside: avoid; 
+    }
+}
+
+.toolbar {
+    display: flex;
+    flex-wrap: wrap;
+    align-items: center;
+    gap: 10px;
+    margin-bottom: 20px;
+}
+
+.toolbar input, .toolbar select, .toolbar button {
+    font-size: 13px;
+    padding: 5px 10px;
+    border: 1px solid #c0c0c0;
+    border-radius: 6px;
+    background-color: #ffffff;
+}
+
+.toolbar button:disabled {
+    color: #c0c0c0;
+}
+
+.candidate-link {
+    font-size: 12px;
+    margin-left: 10px;
+}
+
+.chart-row {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 10px;
+}
+
+.chart-row .chart-container {
+    flex: 1 1 420px;
+    min-height: 400px;
+}
+"""
+
+# 차트 스크립트 (데이터만 넘겨 그리므로 보고서마다 차트 설정을 반복하지 않음)
+CHART_SCRIPT = """\
+// 부서 매칭 보고서 차트 (개별 보고서와 대시보드가 함께 사용)
+var TITLE_FONT = { size: 16, color: '#2c2c2c' };
+var LABEL_FONT = { size: 12, color: '#4a4a4a' };
+var TICK_FONT = { size: 10, color: '#4a4a4a' };
+
+function formatNumber(value, digits) {
+    return value == null ? '' : value.toFixed(digits);
+}
+
+function drawBarChart(elementId, data) {
+    var barData = [{
+        x: data.names,
+        y: data.scores,
+        type: 'bar',
+        marker: {
+            color: ['#8e44ad', '#9b59b6', '#af7ac5', '#c39bd3', '#d7bde2'],
+            line: {
+                color: '#6c5077',
+                width: 1
+            }
+        },
+        text: data.scores.map(function (score) { return formatNumber(score, 1) + '%'; }),
+        textposition: 'auto',
+        textfont: {
+            size: 11,
+            color: 'white'
+        }
+    }];
+
+    var barLayout = {
+        title: { text: '부서별 적합도 점수', font: TITLE_FONT },
+        xaxis: {
+            title: { text: '부서', font: LABEL_FONT },
+            tickfont: TICK_FONT
+        },
+        yaxis: {
+            title: { text: '적합도 (%)', font: LABEL_FONT },
+            tickfont: TICK_FONT,
+            range: [0, 100]
+        },
+        plot_bgcolor: '#ffffff',
+        paper_bgcolor: '#ffffff',
+        margin: { l: 60, r: 30, t: 60, b: 80 },
+        height: 400
+    };
+
+    return Plotly.newPlot(elementId, barData, barLayout, {responsive: true});
+}
+
+function drawRadarChart(elementId, data) {
+    var radarData = [{
+        type: 'scatterpolar',
+        r: data.values,
+        theta: data.traits,
+        fill: 'toself',
+        fillcolor: 'rgba(142, 68, 173, 0.3)',
+        line: {
+            color: '#8e44ad',
+            width: 2
+        },
+        marker: {
+            color: '#8e44ad',
+            size: 6
+        },
+        name: '개인 성향'
+    }];
+
+    var radarLayout = {
+        title: { text: '개인 성향 프로필', font: TITLE_FONT },
+        polar: {
+            radialaxis: {
+                visible: true,
+                range: [0, 100],
+                tickfont: TICK_FONT,
+                gridcolor: '#dee2e6'
+            },
+            angularaxis: {
+                tickfont: { size: 11, color: '#2c2c2c' }
+            }
+        },
+        plot_bgcolor: '#ffffff',
+        paper_bgcolor: '#ffffff',
+        margin: { l: 80, r: 80, t: 60, b: 60 },
+        height: 450
+    };
+
+    return Plotly.newPlot(elementId, radarData, radarLayout, {responsive: true});
+}
+
+function drawHeatmapChart(elementId, data) {
+    var heatmapData = [{
+        z: data.z,
+        x: data.traits,
+        y: data.dept_names,
+        type: 'heatmap',
+        colorscale: [
+            [0, '#ffffff'],
+            [0.5, '#c39bd3'],
+            [1, '#8e44ad']
+        ],
+        showscale: true,
+        colorbar: {
+            title: { text: '요구 수준', font: { size: 11, color: '#4a4a4a' } },
+            tickfont: TICK_FONT
+        },
+        text: data.z.map(function (row) {
+            return row.map(function (value) { return formatNumber(value, 0); });
+        }),
+        texttemplate: '%{text}',
+        textfont: { size: 10, color: '#2c2c2c' }
+    }];
+
+    var heatmapLayout = {
+        title: { text: '부서별 성향 요구사항', font: TITLE_FONT },
+        xaxis: {
+            title: { text: '성향 요소', font: LABEL_FONT },
+            tickfont: TICK_FONT,
+            tickangle: -45
+        },
+        yaxis: {
+            title: { text: '부서', font: LABEL_FONT },
+            tickfont: TICK_FONT
+        },
+        plot_bgcolor: '#ffffff',
+        paper_bgcolor: '#ffffff',
+        margin: { l: 100, r: 60, t: 60, b: 100 },
+        height: 400
+    };
+
+    return Plotly.newPlot(elementId, heatmapData, heatmapLayout, {responsive: true});
+}
+"""
+
+# 보고서 HTML 템플릿 (모듈을 불러올 때 한 번만 컴파일)
+REPORT_TEMPLATE = CompiledTemplate("""
     <!DOCTYPE html>
     <html lang="ko">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>부서 매칭 분석 결과</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #ffffff;
-                color: #2c2c2c;
-                font-size: 13px;
-                line-height: 1.6;
-            }}
-            
-            .header {{
-                text-align: center;
-                background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-                padding: 30px;
-                border-radius: 15px;
-                border: 1px solid #dee2e6;
-                margin-bottom: 30px;
-            }}
-            
-            .header h1 {{
-                color: #2c2c2c;
-                margin: 0;
-                font-size: 28px;
-                font-weight: 600;
-            }}
-            
-            .header .date {{
-                color: #6c757d;
-                font-size: 12px;
-                margin-top: 10px;
-            }}
-            
-            .section {{
-                background-color: #ffffff;
-                margin: 20px 0;
-                padding: 25px;
-                border-radius: 12px;
-                border: 1px solid #c0c0c0;
-                box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            }}
-            
-            .section h2 {{
-                color: #2c2c2c;
-                font-size: 18px;
-                font-weight: 600;
-                margin-bottom: 20px;
-                border-bottom: 2px solid #8e44ad;
-                padding-bottom: 8px;
-            }}
-            
-            .dept-card {{
-                background-color: #f8f9fa;
-                margin: 15px 0;
-                padding: 15px;
-                border-radius: 8px;
-                border-left: 4px solid #8e44ad;
-            }}
-            
-            .dept-name {{
-                font-size: 16px;
-                font-weight: 600;
-                color: #2c2c2c;
-                margin-bottom: 5px;
-            }}
-            
-            .dept-score {{
-                font-size: 14px;
-                color: #8e44ad;
-                font-weight: 500;
-                margin-bottom: 8px;
-            }}
-            
-            .dept-reason {{
-                font-size: 12px;
-                color: #4a4a4a;
-                line-height: 1.5;
-            }}
-            
-            .chart-container {{
-                margin: 20px 0;
-                text-align: center;
-            }}
-            
-            .summary {{
-                background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-                padding: 20px;
-                border-radius: 10px;
-                border: 1px solid #dee2e6;
-                margin-top: 30px;
-            }}
-            
-            .summary h3 {{
-                color: #2c2c2c;
-                font-size: 16px;
-                margin-bottom: 15px;
-            }}
-            
-            .profile-item {{
-                display: inline-block;
-                margin: 5px 10px;
-                padding: 5px 10px;
-                background-color: #ffffff;
-                border-radius: 15px;
-                border: 1px solid #c0c0c0;
-                font-size: 11px;
-                color: #4a4a4a;
-            }}
-            
-            @media print {{
-                body {{ 
-                    font-size: 11px; 
-                }}
-                .section {{ 
-                    break-inside: avoid; 
-                }}
-            }}
-        </style>
+        $head_assets
     </head>
     <body>
         <div class="header">
             <h1>부서 매칭 분석 결과</h1>
-            <div class="date">생성일: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}</div>
+            <div class="date">생성일: $generated_at</div>
         </div>
         
         <div class="section">
             <h2>추천 부서 Top 5</h2>
-            {generate_department_list_html(results['top_departments'])}
+            $department_list
         </div>
         
         <div class="section">
@@ -188,215 +451,419 @@ def create_visualization(results: Dict[str, Any]) -> str:
         <div class="summary">
             <h3>분석 요약</h3>
             <div>
-                <strong>MBTI:</strong> {results.get('mbti', '알 수 없음')}
+                <strong>MBTI:</strong> $mbti
             </div>
             <div style="margin-top: 10px;">
                 <strong>개인 성향:</strong><br>
-                {generate_profile_summary_html(results['user_profile'])}
+                $profile_summary
             </div>
         </div>
         
         <script>
-            {bar_chart}
-            {radar_chart}
-            {heatmap_chart}
+            $bar_chart
+            $radar_chart
+            $heatmap_chart
         </script>
     </body>
     </html>
+    """)
+
+# 여러 지원자 대시보드 HTML 템플릿
+DASHBOARD_TEMPLATE = CompiledTemplate("""
+    <!DOCTYPE html>
+    <html lang="ko">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>$title</title>
+        $head_assets
+    </head>
+    <body>
+        <div class="header">
+            <h1>$title</h1>
+            <div class="date">생성일: $generated_at · 지원자 $count명</div>
+        </div>
+        
+        <div class="toolbar">
+            <input id="search" type="search" placeholder="지원자 ID 또는 부서명 검색">
+            <button id="prev-page" type="button">이전</button>
+            <span id="page-info"></span>
+            <button id="next-page" type="button">다음</button>
+            <select id="page-size">$page_size_options</select>
+        </div>
+        
+        <div id="candidates"></div>
+        
+        <script type="application/json" id="dashboard-data">$reports</script>
+        <script>
+        (function () {
+            var reports = JSON.parse(document.getElementById('dashboard-data').textContent);
+            var container = document.getElementById('candidates');
+            var search = document.getElementById('search');
+            var pageSizeSelect = document.getElementById('page-size');
+            var pageInfo = document.getElementById('page-info');
+            var prevButton = document.getElementById('prev-page');
+            var nextButton = document.getElementById('next-page');
+            var filtered = reports;
+            var page = 0;
+            
+            // 화면에 들어온 지원자의 차트만 그림 (IntersectionObserver가 없으면 바로 그림)
+            var observer = 'IntersectionObserver' in window ? new IntersectionObserver(function (entries) {
+                entries.forEach(function (entry) {
+                    if (entry.isIntersecting) {
+                        observer.unobserve(entry.target);
+                        drawCandidate(entry.target);
+                    }
+                });
+            }, { rootMargin: '300px 0px' }) : null;
+            
+            function element(tag, className, text) {
+                var node = document.createElement(tag);
+                if (className) node.className = className;
+                if (text !== undefined) node.textContent = text;
+                return node;
+            }
+            
+            function candidateSection(report, index) {
+                var section = element('div', 'section');
+                section.id = 'candidate-' + index;
+                section.dataset.index = index;
+                
+                var heading = element('h2', null, report.candidate_id + ' (MBTI: ' + report.mbti + ')');
+                if (report.report_url) {
+                    var link = element('a', 'candidate-link', '개별 보고서');
+                    link.href = report.report_url;
+                    heading.appendChild(link);
+                }
+                section.appendChild(heading);
+                
+                report.departments.forEach(function (dept, rank) {
+                    var card = element('div', 'dept-card');
+                    card.appendChild(element('div', 'dept-name', (rank + 1) + '. ' + dept.name));
+                    card.appendChild(element('div', 'dept-score', '적합도: ' + formatNumber(dept.score, 1) + '%'));
+                    card.appendChild(element('div', 'dept-reason', dept.reason));
+                    section.appendChild(card);
+                });
+                
+                var charts = element('div', 'chart-row');
+                ['bar', 'radar', 'heatmap'].forEach(function (kind) {
+                    var chart = element('div', 'chart-container');
+                    chart.id = section.id + '-' + kind;
+                    charts.appendChild(chart);
+                });
+                section.appendChild(charts);
+                return section;
+            }
+            
+            function drawCandidate(section) {
+                var report = filtered[Number(section.dataset.index)];
+                drawBarChart(section.id + '-bar', {
+                    names: report.departments.map(function (dept) { return dept.name; }),
+                    scores: report.departments.map(function (dept) { return dept.score; })
+                });
+                drawRadarChart(section.id + '-radar', report.radar);
+                if (report.heatmap) {
+                    drawHeatmapChart(section.id + '-heatmap', report.heatmap);
+                }
+            }
+            
+            function pageSize() {
+                return Number(pageSizeSelect.value);
+            }
+            
+            function pageCount() {
+                return Math.max(1, Math.ceil(filtered.length / pageSize()));
+            }
+            
+            function render() {
+                // 이전 페이지의 관찰 대상과 차트 해제
+                if (observer) observer.disconnect();
+                Array.prototype.forEach.call(container.querySelectorAll('.js-plotly-plot'), function (plot) {
+                    Plotly.purge(plot);
+                });
+                container.textContent = '';
+                
+                page = Math.max(0, Math.min(page, pageCount() - 1));
+                var start = page * pageSize();
+                var sections = filtered.slice(start, start + pageSize()).map(function (report, offset) {
+                    return candidateSection(report, start + offset);
+                });
+                var fragment = document.createDocumentFragment();
+                sections.forEach(function (section) { fragment.appendChild(section); });
+                container.appendChild(fragment);
+                sections.forEach(function (section) {
+                    if (observer) observer.observe(section); else drawCandidate(section);
+                });
+                
+                pageInfo.textContent = (page + 1) + ' / ' + pageCount() + ' 페이지 (지원자 ' + filtered.length + '명)';
+                prevButton.disabled = page === 0;
+                nextButton.disabled = page >= pageCount() - 1;
+            }
+            
+            search.addEventListener('input', function () {
+                var query = search.value.trim().toLowerCase();
+                filtered = !query ? reports : reports.filter(function (report) {
+                    return String(report.candidate_id).toLowerCase().indexOf(query) !== -1 ||
+                        report.departments.some(function (dept) {
+                            return dept.name.toLowerCase().indexOf(query) !== -1;
+                        });
+                });
+                page = 0;
+                render();
+            });
+            prevButton.addEventListener('click', function () { page -= 1; render(); window.scrollTo(0, 0); });
+            nextButton.addEventListener('click', function () { page += 1; render(); window.scrollTo(0, 0); });
+            pageSizeSelect.addEventListener('change', function () { page = 0; render(); });
+            
+            render();
+        })();
+        </script>
+    </body>
+    </html>
+    """)
+
+DEPARTMENT_CARD_TEMPLATE = CompiledTemplate("""
+        <div class="dept-card">
+            <div class="dept-name">$rank. $name</div>
+            <div class="dept-score">적합도: $score%</div>
+            <div class="dept-reason">$reason</div>
+        </div>
+        """)
+
+
+@lru_cache(maxsize=1)
+def plotly_asset_name() -> str:
+    """공유 자산 디렉터리에 둘 plotly.js 파일 이름 (버전 포함)"""
+    return f"plotly-{plotly_version()}.min.js"
+
+
+@lru_cache(maxsize=8)
+def report_head(asset_base: Optional[str] = None, inline_plotly: bool = False,
+                bundle_path: Optional[str] = None) -> str:
     """
-    
-    return html_content
+    보고서 <head>에 넣을 스타일과 스크립트 태그 (설정별로 한 번만 생성)
 
-def create_compatibility_bar_chart(top_departments: List[Dict]) -> str:
-    """부서별 적합도 막대 차트 생성"""
-    
-    names = [dept['name'] for dept in top_departments]
-    scores = [dept['score'] for dept in top_departments]
+    Args:
+        asset_base (Optional[str]): 공유 자산 디렉터리의 상대 경로
+            (없으면 스타일과 차트 스크립트를 HTML에 직접 포함)
+        inline_plotly (bool): plotly.js를 CDN 대신 로컬에서 불러올지 여부
+            (asset_base가 있으면 자산 디렉터리의 파일을 참조)
+        bundle_path (Optional[str]): 인라인할 plotly.js 파일 경로
+
+    Returns:
+        str: <head>에 넣을 태그
+    """
+    if asset_base is None:
+        return "\n".join([
+            plotly_script_tag(inline_plotly, bundle_path),
+            f"<style>\n{REPORT_CSS}</style>",
+            f"<script>\n{CHART_SCRIPT}</script>"
+        ])
+
+    base = asset_base.rstrip('/')
+    if inline_plotly:
+        plotly_tag = f'<script src="{base}/{plotly_asset_name()}" charset="utf-8"></script>'
+    else:
+        plotly_tag = plotly_script_tag(False)
+    return "\n".join([
+        plotly_tag,
+        f'<link rel="stylesheet" href="{base}/report.css">',
+        f'<script src="{base}/charts.js" charset="utf-8"></script>'
+    ])
+
+
+def report_assets(include_plotly: bool = True, bundle_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    asset_base 디렉터리에 둘 공유 자산
+
+    Args:
+        include_plotly (bool): plotly.js 번들 포함 여부
+        bundle_path (Optional[str]): 포함할 plotly.js 파일 경로
+
+    Returns:
+        Dict[str, str]: 파일 이름 → 내용
+    """
+    assets = {'report.css': REPORT_CSS, 'charts.js': CHART_SCRIPT}
+    if include_plotly:
+        assets[plotly_asset_name()] = get_plotly_bundle(bundle_path)
+    return assets
+
+
+def create_visualization(results: Dict[str, Any], inline_plotly: Optional[bool] = None,
+                         plotly_bundle_path: Optional[str] = None, asset_base: Optional[str] = None) -> str:
+    """
+    분석 결과를 HTML로 시각화
     
-    chart_js = f"""
-    var barData = [{{
-        x: {names},
-        y: {scores},
-        type: 'bar',
-        marker: {{
-            color: ['#8e44ad', '#9b59b6', '#af7ac5', '#c39bd3', '#d7bde2'],
-            line: {{
-                color: '#6c5077',
-                width: 1
-            }}
-        }},
-        text: {[f'{score:.1f}%' for score in scores]},
-        textposition: 'auto',
-        textfont: {{
-            size: 11,
-            color: 'white'
-        }}
-    }}];
+    Args:
+        results (Dict[str, Any]): 분석 결과 데이터
+        inline_plotly (Optional[bool]): plotly.js를 HTML에 넣어 네트워크 없이 열리게 할지 여부
+            (없으면 REPORT_INLINE_PLOTLY 환경 변수, 기본값은 버전 고정 CDN)
+        plotly_bundle_path (Optional[str]): 인라인할 plotly.js 파일 (없으면 PLOTLY_BUNDLE_PATH 환경 변수
+            또는 설치된 plotly 패키지의 번들)
+        asset_base (Optional[str]): 스타일, 차트 스크립트, plotly.js를 직접 포함하지 않고 참조할
+            공유 자산 디렉터리의 상대 경로 (report_assets로 만든 파일을 그곳에 둠)
+        
+    Returns:
+        str: HTML 콘텐츠
+    """
+    if inline_plotly is None:
+        inline_plotly = _inline_plotly_default()
+    if plotly_bundle_path is None:
+        plotly_bundle_path = os.environ.get("PLOTLY_BUNDLE_PATH")
     
-    var barLayout = {{
-        title: {{
-            text: '부서별 적합도 점수',
-            font: {{ size: 16, color: '#2c2c2c' }}
-        }},
-        xaxis: {{
-            title: '부서',
-            titlefont: {{ size: 12, color: '#4a4a4a' }},
-            tickfont: {{ size: 10, color: '#4a4a4a' }}
-        }},
-        yaxis: {{
-            title: '적합도 (%)',
-            titlefont: {{ size: 12, color: '#4a4a4a' }},
-            tickfont: {{ size: 10, color: '#4a4a4a' }},
-            range: [0, 100]
-        }},
-        plot_bgcolor: '#ffffff',
-        paper_bgcolor: '#ffffff',
-        margin: {{ l: 60, r: 30, t: 60, b: 80 }},
-        height: 400
-    }};
+    with span("rendering"):
+        return _render_report(results, report_head(asset_base, inline_plotly, plotly_bundle_path))
+
+def _render_report(results: Dict[str, Any], head_assets: str) -> str:
+    """create_visualization의 실제 HTML 생성"""
     
-    Plotly.newPlot('bar-chart', barData, barLayout, {{responsive: true}});
+    return REPORT_TEMPLATE.render(
+        head_assets=head_assets,
+        generated_at=datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
+        department_list=generate_department_list_html(results['top_departments']),
+        mbti=html.escape(str(results.get('mbti', '알 수 없음'))),
+        profile_summary=generate_profile_summary_html(results['user_profile']),
+        # 1. 막대 차트 (부서별 적합도), 2. 레이더 차트 (개인 성향 프로필), 3. 히트맵 (부서별 요구사항 비교)
+        bar_chart=create_compatibility_bar_chart(results['top_departments']),
+        radar_chart=create_personal_profile_radar(results['user_profile']),
+        heatmap_chart=create_department_requirements_heatmap(results['top_departments'])
+    )
+
+def report_payload(results: Dict[str, Any], candidate_id: Any = None,
+                   report_url: Optional[str] = None) -> Dict[str, Any]:
     """
+    대시보드에 넣을 지원자 한 명의 보고서 데이터 (차트와 추천 부서에 필요한 값만 포함)
     
-    return chart_js
+    Args:
+        results (Dict[str, Any]): 분석 결과 데이터
+        candidate_id (Any): 지원자 ID
+        report_url (Optional[str]): 대시보드에서 연결할 개별 보고서 주소
+        
+    Returns:
+        Dict[str, Any]: JSON으로 직렬화할 수 있는 보고서 데이터
+    """
+    top_departments = results['top_departments']
+    return {
+        'candidate_id': str(candidate_id) if candidate_id is not None else "",
+        'mbti': str(results.get('mbti', '알 수 없음')),
+        'report_url': report_url,
+        'departments': [
+            {'name': str(dept['name']), 'score': dept['score'], 'reason': reason_text(dept.get('reason'))}
+            for dept in top_departments
+        ],
+        'radar': radar_chart_data(results['user_profile']),
+        'heatmap': heatmap_chart_data(top_departments)
+    }
 
-def create_personal_profile_radar(user_profile: Dict[str, float]) -> str:
-    """개인 성향 프로필 레이더 차트 생성"""
+def create_dashboard(reports: Iterable[Dict[str, Any]], page_size: int = 20, inline_plotly: Optional[bool] = None,
+                     plotly_bundle_path: Optional[str] = None, asset_base: Optional[str] = None,
+                     title: str = "부서 매칭 분석 대시보드") -> str:
+    """
+    여러 지원자의 분석 결과를 페이지 단위로 보여 주는 대시보드 HTML 생성
     
-    traits = list(user_profile.keys())
-    values = list(user_profile.values())
+    스타일, plotly.js, 차트 스크립트는 한 번만 불러오고, 지원자별 차트는 화면에 보일 때 그립니다.
     
-    chart_js = f"""
-    var radarData = [{{
-        type: 'scatterpolar',
-        r: {values},
-        theta: {traits},
-        fill: 'toself',
-        fillcolor: 'rgba(142, 68, 173, 0.3)',
-        line: {{
-            color: '#8e44ad',
-            width: 2
-        }},
-        marker: {{
-            color: '#8e44ad',
-            size: 6
-        }},
-        name: '개인 성향'
-    }}];
+    Args:
+        reports (Iterable[Dict[str, Any]]): report_payload로 만든 지원자별 보고서 데이터
+        page_size (int): 한 페이지에 보여 줄 지원자 수
+        inline_plotly (Optional[bool]): create_visualization과 같음
+        plotly_bundle_path (Optional[str]): create_visualization과 같음
+        asset_base (Optional[str]): create_visualization과 같음
+        title (str): 페이지 제목
+        
+    Returns:
+        str: HTML 콘텐츠
+    """
+    if inline_plotly is None:
+        inline_plotly = _inline_plotly_default()
+    if plotly_bundle_path is None:
+        plotly_bundle_path = os.environ.get("PLOTLY_BUNDLE_PATH")
     
-    var radarLayout = {{
-        title: {{
-            text: '개인 성향 프로필',
-            font: {{ size: 16, color: '#2c2c2c' }}
-        }},
-        polar: {{
-            radialaxis: {{
-                visible: true,
-                range: [0, 100],
-                tickfont: {{ size: 10, color: '#4a4a4a' }},
-                gridcolor: '#dee2e6'
-            }},
-            angularaxis: {{
-                tickfont: {{ size: 11, color: '#2c2c2c' }}
-            }}
-        }},
-        plot_bgcolor: '#ffffff',
-        paper_bgcolor: '#ffffff',
-        margin: {{ l: 80, r: 80, t: 60, b: 60 }},
-        height: 450
-    }};
+    reports = list(reports)
+    page_size = max(1, page_size)
+    page_size_options = "".join(
+        f'<option value="{size}"{" selected" if size == page_size else ""}>{size}명씩</option>'
+        for size in sorted({10, 20, 50, 100, page_size})
+    )
     
-    Plotly.newPlot('radar-chart', radarData, radarLayout, {{responsive: true}});
-    """
+    with span("rendering"):
+        return DASHBOARD_TEMPLATE.render(
+            title=html.escape(title),
+            head_assets=report_head(asset_base, inline_plotly, plotly_bundle_path),
+            generated_at=datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
+            count=len(reports),
+            page_size_options=page_size_options,
+            reports=to_json(reports)
+        )
+
+def bar_chart_data(top_departments: List[Dict]) -> Dict[str, List]:
+    """막대 차트 데이터 (부서명, 적합도)"""
     
-    return chart_js
+    return {
+        'names': [dept['name'] for dept in top_departments],
+        'scores': [dept['score'] for dept in top_departments]
+    }
 
-def create_department_requirements_heatmap(top_departments: List[Dict]) -> str:
-    """부서별 요구사항 히트맵 생성"""
+def radar_chart_data(user_profile: Dict[str, float]) -> Dict[str, List]:
+    """레이더 차트 데이터 (성향 요소, 점수)"""
     
-    dept_names = [dept['name'] for dept in top_departments]
-    requirements = [dept['requirements'] for dept in top_departments]
+    return {
+        'traits': list(user_profile.keys()),
+        'values': list(user_profile.values())
+    }
+
+def heatmap_chart_data(top_departments: List[Dict]) -> Optional[Dict[str, List]]:
+    """히트맵 데이터 (요구사항이 없으면 None)"""
     
+    requirements = [dept['requirements'] for dept in top_departments]
     if not requirements:
-        return ""
+        return None
     
     # 모든 특성 추출
     all_traits = list(requirements[0].keys())
     
-    # 히트맵 데이터 구성
-    z_values = []
-    for req in requirements:
-        z_values.append([req.get(trait, 0) for trait in all_traits])
+    return {
+        'z': [[req.get(trait, 0) for trait in all_traits] for req in requirements],
+        'traits': all_traits,
+        'dept_names': [dept['name'] for dept in top_departments]
+    }
+
+def create_compatibility_bar_chart(top_departments: List[Dict], element_id: str = 'bar-chart') -> str:
+    """부서별 적합도 막대 차트 생성"""
     
-    chart_js = f"""
-    var heatmapData = [{{
-        z: {z_values},
-        x: {all_traits},
-        y: {dept_names},
-        type: 'heatmap',
-        colorscale: [
-            [0, '#ffffff'],
-            [0.5, '#c39bd3'],
-            [1, '#8e44ad']
-        ],
-        showscale: true,
-        colorbar: {{
-            title: '요구 수준',
-            titlefont: {{ size: 11, color: '#4a4a4a' }},
-            tickfont: {{ size: 10, color: '#4a4a4a' }}
-        }},
-        text: {[[f'{val:.0f}' for val in row] for row in z_values]},
-        texttemplate: '%{{text}}',
-        textfont: {{ size: 10, color: '#2c2c2c' }}
-    }}];
+    return f"drawBarChart('{element_id}', {to_json(bar_chart_data(top_departments))});"
+
+def create_personal_profile_radar(user_profile: Dict[str, float], element_id: str = 'radar-chart') -> str:
+    """개인 성향 프로필 레이더 차트 생성"""
     
-    var heatmapLayout = {{
-        title: {{
-            text: '부서별 성향 요구사항',
-            font: {{ size: 16, color: '#2c2c2c' }}
-        }},
-        xaxis: {{
-            title: '성향 요소',
-            titlefont: {{ size: 12, color: '#4a4a4a' }},
-            tickfont: {{ size: 10, color: '#4a4a4a' }},
-            tickangle: -45
-        }},
-        yaxis: {{
-            title: '부서',
-            titlefont: {{ size: 12, color: '#4a4a4a' }},
-            tickfont: {{ size: 10, color: '#4a4a4a' }}
-        }},
-        plot_bgcolor: '#ffffff',
-        paper_bgcolor: '#ffffff',
-        margin: {{ l: 100, r: 60, t: 60, b: 100 }},
-        height: 400
-    }};
+    return f"drawRadarChart('{element_id}', {to_json(radar_chart_data(user_profile))});"
+
+def create_department_requirements_heatmap(top_departments: List[Dict], element_id: str = 'heatmap-chart') -> str:
+    """부서별 요구사항 히트맵 생성"""
     
-    Plotly.newPlot('heatmap-chart', heatmapData, heatmapLayout, {{responsive: true}});
-    """
+    data = heatmap_chart_data(top_departments)
+    if data is None:
+        return ""
     
-    return chart_js
+    return f"drawHeatmapChart('{element_id}', {to_json(data)});"
 
 def generate_department_list_html(top_departments: List[Dict]) -> str:
     """추천 부서 목록 HTML 생성"""
     
-    html = ""
-    for i, dept in enumerate(top_departments, 1):
-        html += f"""
-        <div class="dept-card">
-            <div class="dept-name">{i}. {dept['name']}</div>
-            <div class="dept-score">적합도: {dept['score']:.1f}%</div>
-            <div class="dept-reason">{dept['reason']}</div>
-        </div>
-        """
-    
-    return html
+    return "".join(
+        DEPARTMENT_CARD_TEMPLATE.render(
+            rank=i,
+            name=html.escape(str(dept['name'])),
+            score=f"{dept['score']:.1f}",
+            reason=html.escape(reason_text(dept.get('reason')))
+        )
+        for i, dept in enumerate(top_departments, 1)
+    )
 
 def generate_profile_summary_html(user_profile: Dict[str, float]) -> str:
     """개인 성향 요약 HTML 생성"""
     
-    html = ""
-    for trait, score in user_profile.items():
-        html += f'<span class="profile-item">{trait}: {score:.0f}점</span>'
-    
-    return html 
\ No newline at end of file
+    return "".join(
+        f'<span class="profile-item">{html.escape(str(trait))}: {score:.0f}점</span>'
+        for trait, score in user_profile.items()
+    )
\ No newline at end of file